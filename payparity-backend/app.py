@@ -3,23 +3,25 @@
 #now should work
 
 # payparity-backend/app.py
-from fastapi import FastAPI, UploadFile, Form, HTTPException
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, UploadFile, Form, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, JSONResponse, FileResponse, PlainTextResponse
+from starlette.formparsers import MultiPartParser
 import uvicorn
 import os
-import tempfile
-import joblib
+import sys
 import numpy as np
-import pandas as pd
-from PyPDF2 import PdfReader
-from docx import Document
 import re
-import requests
 import json
-import pytesseract
-from PIL import Image
-from pdf2image import convert_from_path
+import asyncio
+import threading
+import functools
 import httpx
+# Heavy modules (pandas, joblib/xgboost, PyPDF2, python-docx) are imported on
+# first use so the server can bind and answer /health before they load.
 # import easyocr
 # reader = easyocr.Reader(['en'])
 
@@ -34,12 +36,164 @@ load_dotenv()
 #     OCR_AVAILABLE = False
 #     print("⚠️ EasyOCR not available. Install with: pip install easyocr")
 
-from typing import List, Dict, Optional, Literal
+from typing import Any, BinaryIO, List, Dict, Optional, Literal, Tuple, Union
+from contextlib import asynccontextmanager
 from datetime import datetime
 from dateutil import parser as dateparser
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
+
+from result_cache import ResultCache, content_key
+from prediction_memo import PredictionMemo, file_signature
+from executors import StageExecutor, ExecutorBusy, parse_stage_kinds
+from parse_stages import docx_to_text, compute_experience_for_title
+from keyword_matcher import KeywordMatcher
+from skill_extractor import SkillExtractor
+import normalizers
+from normalizers import parse_salary_input, normalize_education
+from audit_jobs import AuditJobs, FINISHED as AUDIT_FINISHED
+from metrics import MetricsRegistry, request_timings, server_timing, span
+from single_flight import SingleFlight
+from chat_sessions import ChatSessions
+
+# ----------------------------
+# External APIs (overridable to point at local stand-ins, see bench/fake_apis.py)
+# ----------------------------
+OPENROUTER_CHAT_URL = os.getenv("OPENROUTER_CHAT_URL", "https://openrouter.ai/api/v1/chat/completions")
+SERPER_SEARCH_URL = os.getenv("SERPER_SEARCH_URL", "https://google.serper.dev/search")
+OCR_SPACE_URL = os.getenv("OCR_SPACE_URL", "https://api.ocr.space/parse/image")
+
+# ----------------------------
+# Metrics (GET /metrics, Prometheus text format)
+# ----------------------------
+metrics = MetricsRegistry()
+http_request_seconds = metrics.histogram(
+    "payparity_http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status"))
+stage_seconds = metrics.histogram(
+    "payparity_stage_duration_seconds", "Time spent in each stage of /predict and /api/chat", ("stage",))
+external_request_seconds = metrics.histogram(
+    "payparity_external_request_duration_seconds", "Outbound API latency until response headers", ("service",))
+external_requests = metrics.counter(
+    "payparity_external_requests", "Outbound API calls by outcome (ok, http_4xx, http_5xx, error)", ("service", "outcome"))
+ocr_fallbacks = metrics.counter(
+    "payparity_ocr_fallbacks", "Resumes or pages that fell back to OCR, by reason", ("reason",))
+skill_sources = metrics.counter(
+    "payparity_skill_sources", "Where /predict took resume skills from (local, llm, local_fallback)", ("source",))
+cache_refreshes = metrics.counter(
+    "payparity_cache_refreshes", "Background refreshes started for stale cache entries", ("cache",))
+chat_compactions = metrics.counter(
+    "payparity_chat_compactions", "Chat history compactions into the running summary, by outcome", ("outcome",))
+# Requests slower than this are logged with their stage breakdown
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", 5))
+EXTERNAL_SERVICES = {httpx.URL(url).netloc: name for url, name in (
+    (OPENROUTER_CHAT_URL, "openrouter"), (SERPER_SEARCH_URL, "serper"), (OCR_SPACE_URL, "ocr_space"))}
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Counts and times every outbound call made through the shared client."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        service = EXTERNAL_SERVICES.get(request.url.netloc, request.url.host)
+        started = time.perf_counter()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except Exception:
+            external_requests.inc(service, "error")
+            raise
+        finally:
+            external_request_seconds.observe(time.perf_counter() - started, service)
+        code = response.status_code
+        external_requests.inc(service, "ok" if code < 400 else f"http_{code // 100}xx")
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+# ----------------------------
+# Shared outbound HTTP client (OpenRouter, Serper, OCR.Space)
+# ----------------------------
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 100))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", 20))
+
+http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Pooled keep-alive client shared by every external call in this module."""
+    global http_client
+    if http_client is None or http_client.is_closed:
+        http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            transport=InstrumentedTransport(httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS,
+                                    max_keepalive_connections=HTTP_MAX_KEEPALIVE),
+            )),
+        )
+    return http_client
 
-app = FastAPI(title="PayParity Backend API", version="1.0")
+# Concurrent identical upstream calls (same resume text, same LinkedIn URL)
+# share one request; see single_flight.py
+upstream_calls = SingleFlight(enabled=os.getenv("SINGLE_FLIGHT", "1") == "1")
+
+# Strong references to fire-and-forget tasks (the event loop only keeps weak ones)
+background_tasks: set = set()
+
+def run_in_background(coro) -> None:
+    """Start coro on the running loop without waiting for it (cache refreshes, chat compaction)."""
+    task = asyncio.get_running_loop().create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+# ----------------------------
+# CPU-bound stages run off the event loop
+# ----------------------------
+# EXECUTOR_STAGES overrides the pool per stage, e.g. "pdf=thread,parse=process"
+# (stages: pdf, parse, inference; kinds: thread, process, inline).
+stage_executor = StageExecutor(
+    stage_kinds=parse_stage_kinds(os.getenv("EXECUTOR_STAGES", "")),
+    threads=int(os.getenv("EXECUTOR_THREADS", 0)) or None,
+    processes=int(os.getenv("EXECUTOR_PROCESSES", 0)) or None,
+    max_queue=int(os.getenv("EXECUTOR_MAX_QUEUE", 64)),
+)
+if stage_executor.kind("inference") == "process":
+    raise RuntimeError("EXECUTOR_STAGES: inference uses the loaded model and cannot run in a process pool")
+
+def stage_input(stage: str, stream: BinaryIO):
+    """The upload stream itself for thread/inline stages, its bytes for process pools."""
+    return read_stream(stream) if stage_executor.kind(stage) == "process" else stream
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_http_client()
+    # Model + dataset load in the background; /health answers immediately
+    # and /ready reports when inference is available.
+    loader = asyncio.create_task(asyncio.to_thread(load_resources))
+    # Picks up queued audits and resumes interrupted ones
+    audit_jobs.start()
+    try:
+        yield
+    finally:
+        if not loader.done():
+            loader.cancel()
+        await asyncio.to_thread(audit_jobs.stop)
+        if http_client is not None:
+            await http_client.aclose()
+        resume_cache.close()
+        chat_sessions.close()
+        linkedin_snippet_cache.close()
+        linkedin_profile_cache.close()
+        stage_executor.shutdown()
+        if _local_ocr:
+            import local_ocr
+            local_ocr.shutdown()
+        if "pdf_extract" in sys.modules:
+            sys.modules["pdf_extract"].shutdown()
+
+app = FastAPI(title="PayParity Backend API", version="1.0", lifespan=lifespan)
+
+@app.exception_handler(ExecutorBusy)
+async def executor_busy_handler(request: Request, exc: ExecutorBusy):
+    return JSONResponse({"detail": str(exc)}, status_code=503, headers={"Retry-After": "1"})
 
 # allow your frontend origins
 allowed = os.getenv("FRONTEND_ALLOWED_ORIGINS", "")
@@ -50,6 +204,89 @@ else:
     # safe defaults for local dev
     origins = ["http://localhost:8080", "http://127.0.0.1:8080"]
 
+# ----------------------------
+# Upload size limit
+# ----------------------------
+# Resumes are read straight from Starlette's spooled upload file, which stays in
+# memory up to UPLOAD_SPOOL_MAX_BYTES and only rolls over to disk past that.
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", 10 * 1024 * 1024))
+UPLOAD_SPOOL_MAX_BYTES = int(os.getenv("UPLOAD_SPOOL_MAX_BYTES", 2 * 1024 * 1024))
+AUDIT_MAX_UPLOAD_BYTES = int(os.getenv("AUDIT_MAX_UPLOAD_BYTES", 100 * 1024 * 1024))
+# Body limit per upload path
+UPLOAD_LIMITS = {"/predict": MAX_UPLOAD_BYTES, "/audits": AUDIT_MAX_UPLOAD_BYTES}
+UPLOAD_FORM_OVERHEAD = 64 * 1024  # multipart boundaries + the small form fields
+MultiPartParser.spool_max_size = UPLOAD_SPOOL_MAX_BYTES
+
+def upload_too_large(limit: int = MAX_UPLOAD_BYTES) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Upload exceeds the {limit / (1024 * 1024):g} MB limit")
+
+class UploadLimitMiddleware:
+    """Reject oversized uploads by Content-Length before the body is read, and
+    stop chunked uploads as soon as they cross the limit."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in UPLOAD_LIMITS:
+            return await self.app(scope, receive, send)
+        file_limit = UPLOAD_LIMITS[scope["path"]]
+        limit = file_limit + UPLOAD_FORM_OVERHEAD
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and int(length) > limit:
+            response = JSONResponse({"detail": upload_too_large(file_limit).detail}, status_code=413)
+            return await response(scope, receive, send)
+
+        received = 0
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise upload_too_large(file_limit)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+class RequestMetricsMiddleware:
+    """Request latency by route template, plus the per-request stage spans as a
+    Server-Timing header and a log line for slow requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        timings = []
+        token = request_timings.set(timings)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if timings:
+                    message["headers"] = [*message.get("headers", []),
+                                          (b"server-timing", server_timing(timings).encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_timings.reset(token)
+            elapsed = time.perf_counter() - started
+            # the route template keeps label values bounded ("/audits/{job_id}")
+            route = getattr(scope.get("route"), "path", "unmatched")
+            http_request_seconds.observe(elapsed, scope["method"], route, str(status))
+            if elapsed >= SLOW_REQUEST_SECONDS:
+                print(f"🐢 Slow {scope['method']} {route} ({status}): {elapsed * 1000:.0f} ms "
+                      f"[{server_timing(timings) or 'no stages'}]")
+
+# Added before CORS so 413 responses still carry the CORS headers
+app.add_middleware(UploadLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,       # <- uses env var FRONTEND_ALLOWED_ORIGINS
@@ -57,6 +294,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Outermost: times everything above, including 413s and CORS preflights
+app.add_middleware(RequestMetricsMiddleware)
 
 
 # ----------------------------
@@ -65,6 +304,9 @@ app.add_middleware(
 
 MODEL_PATH = os.path.join(os.path.dirname(__file__), os.getenv("MODEL_PATH", "output/xgb_salary_model_optimized.pkl"))
 DATASET_PATH = os.path.join(os.path.dirname(__file__), os.getenv("DATASET_PATH", "output/19kdata.csv"))
+# Memory-mapped columnar copy of DATASET_PATH shared by all workers (see dataset_store.py)
+DATASET_COLUMNAR_DIR = os.path.join(os.path.dirname(__file__), os.getenv("DATASET_COLUMNAR_DIR", "output/19kdata.columnar"))
+DATASET_AUTO_BUILD = os.getenv("DATASET_AUTO_BUILD", "1") == "1"
 
 
 if not os.path.exists(MODEL_PATH):
@@ -72,80 +314,121 @@ if not os.path.exists(MODEL_PATH):
 if not os.path.exists(DATASET_PATH):
     raise FileNotFoundError(f"Dataset not found at {DATASET_PATH}")
 
-print("🔹 Loading model from", MODEL_PATH)
-model = joblib.load(MODEL_PATH)
-print("✅ Model loaded")
+READY_WAIT_SECONDS = float(os.getenv("READY_WAIT_SECONDS", 60))
 
-print("🔹 Loading dataset from", DATASET_PATH)
-salary_dataset = pd.read_csv(DATASET_PATH)
-print("✅ Dataset loaded: {len(salary_dataset)} records")
+# Populated by load_resources()
+model = None
+salary_dataset = None
+peer_index = None
+fairness_index = None
+fast_predictor = None
+# Bundled taxonomy until load_resources() adds the dataset's skill names
+skill_extractor = SkillExtractor()
+# Allowed locations from dataset to keep categories consistent
+ALLOWED_LOCATIONS: set = set()
+
+startup_timings: Dict[str, float] = {}
+resources_ready = threading.Event()
+_resources_lock = threading.Lock()
+
+def load_resources() -> None:
+    """Load the model and dataset and build every derived index.
+    Idempotent and thread-safe: concurrent callers block until the first load finishes.
+    """
+    global model, salary_dataset, peer_index, fairness_index, fast_predictor, skill_extractor, ALLOWED_LOCATIONS
+    if resources_ready.is_set():
+        return
+    with _resources_lock:
+        if resources_ready.is_set():
+            return
+        started = time.perf_counter()
+
+        def mark(step: str, since: float) -> float:
+            now = time.perf_counter()
+            startup_timings[step] = round(now - since, 3)
+            return now
+
+        t = time.perf_counter()
+        import joblib
+        from dataset_store import load_dataset
+        from peer_index import PeerIndex
+        from fairness import FairnessIndex
+        t = mark("heavy_imports_s", t)
+
+        print("🔹 Loading model from", MODEL_PATH)
+        model = joblib.load(MODEL_PATH)
+        prediction_memo.signature = file_signature(MODEL_PATH)
+        t = mark("model_load_s", t)
+        print("✅ Model loaded")
+
+        print("🔹 Loading dataset from", DATASET_PATH)
+        salary_dataset = load_dataset(DATASET_PATH, DATASET_COLUMNAR_DIR, auto_build=DATASET_AUTO_BUILD)
+        ALLOWED_LOCATIONS = set(salary_dataset['Location'].astype(str).unique())
+        t = mark("dataset_load_s", t)
+        print(f"✅ Dataset loaded: {len(salary_dataset)} records")
+
+        peer_index = PeerIndex(salary_dataset)
+        fairness_index = FairnessIndex(salary_dataset, bias_threshold=float(os.getenv("FAIRNESS_BIAS_THRESHOLD", 1.1)))
+        t = mark("indexes_s", t)
+        print(f"✅ Peer index and fairness aggregates built: {len(peer_index.titles)} job titles")
+
+        fast_predictor = build_fast_predictor(model)
+        t = mark("fast_inference_s", t)
+
+        dataset_skills = {s.strip() for value in salary_dataset["Skills_Required"].dropna().unique()
+                          for s in str(value).split(",")}
+        skill_extractor = SkillExtractor(extra_skills=sorted(s for s in dataset_skills if s))
+        mark("skill_vocabulary_s", t)
+        print(f"✅ Skill vocabulary built: {skill_extractor.size} aliases")
+
+        startup_timings["load_total_s"] = round(time.perf_counter() - started, 3)
+        resources_ready.set()
+        print(f"⏱️ Resources ready in {startup_timings['load_total_s']}s: {startup_timings}")
+
+def ensure_resources_loaded() -> None:
+    """For sync handlers/scripts: load now, or block until the background load finishes."""
+    load_resources()
+
+def prepare_for_fork() -> None:
+    """Load everything in the parent of a pre-fork server (serve.py) and protect it.
+    Shared arrays become read-only so a stray in-place write fails loudly instead of
+    silently un-sharing pages, and gc.freeze() keeps the collector from touching
+    the inherited objects.
+    """
+    import gc
+    load_resources()
+    for arr in peer_index.read_only_arrays():
+        arr.flags.writeable = False
+    gc.collect()
+    gc.freeze()
+
+async def wait_for_resources() -> None:
+    """For async handlers: wait (off the event loop) for the model, or fail with 503."""
+    if resources_ready.is_set():
+        return
+    try:
+        await asyncio.wait_for(asyncio.to_thread(load_resources), timeout=READY_WAIT_SECONDS)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail="Model is still loading, please retry shortly")
 
 # ----------------------------
 # Normalizers for model inputs
 # ----------------------------
 
-# Allowed locations from dataset to keep categories consistent
-ALLOWED_LOCATIONS = set(salary_dataset['Location'].astype(str).unique())
-
-def normalize_education(level: Optional[str]) -> str:
-    """Map various education strings to the categories used by the model/dataset.
-    Dataset categories: High School, Bachelors, Masters/Postgraduate, PhD/Doctorate
-    """
-    if not level or not isinstance(level, str):
-        return "Bachelors"
-    s = level.strip().lower()
-
-    # Direct keyword checks first
-    if "phd" in s or "ph.d" in s or "doctorate" in s or "dphil" in s:
-        return "PhD/Doctorate"
-    if "master" in s or "postgrad" in s or "pg" == s or "mba" in s or "m.tech" in s or "mtech" in s or "msc" in s or "m.sc" in s or "ms" == s:
-        return "Masters/Postgraduate"
-    if "bachelor" in s or "undergrad" in s or s in {"ug", "btech", "b.tech", "bsc", "b.sc", "be"}:
-        return "Bachelors"
-    if "high school" in s or "secondary" in s or "12" in s or "hsc" in s or "10+2" in s:
-        return "High School"
-
-    # Normalize common canonical values
-    mapping = {
-        "masters": "Masters/Postgraduate",
-        "master": "Masters/Postgraduate",
-        "postgraduate": "Masters/Postgraduate",
-        "bachelors": "Bachelors",
-        "bachelor": "Bachelors",
-        "phd": "PhD/Doctorate",
-        "doctorate": "PhD/Doctorate",
-        "highschool": "High School",
-        "high-school": "High School",
-    }
-    return mapping.get(s, "Bachelors")
+def normalize_location(location: Optional[str]) -> str:
+    return normalizers.normalize_location(location, ALLOWED_LOCATIONS)
 
 
-def normalize_location(location: Optional[str]) -> str:
-    if not location or not isinstance(location, str):
-        return "Remote"
-    s = location.strip()
-    sl = s.lower()
-    if sl in {"remote", "wfh", "work from home", "anywhere"}:
-        return "Remote"
-    candidate = s.title()
-    if candidate in ALLOWED_LOCATIONS:
-        return candidate
-    if s in ALLOWED_LOCATIONS:
-        return s
-    return "Remote"
-
-
-def extract_text_with_ocr_api(file_path: str) -> str:
+async def extract_text_with_ocr_api(content: bytes, filename: str) -> str:
     """Extract text from image or PDF using OCR.Space API (free, lightweight)."""
     api_key = os.getenv("OCR_SPACE_API_KEY", "helloworld")  # Replace with your key in Render
     try:
-        with open(file_path, "rb") as f:
-            response = requests.post(
-                "https://api.ocr.space/parse/image",
-                files={"file": f},
-                data={"apikey": api_key, "language": "eng"},
-                timeout=60
-            )
+        response = await get_http_client().post(
+            OCR_SPACE_URL,
+            files={"file": (os.path.basename(filename), content)},
+            data={"apikey": api_key, "language": "eng"},
+            timeout=60
+        )
         response.raise_for_status()
         data = response.json()
         parsed_text = ""
@@ -157,6 +440,47 @@ def extract_text_with_ocr_api(file_path: str) -> str:
         print(f"OCR.Space OCR error: {e}")
         return ""
 
+# "local" (Tesseract process pool), "remote" (OCR.Space) or "auto" (local when
+# tesseract/poppler are installed, remote otherwise or when local finds nothing)
+OCR_BACKEND = os.getenv("OCR_BACKEND", "auto").lower()
+OCR_MAX_PAGES = int(os.getenv("OCR_MAX_PAGES", 5))
+_local_ocr = None
+
+def get_local_ocr():
+    global _local_ocr
+    if _local_ocr is None:
+        import local_ocr
+        if OCR_BACKEND == "auto" and not local_ocr.local_ocr_available():
+            _local_ocr = False
+        else:
+            _local_ocr = local_ocr.LocalOCR(
+                workers=int(os.getenv("OCR_WORKERS", 0)) or None,
+                max_pages=OCR_MAX_PAGES,
+                dpi=int(os.getenv("OCR_DPI", 200)),
+                cache_path=os.path.join(os.path.dirname(__file__), os.getenv("OCR_CACHE_PATH", "cache/ocr_cache.sqlite3")),
+            )
+    return _local_ocr or None
+
+async def extract_text_with_ocr(content: bytes, filename: str) -> str:
+    """OCR an image or scanned PDF with the configured backend."""
+    if OCR_BACKEND != "remote":
+        engine = get_local_ocr()
+        if engine is not None:
+            try:
+                with span(stage_seconds, "ocr_local"):
+                    text = await engine.extract(content, filename)
+                if text or OCR_BACKEND == "local":
+                    return text
+                print("Local OCR found no text, falling back to OCR.Space API...")
+                ocr_fallbacks.inc("local_empty")
+            except Exception as e:
+                print(f"Local OCR error: {e}")
+                if OCR_BACKEND == "local":
+                    return ""
+                ocr_fallbacks.inc("local_error")
+    with span(stage_seconds, "ocr_remote"):
+        return await extract_text_with_ocr_api(content, filename)
+
 # ----------------------------
 # Helpers: extract text with OCR fallback
 # ----------------------------
@@ -211,108 +535,108 @@ def extract_text_with_ocr_api(file_path: str) -> str:
 #         return ""
 
 
-def extract_text_from_resume(file_path: str) -> str:
-    ext = file_path.split('.')[-1].lower()
+# Characters worth extracting from a PDF: the AI parser reads text[:4000];
+# the margin keeps date ranges from later pages for experience calculation.
+PDF_TEXT_BUDGET = int(os.getenv("PDF_TEXT_BUDGET", 10000))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 12))
+# Page ranges of a document with PDF_PARALLEL_MIN_PAGES+ pages read at once
+# (default min(4, CPUs)). With pdf=process (the default) the ranges go to the
+# stage's own process pool, so they share its EXECUTOR_PROCESSES workers with
+# other requests; with pdf=thread/inline pdf_extract starts a separate pool.
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", 0)) or None
+
+async def extract_pdf_text_with_page_ocr(stream: BinaryIO, filename: str) -> str:
+    """Stream PDF page text up to PDF_TEXT_BUDGET and OCR only the scanned pages."""
+    import pdf_extract
+    source = stage_input("pdf", stream)
+    with span(stage_seconds, "pdf_text"):
+        if stage_executor.kind("pdf") == "process":
+            # page ranges run as separate tasks in the stage pool, not in a pool nested in a worker
+            result = await pdf_extract.extract_pdf_text_with(
+                functools.partial(stage_executor.run, "pdf"), source,
+                char_budget=PDF_TEXT_BUDGET, parallel_min_pages=PDF_PARALLEL_MIN_PAGES,
+                workers=PDF_WORKERS or min(4, stage_executor.processes),
+            )
+        else:
+            result = await stage_executor.run(
+                "pdf", pdf_extract.extract_pdf_text, source,
+                char_budget=PDF_TEXT_BUDGET, parallel_min_pages=PDF_PARALLEL_MIN_PAGES, workers=PDF_WORKERS,
+            )
+    pages = dict(result["pages"])
+    text_chars = sum(len(t.strip()) for t in pages.values())
+    scanned = result["scanned"]
+    print(f"PDF: read {len(pages)}/{result['page_count']} pages, {text_chars} chars, {len(scanned)} scanned")
+
+    # fallback to OCR if needed
+    if text_chars < 100:
+        print("Low text extraction, using OCR...")
+        ocr_fallbacks.inc("pdf_low_text")
+        return await extract_text_with_ocr(read_stream(stream), filename)
+
+    if scanned and text_chars < PDF_TEXT_BUDGET:
+        scanned = scanned[:OCR_MAX_PAGES]
+        print(f"OCR for scanned pages only: {[i + 1 for i in scanned]}")
+        ocr_fallbacks.inc("pdf_scanned_pages", amount=len(scanned))
+        # one document per page so each OCR result replaces its own page
+        documents = await stage_executor.run("pdf", pdf_extract.write_page_pdfs, source, scanned)
+        texts = await asyncio.gather(*(extract_text_with_ocr(doc, filename) for doc in documents))
+        for i, text in zip(scanned, texts):
+            if text.strip():
+                pages[i] = text
+
+    return "\n".join(pages[i] for i in sorted(pages))
+
+def read_stream(stream: BinaryIO) -> bytes:
+    stream.seek(0)
+    return stream.read()
+
+async def extract_text_from_resume(stream: BinaryIO, filename: str) -> str:
+    """Extract resume text from a seekable binary stream (e.g. the upload's spooled file)."""
+    ext = filename.split('.')[-1].lower()
     text = ""
-    print(f"Extracting text from file: {file_path} (type: {ext})")
+    print(f"Extracting text from file: {filename} (type: {ext})")
     
     try:
         if ext == "pdf":
             try:
-                with open(file_path, "rb") as f:
-                    reader = PdfReader(f)
-                    text = ""
-                    for page in reader.pages:
-                        text += (page.extract_text() or "") + "\n"
-        # fallback to OCR if needed
-                if len(text.strip()) < 100:
-                    print("Low text extraction, using OCR.Space API...")
-                    text = extract_text_with_ocr_api(file_path)
+                text = await extract_pdf_text_with_page_ocr(stream, filename)
+            except ExecutorBusy:
+                raise
             except Exception as e:
-                print("PDF read failed, using OCR.Space API fallback:", e)
-                text = extract_text_with_ocr_api(file_path)
+                print("PDF read failed, using OCR fallback:", e)
+                ocr_fallbacks.inc("pdf_read_error")
+                text = await extract_text_with_ocr(read_stream(stream), filename)
 
         elif ext in ("docx", "doc"):
-            doc = Document(file_path)
-            text = "\n".join([p.text for p in doc.paragraphs])
+            with span(stage_seconds, "docx_text"):
+                text = await stage_executor.run("parse", docx_to_text, stage_input("parse", stream))
         elif ext == "txt":
-            with open(file_path, "r", encoding="utf-8") as f:
-                text = f.read()
+            text = read_stream(stream).decode("utf-8")
         elif ext in ("png", "jpg", "jpeg", "tiff", "bmp", "gif"):
-            text = extract_text_with_ocr_api(file_path)
+            text = await extract_text_with_ocr(read_stream(stream), filename)
         else:
             print(f"Unsupported file type: {ext}")
         
         print(f"Final extracted text: {len(text)} characters")
+    except ExecutorBusy:
+        raise
     except Exception as e:
-        print(f"Error extracting text from {file_path}: {e}")
+        print(f"Error extracting text from {filename}: {e}")
         import traceback
         traceback.print_exc()
     
     return text or ""
 
-# ----------------------------
-# Salary Parser - handles various formats
-# ----------------------------
-def parse_salary_input(salary_input: str) -> float:
-    """Parse salary from various formats like '5 lakh', '5lpa', '5,00,000', etc."""
-    if not salary_input:
-        return 0.0
-    
-    # Convert to string and clean
-    salary_str = str(salary_input).strip().lower()
-    
-    # Remove rupee symbol
-    salary_str = salary_str.replace('₹', '').replace('rs', '').replace('inr', '').strip()
-    
-    # Handle formats like "5 lakh", "5lakh", "5 lakhs", "5l"
-    lakh_patterns = [
-        r'([\d.]+)\s*l(?:akh|akhs)?(?:\s*p\.?a\.?)?\b',
-        r'([\d.]+)\s*lpa\b',
-        r'([\d.]+)\s*l\b'
-    ]
-    
-    for pattern in lakh_patterns:
-        match = re.search(pattern, salary_str)
-        if match:
-            value = float(match.group(1))
-            return value * 100000  # Convert to actual amount
-    
-    # Handle formats like "5 cr", "5crore", "5 crores"
-    crore_patterns = [
-        r'([\d.]+)\s*cr(?:ore|ores)?\b',
-        r'([\d.]+)\s*c\b'
-    ]
-    
-    for pattern in crore_patterns:
-        match = re.search(pattern, salary_str)
-        if match:
-            value = float(match.group(1))
-            return value * 10000000  # Convert to actual amount
-    
-    # Handle formats like "5,00,000" or "500000" or "500,000"
-    # Remove all commas and try to parse as number
-    numeric_str = salary_str.replace(',', '').replace(' ', '')
-    try:
-        value = float(numeric_str)
-        # If it's a reasonably large number, assume it's already in rupees
-        if value >= 1000:
-            return value
-        # If it's small, might be in lakhs
-        elif value > 0:
-            return value * 100000
-    except ValueError:
-        pass
-    
-    return 0.0
-
 # ----------------------------
 # AI-based skill extraction
 # ----------------------------
-def extract_skills_from_text_ai(text: str, api_key: str) -> List[str]:
+async def extract_skills_from_text_ai(text: str, api_key: str) -> List[str]:
     """Extract skills from resume using AI instead of hardcoded patterns"""
-    if not api_key or not text:
+    if not text:
         return []
+    local = extract_skills_local(text)
+    if local["confident"] or not api_key:
+        return local["skills"]
     
     prompt = f"""
 You are an expert resume parser. Extract all technical and professional skills from the following resume text.
@@ -330,8 +654,8 @@ Resume text:
 """
     
     try:
-        resp = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
+        resp = await get_http_client().post(
+            OPENROUTER_CHAT_URL,
             headers={
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json"
@@ -352,123 +676,113 @@ Resume text:
         return []
 
 # ----------------------------
-# Experience calculation for given job title
+# Local skill extraction (fast path before the LLM)
 # ----------------------------
-MONTHS = {
-    "jan": 1, "january":1, "feb":2, "february":2, "mar":3, "march":3,
-    "apr":4, "april":4, "may":5, "jun":6, "june":6, "jul":7, "july":7,
-    "aug":8, "august":8, "sep":9, "september":9, "oct":10, "october":10,
-    "nov":11, "november":11, "dec":12, "december":12
+# The LLM parse is skipped when the resume's skills section is at least this
+# well covered by the vocabulary and yields at least SKILL_MIN_COUNT skills
+SKILL_COVERAGE_MIN = float(os.getenv("SKILL_COVERAGE_MIN", 0.6))
+SKILL_MIN_COUNT = int(os.getenv("SKILL_MIN_COUNT", 3))
+LOCAL_SKILLS_ENABLED = os.getenv("LOCAL_SKILLS", "1") == "1"
+
+def extract_skills_local(text: str) -> Dict:
+    """skill_extractor.analyze() plus whether the result is good enough to skip the LLM."""
+    result = skill_extractor.analyze(text)
+    result["confident"] = (LOCAL_SKILLS_ENABLED and result["coverage"] >= SKILL_COVERAGE_MIN
+                           and len(result["skills"]) >= SKILL_MIN_COUNT)
+    return result
+
+# Highest degree first; whole-word patterns so "me" or "be" in prose do not count
+EDUCATION_PATTERNS = [
+    ("PhD/Doctorate", re.compile(r"\b(?:ph\.?\s?d|doctorate|doctor of philosophy|dphil)\b", re.I)),
+    ("Masters/Postgraduate", re.compile(
+        r"\b(?:master'?s?|post\s?graduate|m\.?\s?tech|m\.sc|msc|mba|mca|m\.com|pgdm|m\.e\.|m\.s\.)(?!\w)", re.I)),
+    ("Bachelors", re.compile(
+        r"\b(?:bachelor'?s?|under\s?graduate|b\.?\s?tech|b\.sc|bsc|bca|bba|b\.com|b\.e\.|b\.a\.|mbbs)(?!\w)", re.I)),
+    ("High School", re.compile(r"\b(?:high school|higher secondary|hsc|ssc|10\+2|class xii)(?!\w)", re.I)),
+]
+
+def detect_education(text: str) -> str:
+    """Highest degree mentioned in the resume (Bachelors when none is)."""
+    for label, pattern in EDUCATION_PATTERNS:
+        if pattern.search(text):
+            return label
+    return "Bachelors"
+
+# Older or alternative city names -> dataset spelling
+LOCATION_ALIASES = {
+    "bengaluru": "Bangalore", "gurugram": "Gurgaon", "new delhi": "Delhi", "bombay": "Mumbai",
+    "madras": "Chennai", "calcutta": "Kolkata", "cochin": "Kochi", "trivandrum": "Thiruvananthapuram",
+    "baroda": "Vadodara",
 }
-
-def parse_year(s: str) -> Optional[int]:
-    try:
-        y = int(s)
-        if 1900 <= y <= 2100:
-            return y
-    except:
-        pass
-    return None
-
-def parse_date_from_text(part: str):
-    part = part.strip()
-    m = re.search(r"(?P<month>[A-Za-z]+)\s+[,]?\s*(?P<year>\d{4})", part)
-    if m:
-        mon = m.group("month").lower()
-        yr = parse_year(m.group("year"))
-        return (yr, MONTHS.get(mon, 0))
-    m2 = re.search(r"(\d{4})", part)
-    if m2:
-        yr = parse_year(m2.group(1))
-        return (yr, 0)
-    return (None, 0)
-
-def find_date_ranges(text: str) -> List[Dict]:
-    ranges = []
-    pattern = re.compile(r"""
-        (?P<left>(?:[A-Za-z]{3,9}\s+\d{4}|\d{4}))
-        \s*[-–—]\s*
-        (?P<right>(?:[A-Za-z]{3,9}\s+\d{4}|\d{4}|Present|present))
-    """, flags=re.VERBOSE)
-    for m in pattern.finditer(text):
-        left = m.group("left")
-        right = m.group("right")
-        sy, sm = parse_date_from_text(left)
-        ey, em = (None, 0)
-        if right.lower() in ("present",):
-            ey, em = (pd.Timestamp.now().year, pd.Timestamp.now().month)
-        else:
-            ey, em = parse_date_from_text(right)
-        if sy and ey:
-            ranges.append({
-                "start_year": sy,
-                "start_month": sm,
-                "end_year": ey,
-                "end_month": em,
-                "span": text[max(0,m.start()-120):m.end()+120],
-                "span_indices": (m.start(), m.end())
-            })
-    return ranges
-
-def compute_experience_for_title(text: str, job_title_input: str) -> float:
-    if not text:
-        return 0.0
-    ranges = find_date_ranges(text)
-    job_title_keywords = [w.lower() for w in re.findall(r"[A-Za-z0-9\-\+\.]+", job_title_input)] if job_title_input else []
-    matched_years = []
-    for r in ranges:
-        ctx = r["span"].lower()
-        if any(kw in ctx for kw in job_title_keywords):
-            sy, ey = r["start_year"], r["end_year"]
-            sm, em = r["start_month"], r["end_month"]
-            if sy and ey:
-                months = (ey - sy) * 12 + (em - sm)
-                years = round(months / 12.0, 2)
-                matched_years.append(years)
-    if not matched_years and any(kw in job_title_input.lower() for kw in ["developer", "engineer", "analyst", "intern", "manager"]):
-        if ranges:
-            starts = [r["start_year"] for r in ranges if r["start_year"]]
-            ends = [r["end_year"] for r in ranges if r["end_year"]]
-            if starts and ends:
-                years = max(ends) - min(starts)
-                return float(max(0.0, round(years, 2)))
-    elif not matched_years:
-        return 0.0
-    total = sum(matched_years)
-    if total > 60:
-        total = 60.0
-    return float(round(total, 2))
+_location_matcher = None
+
+def detect_location(text: str) -> str:
+    """First dataset city named in the resume (the contact header usually comes first), else Remote."""
+    global _location_matcher
+    if _location_matcher is None or _location_matcher[0] is not ALLOWED_LOCATIONS:
+        names = {loc.lower(): loc for loc in ALLOWED_LOCATIONS if loc != "Remote"}
+        names.update({alias: city for alias, city in LOCATION_ALIASES.items() if city in ALLOWED_LOCATIONS})
+        pattern = re.compile(r"\b(" + "|".join(sorted(map(re.escape, names), key=len, reverse=True)) + r")\b", re.I)
+        _location_matcher = (ALLOWED_LOCATIONS, pattern, names)
+    _, pattern, names = _location_matcher
+    match = pattern.search(text) if names else None
+    return names[match.group(1).lower()] if match else "Remote"
 
 # ----------------------------
 # Improved Job Category Detection
 # ----------------------------
+JOB_CATEGORY_KEYWORDS = {
+    "tech": ["developer", "engineer", "software", "data", "ml", "ai", "blockchain", "cloud", "it", "cyber", "analyst",
+             "programmer", "full stack", "frontend", "backend", "system", "network"],
+    "design/arts": ["artist", "designer", "graphic", "illustrator", "musician", "writer", "editor", "creative",
+                    "ux", "ui", "photographer", "animator", "fashion"],
+    "healthcare": ["doctor", "nurse", "medical", "dentist", "physician", "therapist", "surgeon", "pharmacist"],
+    "finance": ["finance", "accountant", "bank", "investment", "trader", "auditor", "analyst", "tax"],
+    "sales/marketing": ["sales", "marketing", "brand", "advertising", "growth", "business development"],
+    "education": ["teacher", "professor", "lecturer", "trainer", "education", "counselor"],
+    "legal": ["lawyer", "attorney", "legal", "advocate", "paralegal", "compliance"],
+    "operations/management": ["manager", "operations", "project", "product", "supply chain", "logistics", "executive"],
+    "hr/recruitment": ["hr", "recruiter", "talent", "human resource", "payroll"],
+}
+job_category_matcher = KeywordMatcher(JOB_CATEGORY_KEYWORDS)
+
 def detect_job_category(job_title: str, openrouter_api_key: Optional[str] = None) -> str:
+    """Category whose keywords occur most often in the title (first listed wins ties)."""
     if not job_title or not isinstance(job_title, str):
         return "Other"
-    jt = job_title.lower().strip()
-    category_map = {
-        "tech": ["developer", "engineer", "software", "data", "ml", "ai", "blockchain", "cloud", "it", "cyber", "analyst",
-                 "programmer", "full stack", "frontend", "backend", "system", "network"],
-        "design/arts": ["artist", "designer", "graphic", "illustrator", "musician", "writer", "editor", "creative",
-                        "ux", "ui", "photographer", "animator", "fashion"],
-        "healthcare": ["doctor", "nurse", "medical", "dentist", "physician", "therapist", "surgeon", "pharmacist"],
-        "finance": ["finance", "accountant", "bank", "investment", "trader", "auditor", "analyst", "tax"],
-        "sales/marketing": ["sales", "marketing", "brand", "advertising", "growth", "business development"],
-        "education": ["teacher", "professor", "lecturer", "trainer", "education", "counselor"],
-        "legal": ["lawyer", "attorney", "legal", "advocate", "paralegal", "compliance"],
-        "operations/management": ["manager", "operations", "project", "product", "supply chain", "logistics", "executive"],
-        "hr/recruitment": ["hr", "recruiter", "talent", "human resource", "payroll"],
-        "other": []
-    }
-    for cat, keywords in category_map.items():
-        if any(k in jt for k in keywords):
-            return cat.title()
-    return "Other"
+    return job_category_matcher.best(job_title.strip(), "other").title()
+
+# Domains for the title-vs-skills mismatch check in /predict, in tie-break order
+DOMAIN_KEYWORDS = {
+    "tech": ["python", "java", "developer", "engineer", "ai", "ml", "cloud", "data", "react", "node", "sql", "software"],
+    "healthcare": ["doctor", "nurse", "medical", "surgery", "patient", "clinic", "hospital", "health"],
+    "finance": ["finance", "accounting", "tax", "audit", "bank", "investment", "economics"],
+    "education": ["teacher", "professor", "lecturer", "trainer", "education", "school"],
+    "legal": ["law", "lawyer", "attorney", "advocate", "legal", "compliance", "paralegal"],
+    "design": ["designer", "artist", "creative", "ui", "ux", "graphics", "illustrator", "animation", "fashion"],
+    "sales/marketing": ["marketing", "sales", "advertising", "promotion", "branding", "customer", "retail"],
+    "management": ["manager", "operations", "executive", "project", "product", "supply", "logistics", "coordinator"],
+}
+domain_matcher = KeywordMatcher(DOMAIN_KEYWORDS)
+
+def detect_domain(text: str) -> str:
+    """Map text to the domain with the most keyword hits."""
+    return domain_matcher.best(text, "other")
 
 # ----------------------------
 # AI parser - enhanced to include skills
 # ----------------------------
-def extract_resume_info_ai(text: str, api_key: str) -> Dict:
+# Bump when the prompt or model changes so stale parses are not served
+RESUME_PROMPT_VERSION = "resume-v1"
+RESUME_PARSE_MODEL = "gpt-4o-mini"
+
+resume_cache = ResultCache(
+    os.path.join(os.path.dirname(__file__), os.getenv("RESUME_CACHE_PATH", "cache/resume_cache.sqlite3")),
+    ttl_seconds=float(os.getenv("RESUME_CACHE_TTL_SECONDS", 7 * 24 * 3600)),
+    max_entries=int(os.getenv("RESUME_CACHE_MAX_ENTRIES", 5000)),
+)
+
+async def extract_resume_info_ai(text: str, api_key: str) -> Dict:
     if not api_key:
         print("No API key provided for AI parsing")
         return {}
@@ -476,7 +790,19 @@ def extract_resume_info_ai(text: str, api_key: str) -> Dict:
     if not text or len(text.strip()) < 50:
         print(f"Text too short for parsing: {len(text)} chars")
         return {}
-    
+
+    # Only the first 4000 chars reach the model, so that is what we key on
+    cache_key = content_key(RESUME_PROMPT_VERSION, RESUME_PARSE_MODEL, text[:4000])
+    cached = await asyncio.to_thread(resume_cache.get, cache_key)
+    if cached is not None:
+        print(f"Resume parse cache hit ({cache_key[:12]})")
+        return cached
+    # The API key is part of the flight key so one caller's bad key cannot fail the others
+    return await upstream_calls.do("resume_parse", (cache_key, api_key),
+                                   lambda: parse_resume_with_llm(text, api_key, cache_key))
+
+async def parse_resume_with_llm(text: str, api_key: str, cache_key: str) -> Dict:
+    """The OpenRouter resume parse; successful results are stored under cache_key."""
     prompt = f"""
 You are an expert resume parser. Analyze the resume and return valid JSON with these fields:
 - Job_Title: The current or most recent job title
@@ -491,9 +817,9 @@ Resume:
 """
     try:
         print(f"Sending resume text to AI (length: {len(text[:4000])} chars)...")
-        resp = requests.post("https://openrouter.ai/api/v1/chat/completions",
+        resp = await get_http_client().post(OPENROUTER_CHAT_URL,
             headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-            json={"model": "gpt-4o-mini","messages": [{"role": "user","content": prompt}]}, timeout=20)
+            json={"model": RESUME_PARSE_MODEL,"messages": [{"role": "user","content": prompt}]}, timeout=20)
         
         resp_json = resp.json()
         print(f"AI Response status: {resp.status_code}")
@@ -509,6 +835,8 @@ Resume:
         parsed = json.loads(content)
         
         print(f"Parsed AI response: Job={parsed.get('Job_Title')}, Skills count={len(parsed.get('Skills', []))}")
+        if isinstance(parsed, dict) and parsed:
+            await asyncio.to_thread(resume_cache.set, cache_key, parsed)
         return parsed
     except Exception as e:
         print(f"AI parser error: {type(e).__name__}: {e}")
@@ -526,68 +854,103 @@ def get_peer_comparisons(job_title: str, predicted_salary: float, experience_yea
         if not job_title or not isinstance(job_title, str):
             print(f"Invalid job_title for peer comparison: {job_title}")
             return []
-        
-        # Filter by similar job title (case insensitive)
-        job_title_lower = job_title.lower().strip()
-        similar_jobs = salary_dataset[
-            salary_dataset['Job_Title'].str.lower().str.contains(job_title_lower, na=False, regex=False) |
-            salary_dataset['Job_Title'].str.lower().str.strip().eq(job_title_lower)
-        ]
-        
-        # If too few matches, try broader match
-        if len(similar_jobs) < 5:
-            # Extract key words from job title for broader matching
-            keywords = job_title_lower.split()
-            if keywords:
-                pattern = '|'.join([re.escape(kw) for kw in keywords if len(kw) > 3])
-                if pattern:
-                    similar_jobs = salary_dataset[
-                        salary_dataset['Job_Title'].str.lower().str.contains(pattern, na=False, regex=True)
-                    ]
-        
-        if len(similar_jobs) == 0:
-            return []
-        
-        # Calculate salary difference from predicted
-        similar_jobs = similar_jobs.copy()
-        similar_jobs['salary_diff'] = abs(similar_jobs['Salary_INR'] - predicted_salary)
-        
-        # Sort by salary difference to get closest matches
-        closest_peers = similar_jobs.nsmallest(5, 'salary_diff')
-        
-        # Format peer data (anonymize)
-        peer_list = []
-        for idx, row in closest_peers.iterrows():
-            peer_list.append({
-                "job_title": row['Job_Title'],
-                "experience_years": int(row['Experience_Years']),
-                "education": row['Education_Level'],
-                "location": row['Location'],
-                "salary": round(float(row['Salary_INR']), 2),
-                "skills": row['Skills_Required'] if pd.notna(row['Skills_Required']) else ""
-            })
-        
-        return peer_list
+
+        # Title matching, broad keyword fallback and nearest-salary search all
+        # run against the index built at startup
+        return peer_index.nearest(job_title, predicted_salary, k=5)
     except Exception as e:
         print(f"Error getting peer comparisons: {e}")
         import traceback
         traceback.print_exc()
         return []
 
-def extract_linkedin_info(url: str, serper_api_key: str) -> Dict:
+# Two tiers: the Serper snippet per profile URL (changes when the profile
+# does), and the parsed profile per snippet text (fixed for a given prompt).
+# Past its TTL an entry is still served for LINKEDIN_STALE_SECONDS while a
+# background refresh replaces it.
+LINKEDIN_PROMPT_VERSION = "linkedin-v1"
+LINKEDIN_PARSE_MODEL = "gpt-4o-mini"
+LINKEDIN_STALE_SECONDS = float(os.getenv("LINKEDIN_STALE_SECONDS", 7 * 24 * 3600))
+
+linkedin_snippet_cache = ResultCache(
+    os.path.join(os.path.dirname(__file__), os.getenv("LINKEDIN_SNIPPET_CACHE_PATH", "cache/linkedin_snippets.sqlite3")),
+    ttl_seconds=float(os.getenv("LINKEDIN_SNIPPET_TTL_SECONDS", 24 * 3600)),
+    max_entries=int(os.getenv("LINKEDIN_CACHE_MAX_ENTRIES", 20000)),
+    stale_seconds=LINKEDIN_STALE_SECONDS,
+)
+linkedin_profile_cache = ResultCache(
+    os.path.join(os.path.dirname(__file__), os.getenv("LINKEDIN_PROFILE_CACHE_PATH", "cache/linkedin_profiles.sqlite3")),
+    ttl_seconds=float(os.getenv("LINKEDIN_PROFILE_TTL_SECONDS", 30 * 24 * 3600)),
+    max_entries=int(os.getenv("LINKEDIN_CACHE_MAX_ENTRIES", 20000)),
+    stale_seconds=LINKEDIN_STALE_SECONDS,
+)
+def refresh_in_background(cache: str, kind: str, key, fn) -> None:
+    """Run fn() under single flight without waiting for it (stale-while-revalidate).
+    Counted as a refresh only when no call for the key is already in flight."""
+    run_in_background(upstream_calls.do(kind, key, fn, on_start=lambda: cache_refreshes.inc(cache)))
+
+def normalize_linkedin_url(url: str) -> str:
+    """Profile URL without scheme, "www.", query, fragment or trailing slash, lowercased,
+    so that variants of a shared link coalesce."""
+    s = url.strip().lower()
+    s = re.sub(r"^[a-z]+://", "", s)
+    s = re.sub(r"^(?:www\.|[a-z]{2}\.)(?=linkedin\.com)", "", s)
+    return re.split(r"[?#]", s, 1)[0].rstrip("/")
+
+async def extract_linkedin_info(url: str, serper_api_key: str) -> Dict:
     """Fetch LinkedIn info via Serper.dev + AI extraction"""
+    profile_url = normalize_linkedin_url(url)
+    snippet_key = content_key("serper-v1", profile_url)
+    found = await asyncio.to_thread(linkedin_snippet_cache.lookup, snippet_key)
+    if found is not None:
+        snippet, fresh = found[0]["snippet"], found[1]
+        if not fresh:
+            refresh_in_background("linkedin_snippet", "linkedin_search", (profile_url, serper_api_key),
+                                  lambda: refresh_linkedin_profile(url, snippet_key, serper_api_key))
+    else:
+        snippet = await upstream_calls.do("linkedin_search", (profile_url, serper_api_key),
+                                          lambda: fetch_linkedin_snippet(url, snippet_key, serper_api_key))
+    if not snippet:
+        return {}
+    return await linkedin_profile_from_snippet(snippet)
+
+async def fetch_linkedin_snippet(url: str, snippet_key: str, serper_api_key: str) -> str:
+    """Serper search for the profile; the joined result snippets are cached under snippet_key."""
     try:
         search_q = f"site:linkedin.com/in {url}"
-        headers = {"X-API-KEY": serper_api_key, "Content-Type": "application/json"}
-        res = requests.post("https://google.serper.dev/search", headers=headers, json={"q": search_q}, timeout=20)
+        headers = {"X-API-KEY": serper_api_key or "", "Content-Type": "application/json"}
+        res = await get_http_client().post(SERPER_SEARCH_URL, headers=headers, json={"q": search_q}, timeout=20)
         res.raise_for_status()
         data = res.json()
         snippet = " ".join([r.get("snippet","") for r in data.get("organic",[])])
     except Exception as e:
         print("Serper.dev error:", e)
-        return {}
-
-    # parse snippet using AI
+        return ""
+    if snippet.strip():
+        await asyncio.to_thread(linkedin_snippet_cache.set, snippet_key, {"snippet": snippet})
+    return snippet
+
+async def refresh_linkedin_profile(url: str, snippet_key: str, serper_api_key: str) -> str:
+    """Background refresh: new snippet, and its parse too if the profile changed."""
+    snippet = await fetch_linkedin_snippet(url, snippet_key, serper_api_key)
+    if snippet:
+        await linkedin_profile_from_snippet(snippet)
+    return snippet
+
+async def linkedin_profile_from_snippet(snippet: str) -> Dict:
+    profile_key = content_key(LINKEDIN_PROMPT_VERSION, LINKEDIN_PARSE_MODEL, snippet)
+    found = await asyncio.to_thread(linkedin_profile_cache.lookup, profile_key)
+    if found is None:
+        return await upstream_calls.do("linkedin_parse", profile_key,
+                                       lambda: parse_linkedin_snippet(snippet, profile_key))
+    profile, fresh = found
+    if not fresh:
+        refresh_in_background("linkedin_profile", "linkedin_parse", profile_key,
+                              lambda: parse_linkedin_snippet(snippet, profile_key))
+    return profile
+
+async def parse_linkedin_snippet(snippet: str, profile_key: str) -> Dict:
+    """OpenRouter extraction of the profile fields; successful parses are cached under profile_key."""
     try:
        
         ai_key = os.getenv("OPENROUTER_API_KEY")
@@ -601,15 +964,160 @@ Extract JSON fields from this LinkedIn text:
 Text:
 {snippet}
 """
-        resp = requests.post("https://openrouter.ai/api/v1/chat/completions",
+        resp = await get_http_client().post(OPENROUTER_CHAT_URL,
             headers={"Authorization": f"Bearer {ai_key}", "Content-Type": "application/json"},
-            json={"model": "gpt-4o-mini","messages":[{"role":"user","content":prompt}]}, timeout=25)
+            json={"model": LINKEDIN_PARSE_MODEL,"messages":[{"role":"user","content":prompt}]}, timeout=25)
         txt = resp.json()["choices"][0]["message"]["content"]
         txt = re.sub(r"^```(json)?|```$","",txt.strip())
-        return json.loads(txt)
+        parsed = json.loads(txt)
     except Exception as e:
         print("AI LinkedIn parse fail:", e)
         return {}
+    if isinstance(parsed, dict) and parsed:
+        await asyncio.to_thread(linkedin_profile_cache.set, profile_key, parsed)
+    return parsed
+
+# ----------------------------
+# Salary adjustment + comparison (shared by /predict and /predict/batch)
+# ----------------------------
+MODEL_GENDER = "Non-binary"
+SALARY_CAP = 60_00_000
+
+CATEGORY_SCALE = {
+    "Tech": 1.0, "Design/Arts": 0.85, "Healthcare": 0.9, "Finance": 0.95,
+    "Sales/Marketing": 0.8, "Education": 0.7, "Legal": 0.9,
+    "Operations/Management": 0.9, "HR/Recruitment": 0.8, "Other": 0.75
+}
+
+def adjust_predicted_salaries(log_preds, job_cats, exp_years) -> np.ndarray:
+    """Turn raw log-salary predictions into adjusted salaries (array in, array out).
+    Applies the category scale, the 12%/year experience growth and the salary cap.
+    """
+    salary_pred = np.expm1(np.asarray(log_preds, dtype=float))
+    scale = np.array([CATEGORY_SCALE.get(c, 0.8) for c in job_cats], dtype=float)
+    exp = np.maximum(0.0, np.asarray(exp_years, dtype=float))
+    return np.minimum(salary_pred * scale * np.power(1.12, exp), SALARY_CAP)
+
+
+# ----------------------------
+# Memoized model inference
+# ----------------------------
+MODEL_FEATURES = ["Gender", "Job_Title", "Experience_Years", "Skills_Required",
+                  "Education_Level", "Location", "Data_Source"]
+MODEL_CHECK_INTERVAL = float(os.getenv("MODEL_CHECK_INTERVAL_SECONDS", 5))
+
+prediction_memo = PredictionMemo(
+    max_entries=int(os.getenv("PREDICTION_MEMO_MAX_ENTRIES", 10000)),
+)
+_model_lock = threading.Lock()
+_model_checked_at = time.monotonic()
+
+FAST_INFERENCE = os.getenv("FAST_INFERENCE", "1") == "1"
+
+def build_fast_predictor(pipeline) -> Optional["FastSalaryPredictor"]:
+    """Compile the pipeline for native booster inference, validated against pipeline.predict.
+    Returns None (use pipeline.predict) if disabled, unsupported or not matching.
+    """
+    if not FAST_INFERENCE:
+        return None
+    try:
+        from fast_inference import FastSalaryPredictor, validate_fast_predictor
+        fast = FastSalaryPredictor(pipeline)
+        sample = salary_dataset.sample(min(500, len(salary_dataset)), random_state=0).copy()
+        sample["Data_Source"] = np.where(np.arange(len(sample)) % 2, "LinkedIn", "ResumeUpload")
+        max_diff = validate_fast_predictor(fast, pipeline, sample)
+        print(f"✅ Fast inference enabled (max diff vs model.predict: {max_diff:.2g})")
+        return fast
+    except Exception as e:
+        print(f"⚠️ Fast inference disabled, using model.predict: {e}")
+        return None
+
+def run_model(rows: List[Dict]) -> np.ndarray:
+    """Raw log-salary predictions for model-input rows."""
+    if fast_predictor is not None:
+        return fast_predictor.predict_rows(rows)
+    import pandas as pd
+    return model.predict(pd.DataFrame(rows, columns=MODEL_FEATURES))
+
+def ensure_current_model() -> None:
+    """Reload the model and drop memoized predictions if the model file changed."""
+    global model, fast_predictor, _model_checked_at
+    now = time.monotonic()
+    if model is None:
+        return
+    if now - _model_checked_at < MODEL_CHECK_INTERVAL:
+        return
+    _model_checked_at = now
+    signature = file_signature(MODEL_PATH)
+    if signature == prediction_memo.signature:
+        return
+    with _model_lock:
+        if signature == prediction_memo.signature:
+            return
+        print("🔹 Model file changed, reloading from", MODEL_PATH)
+        import joblib
+        model = joblib.load(MODEL_PATH)
+        fast_predictor = build_fast_predictor(model)
+        prediction_memo.reset(signature)
+        print("✅ Model reloaded, prediction memo cleared")
+
+def predict_adjusted_salaries(rows: List[Dict], job_cats: List[str]) -> np.ndarray:
+    """Adjusted salaries for model-input rows; only memo misses reach model.predict."""
+    ensure_current_model()
+    keys = [tuple(row[f] for f in MODEL_FEATURES) for row in rows]
+    result = np.empty(len(rows), dtype=float)
+    missing = []
+    for i, key in enumerate(keys):
+        value = prediction_memo.get(key)
+        if value is None:
+            missing.append(i)
+        else:
+            result[i] = value
+
+    if missing:
+        log_preds = run_model([rows[i] for i in missing])
+        adjusted = adjust_predicted_salaries(
+            log_preds,
+            [job_cats[i] for i in missing],
+            [rows[i]["Experience_Years"] for i in missing],
+        )
+        for i, value in zip(missing, adjusted):
+            result[i] = value
+            prediction_memo.set(keys[i], float(value))
+    return result
+
+
+def build_salary_comparison(adjusted_salary: float, parsed_salary: float, exp_years_for_role: float) -> Dict:
+    """Underpaid / fair / overpaid / fresh verdict for a predicted vs. current salary."""
+    comparison = {}
+    if exp_years_for_role > 0 and parsed_salary > 0:
+        if parsed_salary < adjusted_salary * 0.9:
+            diff = adjusted_salary - parsed_salary
+            comparison = {
+                "status": "underpaid",
+                "message": f"You are underpaid by ₹{diff:,.0f}.",
+                "reason": "Based on your skills, experience, and role, your compensation appears below market value.",
+                "suggested_salary": round(adjusted_salary, 2)
+            }
+        elif adjusted_salary * 0.9 <= parsed_salary <= adjusted_salary * 1.1:
+            comparison = {
+                "status": "fair",
+                "message": "You are being paid fairly for your profile!",
+                "reason": "Your salary aligns well with market averages for similar experience and job roles."
+            }
+        else:
+            comparison = {
+                "status": "overpaid",
+                "message": "You are earning above the expected range!",
+                "reason": "Your compensation is higher than most professionals with similar profiles — great job!"
+            }
+    elif exp_years_for_role == 0:
+        comparison = {
+            "status": "fresh",
+            "message": f"Expected starting salary: ₹{adjusted_salary:,.0f}.",
+            "reason": "This estimate is based on your education level and skills for an entry-level position."
+        }
+    return comparison
 
 # ----------------------------
 # Endpoint
@@ -622,7 +1130,7 @@ async def predict(
     openrouter_api_key: str = Form(None),
     current_salary: Optional[str] = Form(None)  # 🔹 Accept as string to parse various formats
 ):
-    tmp_path = None
+    await wait_for_resources()
     try:
         # Parse salary input
         parsed_salary = parse_salary_input(current_salary) if current_salary else 0.0
@@ -630,7 +1138,8 @@ async def predict(
         if linkedin_url:
             
             serper_key = os.getenv("SERPER_API_KEY")
-            info = extract_linkedin_info(linkedin_url, serper_key)
+            with span(stage_seconds, "linkedin_lookup"):
+                info = await extract_linkedin_info(linkedin_url, serper_key)
             
             # Prioritize user input job title over LinkedIn-extracted title
             if job_title and job_title.strip():
@@ -644,11 +1153,10 @@ async def predict(
             exp_years_for_role = float(info.get("Total_Experience_Years", 0))
             location = normalize_location(info.get("Location", "Remote"))
         else:
-            suffix = "." + (file.filename.split(".")[-1] if file and "." in file.filename else "pdf")
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                tmp.write(await file.read())
-                tmp_path = tmp.name
-            text = extract_text_from_resume(tmp_path)
+            filename = file.filename if file.filename and "." in file.filename else "resume.pdf"
+            if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+                raise upload_too_large()
+            text = await extract_text_from_resume(file.file, filename)
             
             # Check if text extraction was successful (after OCR attempts)
             if not text or len(text.strip()) < 50:
@@ -662,8 +1170,24 @@ async def predict(
             api_key_to_use = openrouter_api_key or os.getenv("OPENROUTER_API_KEY")
 
             
-            # Extract info using AI (includes skills now)
-            info = extract_resume_info_ai(text, api_key_to_use)
+            with span(stage_seconds, "skills_local"):
+                local_skills = extract_skills_local(text)
+            if local_skills["confident"] and job_title and job_title.strip():
+                # Title given and skills section fully recognised: nothing left for the LLM
+                info = {"Skills": local_skills["skills"], "Education_Level": detect_education(text),
+                        "Location": detect_location(text)}
+                skill_sources.inc("local")
+                print(f"Local parse: {len(local_skills['skills'])} skills "
+                      f"(coverage {local_skills['coverage']:.0%}), LLM skipped")
+            else:
+                # Extract info using AI (includes skills now)
+                with span(stage_seconds, "resume_parse"):
+                    info = await extract_resume_info_ai(text, api_key_to_use)
+                if info.get("Skills"):
+                    skill_sources.inc("llm")
+                elif local_skills["skills"]:
+                    info = {**info, "Skills": local_skills["skills"]}
+                    skill_sources.inc("local_fallback")
             
             # Get skills from AI response
             skills_list = info.get("Skills", [])
@@ -693,8 +1217,9 @@ async def predict(
             
             education_level = normalize_education(info.get("Education_Level", "Bachelors"))
             location = normalize_location(info.get("Location", "Remote"))
-            exp_years_for_role = compute_experience_for_title(text, job_title)
-                    # ---------------------------
+            with span(stage_seconds, "experience"):
+                exp_years_for_role = await stage_executor.run("parse", compute_experience_for_title, text, job_title)
+        # ---------------------------
         # Validate job title input
         # ---------------------------
         try:
@@ -735,31 +1260,7 @@ async def predict(
             job_title_lower = job_title.lower().strip() if job_title else ""
             skills_lower = skills_str.lower().strip() if skills_str else ""
 
-            # -----------------------
-            # Domain keyword sets
-            # -----------------------
-            tech_keywords = ["python", "java", "developer", "engineer", "ai", "ml", "cloud", "data", "react", "node", "sql", "software"]
-            healthcare_keywords = ["doctor", "nurse", "medical", "surgery", "patient", "clinic", "hospital", "health"]
-            finance_keywords = ["finance", "accounting", "tax", "audit", "bank", "investment", "economics"]
-            education_keywords = ["teacher", "professor", "lecturer", "trainer", "education", "school"]
-            legal_keywords = ["law", "attorney", "advocate", "legal", "compliance", "paralegal"]
-            design_keywords = ["designer", "artist", "creative", "ui", "ux", "graphics", "illustrator", "animation", "fashion"]
-            sales_keywords = ["marketing", "sales", "advertising", "promotion", "branding", "customer", "retail"]
-            ops_keywords = ["manager", "operations", "executive", "project", "product", "supply", "logistics", "coordinator"]
-
-            def detect_domain(text: str) -> str:
-                """Map text to a domain label."""
-                text = text.lower()
-                if any(k in text for k in tech_keywords): return "tech"
-                if any(k in text for k in healthcare_keywords): return "healthcare"
-                if any(k in text for k in finance_keywords): return "finance"
-                if any(k in text for k in education_keywords): return "education"
-                if any(k in text for k in legal_keywords): return "legal"
-                if any(k in text for k in design_keywords): return "design"
-                if any(k in text for k in sales_keywords): return "sales/marketing"
-                if any(k in text for k in ops_keywords): return "management"
-                return "other"
-
+            # same scorer on both sides, so a stray hit can't outrank the rest of the text
             job_domain = detect_domain(job_title_lower)
             skills_domain = detect_domain(skills_lower)
 
@@ -805,60 +1306,26 @@ async def predict(
 
 
         job_cat = detect_job_category(job_title, openrouter_api_key)
-        input_df = pd.DataFrame([{
-            "Gender": "Non-binary",  # keep within training categories: Male, Female, Non-binary
+        input_row = {
+            "Gender": MODEL_GENDER,  # keep within training categories: Male, Female, Non-binary
             "Job_Title": job_title,
             "Experience_Years": float(exp_years_for_role),
             "Skills_Required": skills_str,
             "Education_Level": education_level,
             "Location": location,
             "Data_Source": "LinkedIn" if linkedin_url else "ResumeUpload"
-        }])
-        log_pred = model.predict(input_df)[0]
-        salary_pred = float(np.expm1(log_pred))
-
-        # adjust salary
-        category_scale = {
-            "Tech": 1.0, "Design/Arts": 0.85, "Healthcare": 0.9, "Finance": 0.95,
-            "Sales/Marketing": 0.8, "Education": 0.7, "Legal": 0.9,
-            "Operations/Management": 0.9, "HR/Recruitment": 0.8, "Other": 0.75
         }
-        scale = category_scale.get(job_cat, 0.8)
-        adjusted_salary = salary_pred * scale * (1.12 ** max(0, exp_years_for_role))
-        adjusted_salary = min(adjusted_salary, 60_00_000)
+
+        # predict + adjust salary (memoized on the feature tuple)
+        with span(stage_seconds, "inference"):
+            adjusted_salary = float((await stage_executor.run("inference", predict_adjusted_salaries, [input_row], [job_cat]))[0])
 
         # 🔹 Salary Comparison Logic
-        comparison = {}
-        if exp_years_for_role > 0 and parsed_salary > 0:
-            if parsed_salary < adjusted_salary * 0.9:
-                diff = adjusted_salary - parsed_salary
-                comparison = {
-                    "status": "underpaid",
-                    "message": f"You are underpaid by ₹{diff:,.0f}.",
-                    "reason": "Based on your skills, experience, and role, your compensation appears below market value.",
-                    "suggested_salary": round(adjusted_salary, 2)
-                }
-            elif adjusted_salary * 0.9 <= parsed_salary <= adjusted_salary * 1.1:
-                comparison = {
-                    "status": "fair",
-                    "message": "You are being paid fairly for your profile!",
-                    "reason": "Your salary aligns well with market averages for similar experience and job roles."
-                }
-            else:
-                comparison = {
-                    "status": "overpaid",
-                    "message": "You are earning above the expected range!",
-                    "reason": "Your compensation is higher than most professionals with similar profiles — great job!"
-                }
-        elif exp_years_for_role == 0:
-            comparison = {
-                "status": "fresh",
-                "message": f"Expected starting salary: ₹{adjusted_salary:,.0f}.",
-                "reason": "This estimate is based on your education level and skills for an entry-level position."
-            }
+        comparison = build_salary_comparison(adjusted_salary, parsed_salary, exp_years_for_role)
         
         # 🔹 Get peer comparisons
-        peer_comparisons = get_peer_comparisons(job_title, adjusted_salary, exp_years_for_role)
+        with span(stage_seconds, "peer_comparisons"):
+            peer_comparisons = get_peer_comparisons(job_title, adjusted_salary, exp_years_for_role)
 
         return {
             "status": "success",
@@ -874,12 +1341,251 @@ async def predict(
             "comparison": comparison,  # 🔹 Salary comparison
             "peer_comparisons": peer_comparisons  # 🔹 NEW: Peer data from dataset
         }
+    except (HTTPException, ExecutorBusy):
+        raise
     except Exception as e:
         print("Error in /predict:", e)
         return {"status": "error", "message": str(e)}
-    finally:
-        if tmp_path and os.path.exists(tmp_path):
-            os.remove(tmp_path)
+
+# ----------------------------
+# Batch prediction endpoint
+# ----------------------------
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", 10000))
+
+class BatchProfile(BaseModel):
+    job_title: str
+    experience_years: float = 0.0
+    skills: Union[str, List[str], None] = ""  # comma separated string or list of skills
+    education_level: Optional[str] = None
+    location: Optional[str] = None
+    current_salary: Optional[str] = None
+    data_source: Literal["LinkedIn", "ResumeUpload"] = "ResumeUpload"
+
+class BatchPredictRequest(BaseModel):
+    # Each item is checked against BatchProfile in predict_batch, so one bad
+    # profile gets its own error entry instead of a 422 for the whole batch.
+    profiles: List[Any]
+    include_peers: bool = False
+
+
+def predict_profiles(profiles: List[BatchProfile], include_peers: bool = False) -> List[Dict]:
+    """Score already-parsed profiles with one vectorized model.predict call."""
+    rows, job_cats, exp_years = [], [], []
+    educations = normalizers.normalize_education_column([p.education_level for p in profiles])
+    locations = normalizers.normalize_location_column([p.location for p in profiles], ALLOWED_LOCATIONS)
+    # malformed salaries ("1.2.3 lakh") come back as NaN and count as not given
+    current = np.nan_to_num(normalizers.parse_salary_column([p.current_salary for p in profiles]), nan=0.0)
+    for i, p in enumerate(profiles):
+        skills = p.skills
+        skills_str = ", ".join(str(s) for s in skills) if isinstance(skills, list) else str(skills or "")
+        exp = max(0.0, float(p.experience_years or 0))
+        rows.append({
+            "Gender": MODEL_GENDER,
+            "Job_Title": p.job_title,
+            "Experience_Years": exp,
+            "Skills_Required": skills_str,
+            "Education_Level": educations[i],
+            "Location": locations[i],
+            "Data_Source": p.data_source,
+        })
+        job_cats.append(detect_job_category(p.job_title))
+        exp_years.append(exp)
+
+    if not rows:
+        return []
+
+    adjusted = predict_adjusted_salaries(rows, job_cats)
+
+    results = []
+    for i, row in enumerate(rows):
+        salary = float(adjusted[i])
+        result = {
+            "predicted_salary": round(salary, 2),
+            "parsed_info": {
+                "Job_Title": row["Job_Title"],
+                "Experience_Years": row["Experience_Years"],
+                "Skills_Required": row["Skills_Required"],
+                "Education_Level": row["Education_Level"],
+                "Location": row["Location"],
+                "Category": job_cats[i]
+            },
+            "comparison": build_salary_comparison(salary, float(current[i]), exp_years[i]),
+        }
+        if include_peers:
+            result["peer_comparisons"] = get_peer_comparisons(row["Job_Title"], salary, exp_years[i])
+        results.append(result)
+    return results
+
+
+@app.post("/predict/batch")
+def predict_batch(req: BatchPredictRequest):
+    """Score many already-parsed profiles in a single model call.
+    Results keep the request order; invalid or failing profiles get
+    {"status": "error", "message": ...} and the rest are still scored.
+    """
+    if not req.profiles:
+        raise HTTPException(status_code=400, detail="No profiles to score")
+    if len(req.profiles) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {MAX_BATCH_SIZE} profiles)")
+    ensure_resources_loaded()
+
+    results: List[Optional[Dict]] = [None] * len(req.profiles)
+    valid, positions = [], []
+    for i, raw in enumerate(req.profiles):
+        try:
+            valid.append(BatchProfile.model_validate(raw))
+            positions.append(i)
+        except ValidationError as e:
+            message = "; ".join(f"{'.'.join(str(part) for part in err['loc']) or 'profile'}: {err['msg']}"
+                                for err in e.errors())
+            results[i] = {"status": "error", "message": message}
+
+    try:
+        scored = predict_profiles(valid, req.include_peers)
+    except Exception as e:
+        # One bad row fails the vectorized call; retry row by row to isolate it
+        print("Error in /predict/batch, scoring profiles one by one:", e)
+        scored = []
+        for profile in valid:
+            try:
+                scored.append(predict_profiles([profile], req.include_peers)[0])
+            except Exception as row_error:
+                scored.append({"status": "error", "message": str(row_error)})
+    for i, result in zip(positions, scored):
+        result.setdefault("status", "success")
+        results[i] = result
+
+    failed = sum(1 for r in results if r["status"] == "error")
+    return {"status": "success", "count": len(results), "failed": failed, "results": results}
+
+# ----------------------------
+# Pay-equity audit jobs (payroll CSV -> verdict per employee)
+# ----------------------------
+AUDIT_DIR = os.path.join(os.path.dirname(__file__), os.getenv("AUDIT_DIR", "cache/audits"))
+AUDIT_EVENT_INTERVAL = float(os.getenv("AUDIT_EVENT_INTERVAL_SECONDS", 1))
+
+def score_audit_chunk(frame) -> "pd.DataFrame":
+    """Verdicts for one chunk of payroll rows: the /predict comparison, one model call per chunk."""
+    import pandas as pd
+    ensure_resources_loaded()
+    n = len(frame)
+
+    def column(name: str) -> np.ndarray:
+        return frame[name].to_numpy(dtype=object) if name in frame else np.full(n, "", dtype=object)
+
+    titles = frame["job_title"].str.strip().to_numpy(dtype=object)
+    # "5", "5.5", "5 years"; anything else counts as no experience
+    exp = (pd.to_numeric(frame["experience_years"].str.extract(r"(\d+(?:\.\d+)?)")[0], errors="coerce")
+           .fillna(0.0).to_numpy(dtype=float))
+    educations = normalizers.normalize_education_column(column("education_level"))
+    locations = normalizers.normalize_location_column(column("location"), ALLOWED_LOCATIONS)
+    current = np.nan_to_num(normalizers.parse_salary_column(column("current_salary")), nan=0.0)
+    categories = normalizers.map_distinct(titles, detect_job_category).tolist()
+    skills = column("skills")
+
+    rows = [{
+        "Gender": MODEL_GENDER,
+        "Job_Title": titles[i],
+        "Experience_Years": float(exp[i]),
+        "Skills_Required": skills[i],
+        "Education_Level": educations[i],
+        "Location": locations[i],
+        "Data_Source": "ResumeUpload",
+    } for i in range(n)]
+    predicted = predict_adjusted_salaries(rows, categories)
+
+    # no comparison when the salary is missing for an experienced employee
+    verdicts = [build_salary_comparison(float(predicted[i]), float(current[i]), float(exp[i])).get("status", "unknown")
+                for i in range(n)]
+    gap = np.where(current > 0, current - predicted, np.nan)
+    return pd.DataFrame({
+        "row": frame["row"].to_numpy(),
+        "name": column("name"),
+        "job_title": titles,
+        "experience_years": exp,
+        "education_level": educations,
+        "location": locations,
+        "category": categories,
+        "current_salary": current.round(2),
+        "predicted_salary": predicted.round(2),
+        "verdict": verdicts,
+        "gap": gap.round(2),
+        "gap_pct": (gap / predicted * 100).round(2),
+    })
+
+audit_jobs = AuditJobs(
+    AUDIT_DIR,
+    score_audit_chunk,
+    chunk_rows=int(os.getenv("AUDIT_CHUNK_ROWS", 2000)),
+    lease_seconds=float(os.getenv("AUDIT_LEASE_SECONDS", 120)),
+)
+
+def audit_job_view(job: Dict) -> Dict:
+    job_id = job["job_id"]
+    job["links"] = {
+        "status": f"/audits/{job_id}",
+        "events": f"/audits/{job_id}/events",
+        "results": f"/audits/{job_id}/results",
+    }
+    return job
+
+def get_audit_job(job_id: str) -> Dict:
+    job = audit_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Audit job '{job_id}' not found")
+    return job
+
+@app.post("/audits", status_code=202)
+async def submit_audit(file: UploadFile):
+    """Queue a pay-equity audit of a payroll CSV (name, title, experience, education, location, current salary)"""
+    if file.size is not None and file.size > AUDIT_MAX_UPLOAD_BYTES:
+        raise upload_too_large(AUDIT_MAX_UPLOAD_BYTES)
+    try:
+        job = await asyncio.to_thread(audit_jobs.submit, file.file, file.filename or "payroll.csv")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    print(f"🔹 Audit job {job['job_id']} queued: {job['filename']}")
+    return audit_job_view(job)
+
+@app.get("/audits/{job_id}")
+def audit_status(job_id: str):
+    """Status, progress and verdict counts of an audit job"""
+    return audit_job_view(get_audit_job(job_id))
+
+@app.get("/audits/{job_id}/events")
+async def audit_events(job_id: str, request: Request):
+    """Audit progress as Server-Sent Events: `progress` on every committed chunk, then `done`."""
+    job = await asyncio.to_thread(get_audit_job, job_id)
+
+    async def event_source():
+        nonlocal job
+        last = None
+        while True:
+            if job["status"] in AUDIT_FINISHED:
+                yield sse_event("done", audit_job_view(job))
+                return
+            if (job["status"], job["processed_rows"]) != last:
+                last = (job["status"], job["processed_rows"])
+                yield sse_event("progress", {k: job[k] for k in ("status", "processed_rows", "total_rows", "progress", "counts")})
+            await asyncio.sleep(AUDIT_EVENT_INTERVAL)
+            if await request.is_disconnected():
+                return
+            job = await asyncio.to_thread(get_audit_job, job_id)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/audits/{job_id}/results")
+def audit_results(job_id: str):
+    """Download the per-employee verdicts of a completed audit as CSV"""
+    job = get_audit_job(job_id)
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Audit job is {job['status']}, results are available once it completes")
+    return FileResponse(audit_jobs.results_path(job_id), media_type="text/csv",
+                        filename=f"pay-equity-audit-{job_id}.csv")
 
 # ----------------------------
 # AI Negotiation Coach Endpoints
@@ -889,12 +1595,38 @@ class ChatMessage(BaseModel):
     content: str
 
 class ChatRequest(BaseModel):
-    messages: List[ChatMessage]
-    mode: Literal["coach", "mock_interviewer", "adaptive"] = "adaptive"
+    # Stateless: the whole conversation in `messages`. With sessions: only the
+    # new `message`, plus `session_id` after the first turn.
+    messages: List[ChatMessage] = []
+    session_id: Optional[str] = None
+    message: Optional[str] = None
+    mode: Optional[Literal["coach", "mock_interviewer", "adaptive"]] = None
     profile: Optional[dict] = None
 
 class ChatResponse(BaseModel):
     message: str
+    session_id: Optional[str] = None
+
+class ChatSessionRequest(BaseModel):
+    mode: Literal["coach", "mock_interviewer", "adaptive"] = "adaptive"
+    profile: Optional[dict] = None
+
+# ----------------------------
+# Chat sessions (see chat_sessions.py)
+# ----------------------------
+CHAT_SESSIONS_PATH = os.getenv("CHAT_SESSIONS_PATH", "")  # e.g. cache/chat_sessions.sqlite3; empty = memory only
+CHAT_MAX_MESSAGE_CHARS = int(os.getenv("CHAT_MAX_MESSAGE_CHARS", 8000))
+CHAT_SUMMARY_MODEL = os.getenv("CHAT_SUMMARY_MODEL", "gpt-4o-mini")
+CHAT_SUMMARY_INPUT_CHARS = 600  # per message, when folding it into the summary
+
+chat_sessions = ChatSessions(
+    max_sessions=int(os.getenv("CHAT_MAX_SESSIONS", 5000)),
+    ttl_seconds=float(os.getenv("CHAT_SESSION_TTL_SECONDS", 2 * 3600)),
+    compact_after=int(os.getenv("CHAT_COMPACT_AFTER", 8)),
+    keep_recent=int(os.getenv("CHAT_KEEP_RECENT", 4)),
+    persist_path=os.path.join(os.path.dirname(__file__), CHAT_SESSIONS_PATH) if CHAT_SESSIONS_PATH else None,
+    sweep_seconds=float(os.getenv("CHAT_SESSION_SWEEP_SECONDS", 60)),
+)
 
 COACH_PROMPT = (
     """
@@ -1002,19 +1734,18 @@ def build_system_prompt(mode: str, profile: Optional[dict]) -> str:
     else:
         base = ADAPTIVE_PROMPT
     
-    profile_blob = json.dumps(profile or {}, ensure_ascii=False, indent=2)
+    # Compact JSON without empty fields: this is resent on every turn
+    profile_blob = json.dumps({k: v for k, v in (profile or {}).items() if v not in (None, "", [], {})},
+                              ensure_ascii=False, separators=(",", ":"))
     return (
         f"{base}\n\nUser profile/context (may be partial):\n{profile_blob}\n\n"
         "General safety: Avoid legal, medical, or financial advice beyond common professional norms."
     )
 
-async def call_openrouter(messages: List[dict]) -> str:
-    """Call OpenRouter API for AI responses"""
-    
+def openrouter_chat_request(messages: List[dict], stream: bool = False):
+    """Headers and payload for a negotiation-coach completion."""
     OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 
-    
-    url = "https://openrouter.ai/api/v1/chat/completions"
     headers = {
         "Authorization": f"Bearer {OPENROUTER_API_KEY}",
         "Content-Type": "application/json",
@@ -1029,45 +1760,338 @@ async def call_openrouter(messages: List[dict]) -> str:
         "top_p": 1,
         "max_tokens": 900,
     }
+    if stream:
+        payload["stream"] = True
+    return headers, payload
+
+async def call_openrouter(messages: List[dict]) -> str:
+    """Call OpenRouter API for AI responses"""
+    headers, payload = openrouter_chat_request(messages)
     
-    async with httpx.AsyncClient(timeout=60) as client:
-        resp = await client.post(url, headers=headers, json=payload)
+    resp = await get_http_client().post(OPENROUTER_CHAT_URL, headers=headers, json=payload, timeout=60)
+    if resp.status_code >= 400:
+        raise HTTPException(status_code=resp.status_code, detail=resp.text)
+    data = resp.json()
+    try:
+        content = data["choices"][0]["message"]["content"].strip()
+    except Exception:
+        raise HTTPException(status_code=500, detail=f"Unexpected API response: {data}")
+    return content
+
+async def stream_openrouter(messages: List[dict]):
+    """Yield (delta_text, finish_reason) pairs from OpenRouter's streamed completion.
+    Leaving the generator early closes the upstream connection.
+    """
+    headers, payload = openrouter_chat_request(messages, stream=True)
+
+    async with get_http_client().stream("POST", OPENROUTER_CHAT_URL, headers=headers, json=payload, timeout=60) as resp:
         if resp.status_code >= 400:
-            raise HTTPException(status_code=resp.status_code, detail=resp.text)
-        data = resp.json()
-        try:
-            content = data["choices"][0]["message"]["content"].strip()
-        except Exception:
-            raise HTTPException(status_code=500, detail=f"Unexpected API response: {data}")
-        return content
+            body = await resp.aread()
+            raise HTTPException(status_code=resp.status_code, detail=body.decode("utf-8", errors="replace"))
+        async for line in resp.aiter_lines():
+            # SSE comments (": OPENROUTER PROCESSING") and blank keep-alives
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            try:
+                chunk = json.loads(data)
+            except json.JSONDecodeError:
+                continue
+            if "error" in chunk:
+                raise HTTPException(status_code=502, detail=f"Upstream stream error: {chunk['error']}")
+            choice = (chunk.get("choices") or [{}])[0]
+            delta = (choice.get("delta") or {}).get("content") or ""
+            finish_reason = choice.get("finish_reason")
+            if delta or finish_reason:
+                yield delta, finish_reason
+
+def sse_event(event: str, data: Dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def build_chat_messages(req: ChatRequest) -> Tuple[List[dict], Optional[Dict]]:
+    """Upstream messages for this turn, and the chat session when the request uses one."""
+    if req.session_id is None and req.message is None:
+        # Cap history for prompt budget
+        history = req.messages[-12:]
+
+        system_prompt = build_system_prompt(req.mode or "adaptive", req.profile)
+        messages = [{"role": "system", "content": system_prompt}] + [m.dict() for m in history]
+
+        # Basic validation: ensure last message is user
+        if not messages or messages[-1]["role"] != "user":
+            raise HTTPException(status_code=400, detail="Last message must be from user")
+        return messages, None
+
+    if not req.message or not req.message.strip():
+        raise HTTPException(status_code=400, detail="message is required when chatting in a session")
+    if len(req.message) > CHAT_MAX_MESSAGE_CHARS:
+        raise HTTPException(status_code=400, detail=f"message exceeds {CHAT_MAX_MESSAGE_CHARS} characters")
+    if req.session_id is None:
+        session = chat_sessions.create(req.mode or "adaptive", req.profile)
+    else:
+        session = get_chat_session(req.session_id)
+        if req.mode or req.profile is not None:
+            session["mode"] = req.mode or session["mode"]
+            if req.profile is not None:
+                session["profile"] = req.profile
+            chat_sessions.save(session)
+
+    messages = [{"role": "system", "content": build_system_prompt(session["mode"], session["profile"])}]
+    if session["summary"]:
+        messages.append({"role": "system", "content": f"Summary of the conversation so far:\n{session['summary']}"})
+    messages += session["messages"] + [{"role": "user", "content": req.message}]
+    return messages, session
+
+def get_chat_session(session_id: str) -> Dict:
+    session = chat_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Chat session not found or expired")
+    return session
+
+async def record_chat_turn(session: Dict, user_message: str, reply: str) -> None:
+    """Append the finished turn and, once the history is long, compact it in the background."""
+    session = await asyncio.to_thread(chat_sessions.append, session, [{"role": "user", "content": user_message},
+                                                                      {"role": "assistant", "content": reply}])
+    if chat_sessions.to_compact(session):
+        session_id = session["id"]
+        run_in_background(upstream_calls.do("chat_summary", session_id, lambda: compact_chat_session(session_id)))
+
+async def compact_chat_session(session_id: str) -> None:
+    """Fold the session's oldest messages into its running summary."""
+    session = await asyncio.to_thread(chat_sessions.get, session_id)
+    if session is None:
+        return
+    base = session["summarized"]
+    folded = chat_sessions.to_compact(session)
+    if not folded:
+        return
+    # Long coach replies are cut: their gist comes first, and the full text would cost as many tokens
+    # as the turns the summary replaces
+    transcript = "\n".join(f"{'User' if m['role'] == 'user' else 'Coach'}: {m['content'][:CHAT_SUMMARY_INPUT_CHARS]}"
+                           for m in folded)
+    prompt = f"""
+You maintain the running summary of a salary negotiation coaching conversation.
+Update the summary with the new messages below. Keep every concrete fact: offers and
+numbers, company, role, deadlines, the user's goals and concerns, advice already given
+and anything agreed. At most 150 words, plain text, no preamble.
+
+Current summary:
+{session["summary"] or "(none)"}
+
+New messages:
+{transcript}
+"""
+    try:
+        resp = await get_http_client().post(OPENROUTER_CHAT_URL,
+            headers={"Authorization": f"Bearer {os.getenv('OPENROUTER_API_KEY')}", "Content-Type": "application/json"},
+            json={"model": CHAT_SUMMARY_MODEL, "messages": [{"role": "user", "content": prompt}],
+                  "temperature": 0, "max_tokens": 400}, timeout=30)
+        resp.raise_for_status()
+        summary = resp.json()["choices"][0]["message"]["content"].strip()
+        if not summary:
+            raise ValueError("empty summary")
+    except Exception as e:
+        print(f"⚠️ Chat summary failed for session {session['id'][:8]}: {type(e).__name__}: {e}")
+        chat_compactions.inc("error")
+        # Keep the history bounded even without a summary
+        overflow = len(session["messages"]) - 2 * chat_sessions.compact_after
+        if overflow > 0:
+            await asyncio.to_thread(chat_sessions.apply_summary, session_id, session["summary"], base, overflow)
+        return
+    # Applied to the newest copy of the session; turns added meanwhile are kept
+    if await asyncio.to_thread(chat_sessions.apply_summary, session_id, summary, base, len(folded)):
+        chat_compactions.inc("ok")
+    else:
+        chat_compactions.inc("stale")
 
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat(req: ChatRequest):
     """AI Negotiation Coach chat endpoint"""
-    # Cap history for prompt budget
-    history = req.messages[-12:]
-    
-    system_prompt = build_system_prompt(req.mode, req.profile)
-    messages = [{"role": "system", "content": system_prompt}] + [m.dict() for m in history]
-    
-    # Basic validation: ensure last message is user
-    if not messages or messages[-1]["role"] != "user":
-        raise HTTPException(status_code=400, detail="Last message must be from user")
-    
-    reply = await call_openrouter(messages)
-    return ChatResponse(message=reply)
+    # session reads/writes may hit SQLite (CHAT_SESSIONS_PATH), so off the event loop
+    messages, session = await asyncio.to_thread(build_chat_messages, req)
+    with span(stage_seconds, "chat_completion"):
+        reply = await call_openrouter(messages)
+    if session is None:
+        return ChatResponse(message=reply)
+    await record_chat_turn(session, req.message, reply)
+    return ChatResponse(message=reply, session_id=session["id"])
+
+@app.post("/api/chat/stream")
+async def chat_stream(req: ChatRequest, request: Request):
+    """Streaming AI Negotiation Coach endpoint (Server-Sent Events).
+    Emits `delta` events as tokens arrive, then one `done` (or `error`) event.
+    """
+    messages, session = await asyncio.to_thread(build_chat_messages, req)
+
+    async def event_source():
+        started = time.perf_counter()
+        first_token_ms = None
+        parts: List[str] = []
+        finish_reason = None
+        try:
+            async for delta, reason in stream_openrouter(messages):
+                if await request.is_disconnected():
+                    print("Chat stream: client disconnected, cancelling upstream")
+                    return
+                if reason:
+                    finish_reason = reason
+                if delta:
+                    if first_token_ms is None:
+                        first_token_ms = round((time.perf_counter() - started) * 1000, 1)
+                        stage_seconds.observe(first_token_ms / 1000, "chat_first_token")
+                    parts.append(delta)
+                    yield sse_event("delta", {"content": delta})
+            stage_seconds.observe(time.perf_counter() - started, "chat_stream")
+            reply = "".join(parts).strip()
+            if session is not None:
+                await record_chat_turn(session, req.message, reply)
+            yield sse_event("done", {
+                "message": reply,
+                "session_id": session["id"] if session is not None else None,
+                "chunks": len(parts),
+                "finish_reason": finish_reason,
+                "time_to_first_token_ms": first_token_ms,
+                "total_ms": round((time.perf_counter() - started) * 1000, 1),
+            })
+        except asyncio.CancelledError:
+            print("Chat stream: cancelled by client disconnect")
+            raise
+        except HTTPException as e:
+            yield sse_event("error", {"status_code": e.status_code, "detail": e.detail})
+        except Exception as e:
+            print("Error in /api/chat/stream:", e)
+            yield sse_event("error", {"status_code": 500, "detail": str(e)})
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/api/chat/sessions")
+def create_chat_session(req: ChatSessionRequest):
+    """Start a server-held chat session; later turns send only session_id and message"""
+    session = chat_sessions.create(req.mode, req.profile)
+    return {"session_id": session["id"], "mode": session["mode"], "ttl_seconds": chat_sessions.ttl_seconds}
+
+@app.get("/api/chat/sessions/{session_id}")
+def chat_session_view(session_id: str):
+    """The session's running summary and recent messages"""
+    session = get_chat_session(session_id)
+    return {key: session[key] for key in ("id", "mode", "profile", "summary", "messages", "summarized",
+                                          "created_at", "updated_at")}
+
+@app.delete("/api/chat/sessions/{session_id}")
+def delete_chat_session(session_id: str):
+    if not chat_sessions.delete(session_id):
+        raise HTTPException(status_code=404, detail="Chat session not found or expired")
+    return {"status": "deleted", "session_id": session_id}
+
+@app.get("/fairness")
+def fairness(job_title: Optional[str] = None):
+    """Pay-parity report (Gender / Location group means and max/min ratio) for a job title"""
+    ensure_resources_loaded()
+    if job_title and job_title.strip():
+        titles = peer_index.match_titles(job_title)
+        if not titles:
+            return {"status": "error", "message": f"No dataset records match job title '{job_title}'."}
+    else:
+        titles = None
+    return {
+        "status": "success",
+        "job_title": job_title or "All",
+        "matched_titles": len(titles) if titles is not None else len(fairness_index.titles),
+        "bias_threshold": fairness_index.bias_threshold,
+        "report": fairness_index.report(titles),
+    }
+
+@app.get("/cache/stats")
+def cache_stats():
+    return {"resume_parse": resume_cache.stats(), "linkedin_snippet": linkedin_snippet_cache.stats(),
+            "linkedin_profile": linkedin_profile_cache.stats(), "prediction_memo": prediction_memo.stats()}
+
+@app.get("/executor/stats")
+def executor_stats():
+    """Per-stage queue wait and run time of the parsing/inference executors"""
+    return stage_executor.stats()
+
+def collect_cache_metrics():
+    caches = {"resume_parse": resume_cache.stats(), "linkedin_snippet": linkedin_snippet_cache.stats(),
+              "linkedin_profile": linkedin_profile_cache.stats(), "prediction_memo": prediction_memo.stats()}
+    yield ("payparity_cache_requests", "counter", "Cache lookups by result",
+           [({"cache": name, "result": result}, stats[key]) for name, stats in caches.items()
+            for result, key in (("hit", "hits"), ("stale", "stale_hits"), ("miss", "misses")) if key in stats])
+    yield ("payparity_cache_entries", "gauge", "Entries currently cached",
+           [({"cache": name}, stats["entries"]) for name, stats in caches.items()])
+
+def collect_executor_metrics():
+    stats = stage_executor.stats()
+    stages = stats["stages"]
+    yield ("payparity_executor_tasks", "counter", "Executor tasks by stage and outcome",
+           [({"stage": stage, "outcome": outcome}, s[key]) for stage, s in stages.items()
+            for outcome, key in (("done", "calls"), ("error", "errors"), ("rejected", "rejected"))])
+    yield ("payparity_executor_queue_seconds", "counter", "Total time tasks waited for a worker",
+           [({"stage": stage}, s["avg_queue_ms"] * s["calls"] / 1000) for stage, s in stages.items()])
+    yield ("payparity_executor_run_seconds", "counter", "Total time tasks ran on a worker",
+           [({"stage": stage}, s["avg_run_ms"] * s["calls"] / 1000) for stage, s in stages.items()])
+    yield ("payparity_executor_pending", "gauge", "Tasks running or waiting per pool",
+           [({"pool": kind}, n) for kind, n in stats["pending"].items()])
+
+def collect_single_flight_metrics():
+    kinds = upstream_calls.stats()["kinds"]
+    yield ("payparity_upstream_calls", "counter", "Coalescable upstream calls by outcome (called, coalesced)",
+           [({"kind": kind, "outcome": outcome}, s[key]) for kind, s in kinds.items()
+            for outcome, key in (("called", "calls"), ("coalesced", "coalesced"))])
+    yield ("payparity_upstream_calls_inflight", "gauge", "Distinct upstream calls currently in flight",
+           [({"kind": kind}, s["inflight"]) for kind, s in kinds.items()])
+
+def collect_chat_session_metrics():
+    stats = chat_sessions.stats()
+    yield ("payparity_chat_sessions", "gauge", "Chat sessions held in this process", [({}, stats["sessions"])])
+    yield ("payparity_chat_sessions_removed", "counter", "Chat sessions dropped, by reason",
+           [({"reason": "expired"}, stats["expired"]), ({"reason": "evicted"}, stats["evicted"])])
+
+metrics.add_collector(collect_cache_metrics)
+metrics.add_collector(collect_chat_session_metrics)
+metrics.add_collector(collect_single_flight_metrics)
+metrics.add_collector(collect_executor_metrics)
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus scrape endpoint (text exposition format)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 @app.get("/health")
 def health_check():
     return {"status": "ok", "time": datetime.utcnow().isoformat()}
 
+@app.get("/ready")
+def readiness_check():
+    """Readiness probe: 200 once the model and dataset are loaded, 503 while warming up"""
+    body = {"ready": resources_ready.is_set(), "startup_timings": startup_timings}
+    if not resources_ready.is_set():
+        return JSONResponse(status_code=503, content=body)
+    body["fast_inference"] = fast_predictor is not None
+    return body
+
+startup_timings["import_s"] = round(time.perf_counter() - _IMPORT_STARTED, 3)
+print(f"⏱️ app imported in {startup_timings['import_s']}s (model loads in the background)")
+
 # ----------------------------
 # Run
 # ----------------------------
 if __name__ == "__main__":
-    uvicorn.run(
-        app,
-        host=os.getenv("HOST", "0.0.0.0"),
-        port=int(os.getenv("PORT", 8000))
-    )
+    workers = int(os.getenv("WEB_CONCURRENCY", 1))
+    if workers > 1:
+        # Pre-fork mode: load once, then fork workers that share the model pages
+        from serve import serve
+        serve(host=os.getenv("HOST", "0.0.0.0"), port=int(os.getenv("PORT", 8000)), workers=workers)
+    else:
+        uvicorn.run(
+            app,
+            host=os.getenv("HOST", "0.0.0.0"),
+            port=int(os.getenv("PORT", 8000))
+        )
 
@@ -0,0 +1,310 @@
+# payparity-backend/audit_jobs.py
+"""
+Background pay-equity audit jobs for payroll CSVs.
+
+A job is an uploaded CSV (one employee per row) that is scored in chunks of
+chunk_rows rows: each chunk is read with pandas, handed to score_chunk (the
+app's batched model inference + comparison), and its results are appended
+to the job's results.csv. Only one chunk is in memory at a time.
+
+State lives on local disk so interrupted jobs pick up where they stopped:
+- <root>/jobs.sqlite3 holds one row per job: status, row counts, verdict
+  counts, and results_bytes, the size of results.csv after the last
+  committed chunk.
+- <root>/<job_id>/input.csv and results.csv hold the data.
+After a crash, results.csv is truncated back to results_bytes and reading
+resumes after the first processed_rows records, so no chunk is lost or
+written twice. Rows are always counted as pandas parses them (blank lines
+skipped, quoted fields may span lines), never as lines of the file.
+
+Jobs are claimed with a lease (lease_until) that the runner extends after
+every chunk. Any runner can pick up a queued job or one whose lease has
+expired. That covers restarts and several pre-forked workers sharing the
+same directory (see serve.py): exactly one worker runs a job at a time.
+"""
+import csv
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from typing import BinaryIO, Callable, Dict, List, Optional
+
+# Accepted header spellings (case/space-insensitive) for each input column
+COLUMN_ALIASES = {
+    "name": ["name", "employee", "employee_name", "full_name"],
+    "job_title": ["title", "job_title", "designation", "role", "position"],
+    "experience_years": ["experience", "experience_years", "years_of_experience", "exp", "years"],
+    "education_level": ["education", "education_level", "qualification", "degree"],
+    "location": ["location", "city", "office", "work_location"],
+    "current_salary": ["current_salary", "salary", "ctc", "annual_salary", "compensation"],
+    "skills": ["skills", "skills_required"],
+}
+REQUIRED_COLUMNS = ("job_title", "experience_years", "current_salary")
+
+FINISHED = ("completed", "failed")
+
+
+def resolve_columns(header: List[str]) -> Dict[str, str]:
+    """Map canonical column names to the CSV's own header names.
+
+    Raises ValueError naming the required columns that are missing.
+    """
+    normalized = {h.strip().lower().replace(" ", "_"): h for h in header}
+    columns = {}
+    for canonical, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in normalized:
+                columns[canonical] = normalized[alias]
+                break
+    missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+    if missing:
+        raise ValueError(f"CSV is missing required column(s): {', '.join(missing)}. "
+                         f"Found: {', '.join(header) or 'no header'}")
+    return columns
+
+
+class AuditJobs:
+    def __init__(self, root: str, score_chunk: Callable, chunk_rows: int = 2000,
+                 lease_seconds: float = 120.0, poll_seconds: float = 5.0):
+        self.root = root
+        self.score_chunk = score_chunk
+        self.chunk_rows = chunk_rows
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---------- storage ----------
+    def _db(self) -> sqlite3.Connection:
+        # SQLite connections must not cross a fork: reconnect in a new process
+        if self._pid != os.getpid():
+            os.makedirs(self.root, exist_ok=True)
+            self._lock = threading.Lock()
+            conn = sqlite3.connect(os.path.join(self.root, "jobs.sqlite3"), check_same_thread=False,
+                                   isolation_level=None, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY,"
+                " status TEXT NOT NULL,"
+                " filename TEXT,"
+                " columns TEXT NOT NULL,"
+                " total_rows INTEGER,"
+                " processed_rows INTEGER NOT NULL DEFAULT 0,"
+                " results_bytes INTEGER NOT NULL DEFAULT 0,"
+                " counts TEXT NOT NULL DEFAULT '{}',"
+                " error TEXT,"
+                " owner TEXT,"
+                " lease_until REAL NOT NULL DEFAULT 0,"
+                " created_at REAL NOT NULL,"
+                " updated_at REAL NOT NULL,"
+                " finished_at REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, created_at)")
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def job_dir(self, job_id: str) -> str:
+        return os.path.join(self.root, job_id)
+
+    def results_path(self, job_id: str) -> str:
+        return os.path.join(self.job_dir(job_id), "results.csv")
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        db = self._db()
+        with self._lock:
+            return db.execute(sql, params)
+
+    # ---------- API ----------
+    def submit(self, source: BinaryIO, filename: str) -> Dict:
+        """Store the uploaded CSV and queue a job for it. Raises ValueError for unusable CSVs."""
+        job_id = uuid.uuid4().hex
+        job_dir = self.job_dir(job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        input_path = os.path.join(job_dir, "input.csv")
+        try:
+            source.seek(0)
+            with open(input_path, "wb") as out:
+                shutil.copyfileobj(source, out, 1024 * 1024)
+            with open(input_path, newline="", encoding="utf-8-sig") as f:
+                header = next(csv.reader(f), [])
+            columns = resolve_columns(header)
+        except (UnicodeDecodeError, csv.Error) as e:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise ValueError(f"Could not read CSV: {e}")
+        except ValueError:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+
+        now = time.time()
+        self._execute(
+            "INSERT INTO jobs (id, status, filename, columns, created_at, updated_at) VALUES (?, 'queued', ?, ?, ?, ?)",
+            (job_id, filename, json.dumps(columns), now, now),
+        )
+        self._wake.set()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        row = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        total, processed = row["total_rows"], row["processed_rows"]
+        return {
+            "job_id": row["id"],
+            "status": row["status"],
+            "filename": row["filename"],
+            "columns": json.loads(row["columns"]),
+            "total_rows": total,
+            "processed_rows": processed,
+            "progress": round(processed / total, 4) if total else (1.0 if row["status"] == "completed" else 0.0),
+            "counts": json.loads(row["counts"]),
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+            "finished_at": row["finished_at"],
+        }
+
+    # ---------- runner ----------
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run_forever, name="audit-jobs", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run_forever(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self._claim()
+            except sqlite3.Error as e:
+                print(f"⚠️ Audit job claim failed: {e}")
+                job = None
+            if job is None:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+                continue
+            try:
+                self._process(job)
+            except Exception as e:
+                print(f"❌ Audit job {job['id']} failed: {e}")
+                now = time.time()
+                self._execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, updated_at = ?, finished_at = ?, lease_until = 0"
+                    " WHERE id = ? AND owner = ?",
+                    (str(e), now, now, job["id"], job["owner"]),
+                )
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        owner = f"{os.getpid()}:{threading.get_ident()}"
+        now = time.time()
+        db = self._db()
+        with self._lock:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT id FROM jobs WHERE status IN ('queued', 'running') AND lease_until < ?"
+                    " ORDER BY created_at LIMIT 1", (now,),
+                ).fetchone()
+                if row is not None:
+                    db.execute(
+                        "UPDATE jobs SET status = 'running', owner = ?, lease_until = ?, updated_at = ? WHERE id = ?",
+                        (owner, now + self.lease_seconds, now, row["id"]),
+                    )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return self._execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+
+    def _read_chunks(self, input_path: str, columns: Dict[str, str], skip: int = 0):
+        """The CSV's records in chunks of chunk_rows, after the first `skip` records.
+
+        Skipping counts parsed records, not lines: blank lines and newlines
+        inside quoted fields would shift a line-based skiprows.
+        """
+        import pandas as pd
+        reader = pd.read_csv(
+            input_path, usecols=list(columns.values()), dtype=str, keep_default_na=False,
+            encoding="utf-8-sig", chunksize=self.chunk_rows,
+        )
+        for chunk in reader:
+            if skip >= len(chunk):
+                skip -= len(chunk)
+                continue
+            if skip:
+                chunk, skip = chunk.iloc[skip:], 0
+            yield chunk
+
+    def _count_rows(self, input_path: str, columns: Dict[str, str]) -> int:
+        """Records as _read_chunks parses them, so progress ends at exactly 1.0."""
+        return sum(len(chunk) for chunk in self._read_chunks(input_path, columns))
+
+    def _process(self, job: sqlite3.Row) -> None:
+        job_id, owner = job["id"], job["owner"]
+        columns = json.loads(job["columns"])
+        input_path = os.path.join(self.job_dir(job_id), "input.csv")
+        results_path = self.results_path(job_id)
+        total = job["total_rows"]
+        if total is None:
+            total = self._count_rows(input_path, columns)
+            self._execute("UPDATE jobs SET total_rows = ? WHERE id = ?", (total, job_id))
+        processed = job["processed_rows"]
+        counts = json.loads(job["counts"])
+        if processed:
+            print(f"🔹 Resuming audit job {job_id} at row {processed}/{total}")
+
+        started = time.perf_counter()
+        with open(results_path, "a+b") as out:
+            # Drop anything written after the last committed chunk
+            out.truncate(job["results_bytes"])
+            out.seek(0, os.SEEK_END)
+            for chunk in self._read_chunks(input_path, columns, skip=processed):
+                if self._stop.is_set():
+                    # Hand the job back so the next runner resumes it right away
+                    self._execute("UPDATE jobs SET lease_until = 0 WHERE id = ? AND owner = ?", (job_id, owner))
+                    return
+                frame = chunk.rename(columns={v: k for k, v in columns.items()}).reset_index(drop=True)
+                frame.insert(0, "row", range(processed + 1, processed + 1 + len(frame)))
+                results = self.score_chunk(frame)
+                results.to_csv(out, header=out.tell() == 0, index=False, lineterminator="\n")
+                out.flush()
+                os.fsync(out.fileno())
+
+                processed += len(frame)
+                for verdict, n in results["verdict"].value_counts().items():
+                    counts[verdict] = counts.get(verdict, 0) + int(n)
+                now = time.time()
+                updated = self._execute(
+                    "UPDATE jobs SET processed_rows = ?, results_bytes = ?, counts = ?, updated_at = ?, lease_until = ?"
+                    " WHERE id = ? AND owner = ?",
+                    (processed, out.tell(), json.dumps(counts), now, now + self.lease_seconds, job_id, owner),
+                ).rowcount
+                if not updated:
+                    print(f"⚠️ Audit job {job_id} was taken over by another worker, stopping")
+                    return
+
+        now = time.time()
+        self._execute(
+            "UPDATE jobs SET status = 'completed', updated_at = ?, finished_at = ?, lease_until = 0"
+            " WHERE id = ? AND owner = ?",
+            (now, now, job_id, owner),
+        )
+        print(f"✅ Audit job {job_id}: {processed} rows in {time.perf_counter() - started:.1f}s {counts}")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark + resume check for pay-equity audit jobs (audit_jobs.py).
+
+Run from payparity-backend/:
+    python bench/bench_audit.py --rows 50000
+
+1. Generates a payroll CSV (--rows employees, header spellings the column
+   aliases have to resolve) and runs one audit job to completion with the
+   app's score_audit_chunk: rows/s and peak RSS.
+2. Resume check: a child process runs the same job and is killed with
+   os._exit mid-job, right after writing a chunk it never committed. A new
+   runner then picks the job up after the lease expires. Its results.csv
+   must be byte-identical to the uninterrupted run.
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from audit_jobs import AuditJobs  # noqa: E402
+
+TITLES = ["Software Engineer", "Data Scientist", "HR Manager", "Accountant", "Graphic Designer", "Nurse",
+          "Sales Executive", "Teacher", "Lawyer", "Supply Chain Manager", "Product Manager", "Civil Engineer"]
+EDUCATION = ["B.Tech", "MBA", "PhD", "High School", "Bachelors", "M.Sc", ""]
+CITIES = ["Bangalore", "pune", "Remote", "wfh", "Mumbai", "Hyderabad", "Chennai", "london", ""]
+
+
+def write_payroll(path, rows, seed):
+    r = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["Employee Name", "Designation", "Experience", "Qualification", "City", "CTC"])
+        for i in range(rows):
+            salary = r.choice([f"{r.randint(3, 40)} LPA", str(r.randint(300000, 4000000)),
+                               f"₹{r.randint(3, 30)},00,000", f"{r.randint(3, 30)} lakh", ""])
+            experience = r.choice([str(r.randint(0, 25)), f"{r.randint(1, 20)} years", ""])
+            w.writerow([f"Employee {i}", r.choice(TITLES), experience, r.choice(EDUCATION), r.choice(CITIES), salary])
+
+
+def run_to_completion(jobs, job_id, timeout=600):
+    jobs.start()
+    deadline = time.time() + timeout
+    while jobs.get(job_id)["status"] not in ("completed", "failed"):
+        if time.time() > deadline:
+            raise TimeoutError(f"job {job_id} did not finish")
+        time.sleep(0.05)
+    jobs.stop()
+    return jobs.get(job_id)
+
+
+def crash_after(root, payroll, chunk_rows, chunks):
+    """Child process: run the job, die without cleanup after `chunks` committed chunks."""
+    import app
+    calls = 0
+
+    def score(frame):
+        nonlocal calls
+        calls += 1
+        if calls > chunks:
+            # the chunk is written to results.csv but never committed to the DB
+            results = app.score_audit_chunk(frame)
+            with open(os.path.join(root, job_id, "results.csv"), "ab") as out:
+                results.to_csv(out, header=False, index=False)
+            os._exit(1)
+        return app.score_audit_chunk(frame)
+
+    jobs = AuditJobs(root, score, chunk_rows=chunk_rows, lease_seconds=1.0, poll_seconds=0.05)
+    with open(payroll, "rb") as f:
+        job_id = jobs.submit(f, "payroll.csv")["job_id"]
+    jobs.start()
+    time.sleep(600)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=50000)
+    ap.add_argument("--chunk-rows", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    import app
+    app.ensure_resources_loaded()
+    tmp = tempfile.mkdtemp(prefix="audit-bench-")
+    try:
+        payroll = os.path.join(tmp, "payroll.csv")
+        write_payroll(payroll, args.rows, args.seed)
+        print(f"payroll.csv: {args.rows} rows, {os.path.getsize(payroll) / 1e6:.1f} MB")
+
+        # 1. full run
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        jobs = AuditJobs(os.path.join(tmp, "full"), app.score_audit_chunk, chunk_rows=args.chunk_rows,
+                         poll_seconds=0.05)
+        with open(payroll, "rb") as f:
+            job_id = jobs.submit(f, "payroll.csv")["job_id"]
+        started = time.perf_counter()
+        job = run_to_completion(jobs, job_id)
+        elapsed = time.perf_counter() - started
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"full run: {job['status']} {job['processed_rows']} rows in {elapsed:.2f}s "
+              f"({job['processed_rows'] / elapsed:,.0f} rows/s), peak RSS {rss_before:.0f} -> {rss_after:.0f} MB")
+        print(f"  counts: {job['counts']}")
+        with open(jobs.results_path(job_id), "rb") as f:
+            expected = f.read()
+
+        # 2. crash mid-job, then resume in this process
+        root = os.path.join(tmp, "resume")
+        crash_at = max(1, args.rows // args.chunk_rows // 2)
+        child = multiprocessing.get_context("spawn").Process(
+            target=crash_after, args=(root, payroll, args.chunk_rows, crash_at))
+        child.start()
+        child.join(600)
+        resumed = AuditJobs(root, app.score_audit_chunk, chunk_rows=args.chunk_rows, poll_seconds=0.05)
+        crashed_id = next(d for d in os.listdir(root) if os.path.isdir(os.path.join(root, d)))
+        before = resumed.get(crashed_id)
+        time.sleep(1.1)  # let the dead child's lease expire
+        job = run_to_completion(resumed, crashed_id)
+        with open(resumed.results_path(crashed_id), "rb") as f:
+            identical = f.read() == expected
+        print(f"resume: child exited {child.exitcode} at {before['processed_rows']}/{before['total_rows']} rows, "
+              f"resumed to {job['status']} {job['processed_rows']} rows, results identical: {identical}")
+        sys.exit(0 if identical else 1)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: a long negotiation-coaching conversation over /api/chat,
+stateless (the client resends the history) vs a server-held session
+(chat_sessions.py).
+
+Run from payparity-backend/:
+    python bench/bench_chat_sessions.py --turns 30 --reply-words 200
+
+The app runs in-process against the fake OpenRouter (bench/fake_apis.py),
+which records request body sizes and answers with --reply-words words
+(coach replies run to a few hundred words; max_tokens is 900). Per turn it measures the bytes the
+client uploads and the bytes sent upstream, including the session's
+background summary calls. Token counts are estimated as bytes / 4. The
+stateless client sends the full history, and the server forwards the
+last 12 messages, as before sessions.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+PROFILE = {"job_title": "Data Analyst", "location": "Pune", "experience_years": 4, "current_salary": 1200000,
+           "predicted_salary": 1480000, "skills": "SQL, Python, Tableau, Excel, Statistics", "education": "MBA",
+           "verdict": "underpaid", "gap_pct": -18.9, "notes": None}
+QUESTIONS = [
+    "I got an offer of 12 LPA from Globex for a senior analyst role. Is that fair?",
+    "They said the band is fixed. How do I push back without sounding aggressive?",
+    "Can you play the recruiter and I'll practice my counter?",
+    "I'd like 15 LPA because of my churn model work, which saved 2 crore last year.",
+    "What if they offer 13 and a joining bonus instead?",
+    "How should I bring up remote days?",
+]
+
+
+async def conversation(client, behaviour, turns: int, use_session: bool, app):
+    history, session_id = [], None
+    upload = upstream = 0
+    started = time.perf_counter()
+    for turn in range(turns):
+        question = QUESTIONS[turn % len(QUESTIONS)]
+        if use_session:
+            body = {"message": question}
+            if session_id:
+                body["session_id"] = session_id
+            else:
+                body.update({"mode": "coach", "profile": PROFILE})
+        else:
+            history.append({"role": "user", "content": question})
+            body = {"messages": history, "mode": "coach", "profile": PROFILE}
+        raw = json.dumps(body).encode()
+        before = behaviour.request_bytes.get("openrouter", 0)
+        response = await client.post("/api/chat", content=raw, headers={"Content-Type": "application/json"})
+        response.raise_for_status()
+        data = response.json()
+        session_id = data.get("session_id")
+        if not use_session:
+            history.append({"role": "assistant", "content": data["message"]})
+        # let a background compaction finish so its upstream bytes count for this turn
+        while app.background_tasks:
+            await asyncio.gather(*list(app.background_tasks))
+        upload += len(raw)
+        upstream += behaviour.request_bytes.get("openrouter", 0) - before
+    return upload, upstream, time.perf_counter() - started
+
+
+async def run(args, behaviour):
+    import httpx
+    import app
+    transport = httpx.ASGITransport(app=app.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        print(f"{'mode':<10} {'upload B/turn':>14} {'upstream B/turn':>16} {'~tokens/turn':>13} {'ms/turn':>8}")
+        for use_session in (False, True):
+            upload, upstream, elapsed = await conversation(client, behaviour, args.turns, use_session, app)
+            print(f"{'session' if use_session else 'stateless':<10} {upload / args.turns:>14.0f} "
+                  f"{upstream / args.turns:>16.0f} {upstream / args.turns / 4:>13.0f} "
+                  f"{elapsed * 1000 / args.turns:>8.1f}")
+    print(app.chat_sessions.stats())
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--turns", type=int, default=30)
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--reply-words", type=int, default=200)
+    ap.add_argument("--port", type=int, default=9500)
+    args = ap.parse_args()
+
+    from fake_apis import Behaviour, service_env, start_in_thread
+    behaviour = Behaviour(latency_ms=args.latency_ms, reply_words=args.reply_words)
+    start_in_thread(behaviour, port=args.port)
+    os.environ.update(service_env("127.0.0.1", args.port))
+    os.environ["OPENROUTER_API_KEY"] = "bench"
+    asyncio.run(run(args, behaviour))
+
+
+if __name__ == "__main__":
+    main()
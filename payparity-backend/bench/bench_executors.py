@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /predict with the CPU-bound stages inline on the event loop vs
+dispatched to the executor layer (executors.py).
+
+Run from payparity-backend/:
+    python bench/bench_executors.py --requests 48 --concurrency 8 --pages 6
+
+The AI resume parser is replaced by a canned answer so only local work is
+measured. While the uploads run, /health is polled every 10 ms; its latency
+shows how long the event loop is blocked. Throughput only scales with
+--processes when the host has that many cores.
+"""
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+CONFIGS = {
+    "inline": {"pdf": "inline", "parse": "inline", "inference": "inline"},
+    "threads": {"pdf": "thread", "parse": "thread", "inference": "thread"},
+    "default": {},
+}
+
+
+def make_pdf(pages: int) -> bytes:
+    from reportlab.pdfgen import canvas
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf)
+    for p in range(pages):
+        for i in range(45):
+            c.drawString(40, 800 - i * 17, f"Software Engineer, Acme Corp, Jan {2010 + p} - Present. Python, SQL ({i})")
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+async def fake_resume_info(text, api_key):
+    return {"Job_Title": "Software Engineer", "Education_Level": "Bachelors",
+            "Location": "Bangalore", "Skills": ["Python", "SQL"]}
+
+
+def pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+
+async def run_config(app, name, pdf, requests, concurrency, processes):
+    import httpx
+    from executors import StageExecutor
+
+    app.stage_executor.shutdown()
+    app.stage_executor = StageExecutor(CONFIGS[name], processes=processes)
+    transport = httpx.ASGITransport(app=app.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            r = await client.post("/predict", files={"file": ("cv.pdf", pdf, "application/pdf")},
+                                  data={"openrouter_api_key": "bench"})
+            assert r.json().get("status") == "success", r.text[:200]
+
+        await asyncio.gather(*(one() for _ in range(concurrency)))  # warm pools
+
+        health = []
+        done = asyncio.Event()
+
+        async def poll():
+            while not done.is_set():
+                t0 = time.perf_counter()
+                await client.get("/health")
+                health.append(time.perf_counter() - t0)
+                await asyncio.sleep(0.01)
+
+        sem = asyncio.Semaphore(concurrency)
+
+        async def limited():
+            async with sem:
+                await one()
+
+        poller = asyncio.create_task(poll())
+        start = time.perf_counter()
+        await asyncio.gather(*(limited() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await poller
+    return requests / elapsed, statistics.median(health) * 1000, pct(health, 0.99), max(health) * 1000
+
+
+async def main_async(args):
+    import contextlib
+    import app
+
+    app.extract_resume_info_ai = fake_resume_info
+    app.ensure_resources_loaded()
+    pdf = make_pdf(args.pages)
+    print(f"{os.cpu_count()} CPUs, {args.pages}-page PDF ({len(pdf) / 1024:.0f} KB), "
+          f"{args.requests} requests, concurrency {args.concurrency}")
+    print(f"{'config':<8} {'req/s':>7} {'/health p50':>12} {'p99':>9} {'max':>9}")
+    for name in args.configs:
+        with contextlib.redirect_stdout(io.StringIO()):
+            rps, p50, p99, worst = await run_config(app, name, pdf, args.requests, args.concurrency, args.processes)
+        print(f"{name:<8} {rps:>7.1f} {p50:>9.1f} ms {p99:>6.1f} ms {worst:>6.1f} ms")
+    app.stage_executor.shutdown()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=48)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--pages", type=int, default=6)
+    ap.add_argument("--processes", type=int, default=0)
+    ap.add_argument("--configs", nargs="+", default=list(CONFIGS), choices=list(CONFIGS))
+    args = ap.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
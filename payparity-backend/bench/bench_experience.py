@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark + parity check: the single-pass ExperienceTimeline vs the previous
+find_date_ranges / compute_experience_for_title implementation (copied below
+as legacy_experience).
+
+Run from payparity-backend/:
+    python bench/bench_experience.py --pages 1 10 30 --titles 5
+
+Parity: on generated resumes whose roles do not overlap, both must give the
+same years for every title, up to legacy's per-range rounding (it summed
+ranges already rounded to 0.01 years). When roles overlap, the timeline
+counts the overlap once and the legacy code counted it twice. Timing: legacy re-scans
+the text for every title; the timeline is built once and then queried.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from experience_timeline import MONTHS, ExperienceTimeline  # noqa: E402
+
+TITLES = ["Software Engineer", "Data Analyst", "Product Manager", "DevOps Engineer",
+          "Backend Developer", "Data Scientist", "QA Intern", "Marketing Lead"]
+MONTH_NAMES = ["Jan", "February", "Mar", "April", "May", "Jun", "July", "Aug", "Sep", "October", "Nov", "Dec"]
+FILLER = ("Designed and shipped services used by millions of customers, mentored juniors, "
+          "and owned on-call for the payments platform across three regions. ")
+
+
+# --- legacy implementation (before the timeline engine) ---
+def _parse_year(s):
+    try:
+        y = int(s)
+        if 1900 <= y <= 2100:
+            return y
+    except Exception:
+        pass
+    return None
+
+
+def _parse_date(part):
+    part = part.strip()
+    m = re.search(r"(?P<month>[A-Za-z]+)\s+[,]?\s*(?P<year>\d{4})", part)
+    if m:
+        return (_parse_year(m.group("year")), MONTHS.get(m.group("month").lower(), 0))
+    m2 = re.search(r"(\d{4})", part)
+    if m2:
+        return (_parse_year(m2.group(1)), 0)
+    return (None, 0)
+
+
+def _find_date_ranges(text):
+    ranges = []
+    pattern = re.compile(r"""
+        (?P<left>(?:[A-Za-z]{3,9}\s+\d{4}|\d{4}))
+        \s*[-–—]\s*
+        (?P<right>(?:[A-Za-z]{3,9}\s+\d{4}|\d{4}|Present|present))
+    """, flags=re.VERBOSE)
+    for m in pattern.finditer(text):
+        sy, sm = _parse_date(m.group("left"))
+        right = m.group("right")
+        if right.lower() in ("present",):
+            now = datetime.now()
+            ey, em = (now.year, now.month)
+        else:
+            ey, em = _parse_date(right)
+        if sy and ey:
+            ranges.append({"start_year": sy, "start_month": sm, "end_year": ey, "end_month": em,
+                           "span": text[max(0, m.start() - 120):m.end() + 120]})
+    return ranges
+
+
+def legacy_experience(text, job_title_input):
+    if not text:
+        return 0.0
+    ranges = _find_date_ranges(text)
+    kws = [w.lower() for w in re.findall(r"[A-Za-z0-9\-\+\.]+", job_title_input)] if job_title_input else []
+    matched = []
+    for r in ranges:
+        if any(kw in r["span"].lower() for kw in kws):
+            months = (r["end_year"] - r["start_year"]) * 12 + (r["end_month"] - r["start_month"])
+            matched.append(round(months / 12.0, 2))
+    if not matched and any(kw in job_title_input.lower() for kw in ["developer", "engineer", "analyst", "intern", "manager"]):
+        if ranges:
+            years = max(r["end_year"] for r in ranges) - min(r["start_year"] for r in ranges)
+            return float(max(0.0, round(years, 2)))
+    elif not matched:
+        return 0.0
+    return float(round(min(sum(matched), 60.0), 2))
+
+
+# --- generated resumes ---
+def make_resume(rng, pages, overlap):
+    """~2 roles per page, newest first; roles are separated by enough filler
+    that one role's 120-char context never reaches the next role's title."""
+    roles = pages * 2
+    year, month = 2025, 6
+    parts = []
+    for i in range(roles):
+        length = rng.randint(6, 30)
+        end_y, end_m = year, month
+        start_total = end_y * 12 + end_m - length
+        start_y, start_m = divmod(start_total - 1, 12)
+        start_m += 1
+        end = "Present" if i == 0 else f"{MONTH_NAMES[end_m - 1]} {end_y}"
+        # a year-only start means month 0, i.e. it reaches back into the previous
+        # year, so only the oldest role gets one
+        start = str(start_y) if i == roles - 1 and rng.random() < 0.5 else f"{MONTH_NAMES[start_m - 1]} {start_y}"
+        parts.append(f"{rng.choice(TITLES)} | Company {i} | {start} - {end}\n" + FILLER * 3)
+        gap = -rng.randint(1, 6) if overlap and rng.random() < 0.3 else rng.randint(0, 4)
+        year, month = divmod(start_total - gap - 1, 12)
+        month += 1
+    return "\n".join(parts)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, nargs="+", default=[1, 10, 30])
+    ap.add_argument("--titles", type=int, default=5)
+    ap.add_argument("--samples", type=int, default=200)
+    args = ap.parse_args()
+    rng = random.Random(7)
+
+    mismatches = 0
+    for _ in range(args.samples):
+        text = make_resume(rng, rng.randint(1, 10), overlap=False)
+        timeline = ExperienceTimeline.from_text(text)
+        for title in TITLES:
+            # the generic-title fallback (no range mentions the title) now sums
+            # the merged timeline instead of last year - first year
+            if not any(kw.lower() in text.lower() for kw in title.split()):
+                continue
+            tolerance = 0.005 * len(timeline.ranges) + 1e-9
+            if abs(legacy_experience(text, title) - timeline.years_for_title(title)) > tolerance:
+                mismatches += 1
+    print(f"parity on {args.samples} non-overlapping resumes x {len(TITLES)} titles: {mismatches} mismatches")
+
+    text = ("Software Engineer, Acme, Jan 2019 - Dec 2022\n" + FILLER * 2 +
+            "\nSoftware Engineer (part-time consulting), Beta, Jun 2020 - Jun 2021\n")
+    print("concurrent roles (2019-2022 full-time + 2020-2021 part-time), 'Software Engineer':",
+          f"legacy {legacy_experience(text, 'Software Engineer')} y,",
+          f"timeline {ExperienceTimeline.from_text(text).years_for_title('Software Engineer')} y")
+
+    print(f"\n{'pages':>5} {'chars':>7} {'legacy (' + str(args.titles) + ' titles)':>20} {'timeline':>10} {'speedup':>8}")
+    titles = TITLES[:args.titles]
+    for pages in args.pages:
+        text = make_resume(rng, pages, overlap=True)
+        reps = max(3, 300 // pages)
+        start = time.perf_counter()
+        for _ in range(reps):
+            for t in titles:
+                legacy_experience(text, t)
+        legacy_t = (time.perf_counter() - start) / reps
+        start = time.perf_counter()
+        for _ in range(reps):
+            timeline = ExperienceTimeline.from_text(text)
+            for t in titles:
+                timeline.years_for_title(t)
+        new_t = (time.perf_counter() - start) / reps
+        print(f"{pages:>5} {len(text):>7} {legacy_t * 1000:>17.2f} ms {new_t * 1000:>7.2f} ms {legacy_t / new_t:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sklearn pipeline model.predict vs FastSalaryPredictor.
+
+Run from payparity-backend/:
+    python bench/bench_inference.py [--repeat 20]
+
+Validates both paths agree on every benchmark batch before timing them.
+"""
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from fast_inference import FEATURE_COLUMNS, FastSalaryPredictor, validate_fast_predictor  # noqa: E402
+
+MODEL_PATH = os.path.join(BACKEND_DIR, "output/xgb_salary_model_optimized.pkl")
+DATASET_PATH = os.path.join(BACKEND_DIR, "output/19kdata.csv")
+
+
+def timeit(fn, repeat: int) -> float:
+    fn()  # warm-up
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10000])
+    args = ap.parse_args()
+
+    model = joblib.load(MODEL_PATH)
+    fast = FastSalaryPredictor(model)
+    dataset = pd.read_csv(DATASET_PATH)
+    dataset["Data_Source"] = np.where(np.arange(len(dataset)) % 2, "LinkedIn", "ResumeUpload")
+
+    print(f"{'batch':>7} {'model.predict':>15} {'fast':>12} {'speedup':>8} {'max diff':>9}")
+    for size in args.sizes:
+        df = dataset.sample(size, replace=size > len(dataset), random_state=size)[FEATURE_COLUMNS]
+        rows = df.to_dict("records")
+        max_diff = validate_fast_predictor(fast, model, df)
+
+        repeat = max(3, args.repeat // (1 + size // 1000))
+        slow_t = timeit(lambda: model.predict(pd.DataFrame(rows, columns=FEATURE_COLUMNS)), repeat)
+        fast_t = timeit(lambda: fast.predict_rows(rows), repeat)
+        print(f"{size:>7} {slow_t * 1e3:>12.2f} ms {fast_t * 1e3:>9.2f} ms {slow_t / fast_t:>7.1f}x {max_diff:>9.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: category/domain detection, the old per-call keyword chains vs the
+prebuilt KeywordMatcher (keyword_matcher.py).
+
+Run from payparity-backend/:
+    python bench/bench_keywords.py
+
+Inputs are the "Extracted Skills" lines of bias_log.txt (40-skill lists,
+~470 chars) and the distinct job titles of the salary dataset. Both are
+scored by hit count (best), with keywords of three characters or fewer
+matched as whole words. Besides the timing, it reports how often the
+matcher picks a different label than the old code, with a few examples.
+"""
+import csv
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from keyword_matcher import KeywordMatcher  # noqa: E402
+
+
+# --- legacy implementation (before KeywordMatcher) ---
+def legacy_job_category(job_title):
+    jt = job_title.lower().strip()
+    category_map = {
+        "tech": ["developer", "engineer", "software", "data", "ml", "ai", "blockchain", "cloud", "it", "cyber", "analyst",
+                 "programmer", "full stack", "frontend", "backend", "system", "network"],
+        "design/arts": ["artist", "designer", "graphic", "illustrator", "musician", "writer", "editor", "creative",
+                        "ux", "ui", "photographer", "animator", "fashion"],
+        "healthcare": ["doctor", "nurse", "medical", "dentist", "physician", "therapist", "surgeon", "pharmacist"],
+        "finance": ["finance", "accountant", "bank", "investment", "trader", "auditor", "analyst", "tax"],
+        "sales/marketing": ["sales", "marketing", "brand", "advertising", "growth", "business development"],
+        "education": ["teacher", "professor", "lecturer", "trainer", "education", "counselor"],
+        "legal": ["lawyer", "attorney", "legal", "advocate", "paralegal", "compliance"],
+        "operations/management": ["manager", "operations", "project", "product", "supply chain", "logistics", "executive"],
+        "hr/recruitment": ["hr", "recruiter", "talent", "human resource", "payroll"],
+        "other": []
+    }
+    for cat, keywords in category_map.items():
+        if any(k in jt for k in keywords):
+            return cat.title()
+    return "Other"
+
+
+def legacy_domain(text):
+    tech_keywords = ["python", "java", "developer", "engineer", "ai", "ml", "cloud", "data", "react", "node", "sql", "software"]
+    healthcare_keywords = ["doctor", "nurse", "medical", "surgery", "patient", "clinic", "hospital", "health"]
+    finance_keywords = ["finance", "accounting", "tax", "audit", "bank", "investment", "economics"]
+    education_keywords = ["teacher", "professor", "lecturer", "trainer", "education", "school"]
+    legal_keywords = ["law", "attorney", "advocate", "legal", "compliance", "paralegal"]
+    design_keywords = ["designer", "artist", "creative", "ui", "ux", "graphics", "illustrator", "animation", "fashion"]
+    sales_keywords = ["marketing", "sales", "advertising", "promotion", "branding", "customer", "retail"]
+    ops_keywords = ["manager", "operations", "executive", "project", "product", "supply", "logistics", "coordinator"]
+    text = text.lower()
+    if any(k in text for k in tech_keywords): return "tech"
+    if any(k in text for k in healthcare_keywords): return "healthcare"
+    if any(k in text for k in finance_keywords): return "finance"
+    if any(k in text for k in education_keywords): return "education"
+    if any(k in text for k in legal_keywords): return "legal"
+    if any(k in text for k in design_keywords): return "design"
+    if any(k in text for k in sales_keywords): return "sales/marketing"
+    if any(k in text for k in ops_keywords): return "management"
+    return "other"
+
+
+def per_call_us(fn, inputs, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for x in inputs:
+            fn(x)
+    return (time.perf_counter() - start) / (repeat * len(inputs)) * 1e6
+
+
+def compare(name, legacy, new, inputs, repeat):
+    old_t, new_t = per_call_us(legacy, inputs, repeat), per_call_us(new, inputs, repeat)
+    changed = [x for x in inputs if legacy(x) != new(x)]
+    print(f"{name:<28} {len(inputs):>6} {old_t:>9.2f} us {new_t:>9.2f} us   {len(changed)} changed")
+    for x in changed[:4]:
+        print(f"    {x[:60]!r}: {legacy(x)} -> {new(x)}")
+
+
+def main():
+    import app
+
+    skills = [line.split(":", 1)[1].strip() for line in open(os.path.join(BACKEND_DIR, "bias_log.txt"), encoding="utf-8")
+              if line.startswith("Extracted Skills:")]
+    # a fresh matcher per call: what it would cost without building it once
+    rebuilt = lambda t: KeywordMatcher(app.DOMAIN_KEYWORDS).best(t, "other")
+    with open(app.DATASET_PATH, newline="", encoding="utf-8") as f:
+        titles = sorted({row["Job_Title"] for row in csv.DictReader(f)})
+
+    print(f"{'input':<28} {'n':>6} {'legacy':>12} {'matcher':>12}")
+    compare("skills -> domain", legacy_domain, app.detect_domain, skills, 2000)
+    compare("skills -> domain (rebuilt)", legacy_domain, rebuilt, skills, 2000)
+    compare("titles -> domain", legacy_domain, app.detect_domain, titles, 200)
+    compare("titles -> job category", legacy_job_category, app.detect_job_category, titles, 200)
+
+
+if __name__ == "__main__":
+    main()
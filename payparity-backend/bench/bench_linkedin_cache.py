@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the two-tier LinkedIn cache (Serper snippet per profile URL,
+parsed profile per snippet) with stale-while-revalidate.
+
+Run from payparity-backend/:
+    python bench/bench_linkedin_cache.py --profiles 20 --latency-ms 300
+
+extract_linkedin_info runs in-process against the fake Serper/OpenRouter
+services (bench/fake_apis.py). The caches live in a temp directory.
+Phases, each over --profiles distinct URLs:
+    cold    empty caches: Serper search, then the LLM parse
+    warm    both tiers fresh: no network
+    stale   both tiers past their TTL: served from cache at once, with a
+            refresh started in the background
+    after   once the refreshes finish, fresh again
+Reports ms per lookup (p50/max) and the upstream calls made in each phase.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+async def phase(app, urls):
+    timings, empty = [], 0
+    for url in urls:
+        started = time.perf_counter()
+        info = await app.extract_linkedin_info(url, "bench")
+        timings.append((time.perf_counter() - started) * 1000)
+        empty += not info
+    return timings, empty
+
+
+async def run(args, behaviour):
+    import app
+    urls = [f"https://www.linkedin.com/in/bench-profile-{i}/" for i in range(args.profiles)]
+    print(f"{'phase':<7} {'p50 ms':>8} {'max ms':>8} {'upstream':>9} {'empty':>6}")
+
+    async def report(name):
+        before = sum(behaviour.requests.values())
+        timings, empty = await phase(app, urls)
+        upstream = sum(behaviour.requests.values()) - before
+        print(f"{name:<7} {statistics.median(timings):>8.1f} {max(timings):>8.1f} {upstream:>9} {empty:>6}")
+
+    await report("cold")
+    await report("warm")
+    for cache in (app.linkedin_snippet_cache, app.linkedin_profile_cache):
+        cache.ttl_seconds = 0
+    await report("stale")
+    pending, before = len(app.background_tasks), sum(behaviour.requests.values())
+    while app.background_tasks:
+        await asyncio.gather(*list(app.background_tasks))
+    started = sum(app.cache_refreshes.value(name) for name in ("linkedin_snippet", "linkedin_profile"))
+    print(f"        {started:.0f} refreshes started (stale hits joining one in flight are not counted); "
+          f"{pending} still pending made {sum(behaviour.requests.values()) - before} more upstream calls")
+    for cache, ttl in ((app.linkedin_snippet_cache, 3600), (app.linkedin_profile_cache, 3600)):
+        cache.ttl_seconds = ttl
+    await report("after")
+    for name in ("linkedin_snippet", "linkedin_profile"):
+        stats = getattr(app, f"{name}_cache").stats()
+        print(f"{name}: {stats['hits']} hits, {stats['stale_hits']} stale, {stats['misses']} misses")
+    await app.get_http_client().aclose()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--profiles", type=int, default=20)
+    ap.add_argument("--latency-ms", type=float, default=300.0)
+    ap.add_argument("--port", type=int, default=9400)
+    args = ap.parse_args()
+
+    from fake_apis import Behaviour, service_env, start_in_thread
+    behaviour = Behaviour(latency_ms=args.latency_ms)
+    start_in_thread(behaviour, port=args.port)
+    cache_dir = tempfile.mkdtemp(prefix="linkedin-cache-bench-")
+    os.environ.update(service_env("127.0.0.1", args.port))
+    os.environ.update({"OPENROUTER_API_KEY": "bench",
+                       "LINKEDIN_SNIPPET_CACHE_PATH": os.path.join(cache_dir, "linkedin_snippets.sqlite3"),
+                       "LINKEDIN_PROFILE_CACHE_PATH": os.path.join(cache_dir, "linkedin_profiles.sqlite3")})
+    asyncio.run(run(args, behaviour))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the hot local steps of /predict, with a regression gate.
+
+Run from payparity-backend/:
+    python bench/bench_micro.py                         # print timings
+    python bench/bench_micro.py --save bench/baseline.json
+    python bench/bench_micro.py --compare bench/baseline.json --tolerance 0.25
+
+Cases:
+    experience_timeline   ExperienceTimeline.from_text + years_for_title for 5
+                          titles (what find_date_ranges +
+                          compute_experience_for_title became)
+    peer_comparisons      get_peer_comparisons for 51 titles
+    model_predict_1       model.predict (sklearn pipeline) on one row
+    model_predict_256     model.predict on a 256-row batch
+    run_model_1           run_model on one row (fast predictor when enabled)
+    run_model_256         run_model on a 256-row batch
+
+Each case reports the best of --repeat rounds in µs per call. --compare
+exits 1 when any case is slower than the baseline by more than --tolerance
+(a fraction). Baselines are only meaningful on the same machine.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+RESUME = """Priya Sharma
+Senior Software Engineer, Acme Corp, Bangalore          Jan 2021 - Present
+Software Engineer, Initech, Pune                        Jun 2018 - Dec 2020
+Data Analyst Intern, Globex                             May 2017 - Aug 2017
+Teaching Assistant (Machine Learning), XYZ University   2016 - 2017
+Skills: Python, SQL, AWS, Docker, Kubernetes, React, Kafka, Spark
+Education: B.Tech Computer Science, 2014 - 2018
+""" * 3
+
+
+def best_us(fn, calls, repeat):
+    fn()  # warm-up
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best * 1e6
+
+
+def cases(app):
+    import pandas as pd
+    from experience_timeline import ExperienceTimeline
+
+    titles = ["Software Engineer", "Data Analyst", "Teaching Assistant", "Product Manager", "Engineer"]
+    dataset = app.salary_dataset
+    sample = dataset.sample(256, random_state=0).copy()
+    sample["Data_Source"] = "ResumeUpload"
+    rows = sample[app.MODEL_FEATURES].to_dict("records")
+    frame_1, frame_256 = pd.DataFrame(rows[:1]), pd.DataFrame(rows)
+    peer_titles = list(dict.fromkeys(dataset["Job_Title"].tolist()))[:50] + ["Senior Backend Developer"]
+
+    def experience():
+        timeline = ExperienceTimeline.from_text(RESUME)
+        for title in titles:
+            timeline.years_for_title(title)
+
+    def peers():
+        for i, title in enumerate(peer_titles):
+            app.get_peer_comparisons(title, 500000 + i * 10000, 3)
+
+    return {
+        "experience_timeline": (experience, 200),
+        "peer_comparisons": (peers, 5),
+        "model_predict_1": (lambda: app.model.predict(frame_1), 50),
+        "model_predict_256": (lambda: app.model.predict(frame_256), 10),
+        "run_model_1": (lambda: app.run_model(rows[:1]), 200),
+        "run_model_256": (lambda: app.run_model(rows), 20),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--save", help="write the timings to this JSON file")
+    ap.add_argument("--compare", help="baseline JSON from --save")
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    args = ap.parse_args()
+
+    import app
+    app.ensure_resources_loaded()
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["cases"]
+
+    results, regressions = {}, []
+    print(f"{'case':<22} {'us/call':>12} {'baseline':>12} {'change':>8}")
+    for name, (fn, calls) in cases(app).items():
+        us = best_us(fn, calls, args.repeat)
+        results[name] = round(us, 2)
+        line = f"{name:<22} {us:>12.1f}"
+        if baseline and name in baseline:
+            change = us / baseline[name] - 1
+            line += f" {baseline[name]:>12.1f} {change:>+7.0%}"
+            if change > args.tolerance:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"machine": platform.platform(), "python": platform.python_version(),
+                       "fast_inference": app.fast_predictor is not None, "cases": results}, f, indent=2)
+        print(f"saved to {args.save}")
+    if regressions:
+        print(f"{len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: column normalizers vs the scalar ones they mirror
+(normalizers.py). The columns come from the value generators of
+tests/test_normalizers.py, which holds the equivalence property tests.
+
+Run from payparity-backend/:
+    python bench/bench_normalizers.py --rows 50000
+
+Benchmark: Series.apply(scalar) vs the column version, on a payroll-like
+column (values repeat), on one where a quarter of the rows are distinct, and
+on a column of all-distinct values (mapped row by row, see map_distinct).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import normalizers as N  # noqa: E402
+from tests.test_normalizers import ALLOWED, gen_education, gen_location, gen_salary, scalar_salary  # noqa: E402
+
+
+def timed(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench(rows, seed):
+    r = random.Random(seed)
+    # payroll-like: a few hundred distinct spellings repeated across rows
+    pools = {
+        "salary": [gen_salary(r) for _ in range(300)],
+        "education": [gen_education(r) for _ in range(60)],
+        "location": [gen_location(r) for _ in range(40)],
+    }
+    columns = {
+        "salary": (scalar_salary, N.parse_salary_column),
+        "education": (N.normalize_education, N.normalize_education_column),
+        "location": (lambda v: N.normalize_location(v, ALLOWED), lambda c: N.normalize_location_column(c, ALLOWED)),
+    }
+    print(f"\n{'column':<10} {'values':<9} {'rows':>7} {'Series.apply':>13} {'column fn':>10} {'speedup':>8}")
+    for name, (scalar, column) in columns.items():
+        repeated = pd.Series([r.choice(pools[name]) for _ in range(rows)], dtype=object)
+        distinct = pd.Series([f"{r.randint(1, 99)}.{i} lakh" for i in range(rows)] if name == "salary"
+                             else [f"{r.choice(pools[name]) or ''} {i}" for i in range(rows)], dtype=object)
+        # every 4th row distinct: factorizing still pays off
+        mixed = pd.Series([d if i % 4 == 0 else v for i, (v, d) in enumerate(zip(repeated, distinct))], dtype=object)
+        for label, series in (("repeated", repeated), ("mixed", mixed), ("distinct", distinct)):
+            t_apply = timed(lambda: series.apply(scalar))
+            t_col = timed(lambda: column(series))
+            assert np.array_equal(np.asarray(series.apply(scalar), dtype=object).astype(str),
+                                  np.asarray(column(series), dtype=object).astype(str))
+            print(f"{name:<10} {label:<9} {rows:>7} {t_apply * 1000:>10.1f} ms {t_col * 1000:>7.1f} ms "
+                  f"{t_apply / t_col:>7.1f}x")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=50000)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+    bench(args.rows, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: local Tesseract OCR (process pool) vs the OCR.Space API on
+multi-page scanned resumes.
+
+Run from payparity-backend/ (needs tesseract + poppler for the local path,
+network + OCR_SPACE_API_KEY for the remote path):
+    python bench/bench_ocr.py --pages 1 3 5 [--skip-remote]
+
+The scanned PDFs are generated here: text is drawn onto page images with
+Pillow and saved as an image-only PDF, so there is no text layer to extract.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+LINES = [
+    "Senior Software Engineer | Acme Corp | Jan 2019 - Present",
+    "Built data pipelines in Python, SQL and Apache Spark on AWS.",
+    "Software Engineer | Globex | Jun 2016 - Dec 2018",
+    "Developed REST APIs with Django and PostgreSQL; led CI/CD migration.",
+    "Education: B.Tech Computer Science, 2016 | Location: Bangalore",
+    "Skills: Python, Java, Docker, Kubernetes, React, Machine Learning",
+]
+
+
+def make_scanned_pdf(path: str, pages: int) -> None:
+    from PIL import Image, ImageDraw, ImageFont
+    try:
+        font = ImageFont.truetype("DejaVuSans.ttf", 28)
+    except OSError:
+        font = ImageFont.load_default()
+    images = []
+    for p in range(pages):
+        img = Image.new("L", (1654, 2339), color=255)  # A4 at 200 dpi
+        draw = ImageDraw.Draw(img)
+        y = 120
+        for i in range(40):
+            draw.text((120, y), f"{LINES[(i + p) % len(LINES)]}", fill=0, font=font)
+            y += 52
+        images.append(img)
+    images[0].save(path, "PDF", resolution=200.0, save_all=True, append_images=images[1:])
+
+
+async def run(pages_list, skip_remote: bool, repeat: int):
+    import local_ocr
+    import app
+
+    local = None
+    if local_ocr.local_ocr_available():
+        # No cache: measure OCR itself, not cache hits
+        local = local_ocr.LocalOCR(max_pages=max(pages_list))
+    else:
+        print("tesseract/pdftoppm not found: skipping local OCR")
+
+    print(f"{'pages':>5} {'local OCR':>12} {'OCR.Space':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in pages_list:
+            path = os.path.join(tmp, f"scan_{pages}.pdf")
+            make_scanned_pdf(path, pages)
+            with open(path, "rb") as f:
+                data = f.read()
+            local_t = remote_t = None
+            if local is not None:
+                await local.extract(data, path)  # warm the pool
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    await local.extract(data, path)
+                local_t = (time.perf_counter() - start) / repeat
+            if not skip_remote:
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    await app.extract_text_with_ocr_api(data, path)
+                remote_t = (time.perf_counter() - start) / repeat
+            fmt = lambda t: f"{t:>10.2f} s" if t is not None else f"{'-':>12}"
+            print(f"{pages:>5} {fmt(local_t)} {fmt(remote_t)}")
+    local_ocr.shutdown()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, nargs="+", default=[1, 3, 5])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--skip-remote", action="store_true")
+    args = ap.parse_args()
+    asyncio.run(run(args.pages, args.skip_remote, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: request coalescing (single_flight.py) on a burst of identical
+/predict submissions.
+
+Run from payparity-backend/:
+    python bench/bench_singleflight.py --burst 50 --latency-ms 300
+
+The fake OpenRouter/Serper services (bench/fake_apis.py) run in a thread,
+and the app is driven in-process through httpx's ASGI transport. Each round
+sends --burst concurrent requests for one input:
+    linkedin   the same profile URL in several spellings (scheme, www,
+               query string, trailing slash)
+    resume     the same .txt resume with no job title, so the LLM parse runs
+Every round uses a fresh input so the persistent caches start cold. The
+burst runs once with coalescing off and once with it on. For each run the
+table shows the upstream calls the fakes received and the burst's
+wall-clock time.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+RESUME = """Jane Roe | Pune | jane@example.com
+Senior Data Analyst, Globex                 Mar 2019 - Present
+Analyst, Initech                            Jan 2016 - Feb 2019
+Built churn and pricing dashboards used by the sales leadership team.
+Education: MBA
+Run {n}
+"""
+URL_VARIANTS = ["https://www.linkedin.com/in/jane-roe-{n}/", "http://linkedin.com/in/jane-roe-{n}",
+                "https://in.linkedin.com/in/Jane-Roe-{n}?trk=share", "linkedin.com/in/jane-roe-{n}#about"]
+
+
+async def burst(client, scenario: str, n: int, size: int):
+    def request(i):
+        if scenario == "linkedin":
+            url = URL_VARIANTS[i % len(URL_VARIANTS)].format(n=n)
+            return client.post("/predict", data={"linkedin_url": url, "current_salary": "900000"})
+        return client.post("/predict", data={"openrouter_api_key": "bench", "current_salary": "900000"},
+                           files={"file": ("resume.txt", RESUME.format(n=n).encode())})
+
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(request(i) for i in range(size)))
+    elapsed = time.perf_counter() - started
+    ok = sum(r.status_code == 200 and r.json().get("status") == "success" for r in responses)
+    return elapsed, ok
+
+
+async def run(args, behaviour):
+    import httpx
+    import app
+    app.ensure_resources_loaded()
+    print(f"{'scenario':<10} {'coalescing':<11} {'upstream':>9} {'ok':>5} {'burst ms':>9}")
+    transport = httpx.ASGITransport(app=app.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        n = 0
+        for scenario in ("linkedin", "resume"):
+            for enabled in (False, True):
+                n += 1
+                app.upstream_calls.enabled = enabled
+                before = sum(behaviour.requests.values())
+                elapsed, ok = await burst(client, scenario, n, args.burst)
+                upstream = sum(behaviour.requests.values()) - before
+                print(f"{scenario:<10} {'on' if enabled else 'off':<11} {upstream:>9} "
+                      f"{ok:>2}/{args.burst:<2} {elapsed * 1000:>9.0f}")
+    print(app.upstream_calls.stats())
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--burst", type=int, default=50)
+    ap.add_argument("--latency-ms", type=float, default=300.0)
+    ap.add_argument("--port", type=int, default=9300)
+    args = ap.parse_args()
+
+    from fake_apis import Behaviour, service_env, start_in_thread
+    behaviour = Behaviour(latency_ms=args.latency_ms)
+    start_in_thread(behaviour, port=args.port)
+    cache_dir = tempfile.mkdtemp(prefix="singleflight-bench-")
+    os.environ.update(service_env("127.0.0.1", args.port))
+    os.environ.update({"OPENROUTER_API_KEY": "bench", "SERPER_API_KEY": "bench", "LOCAL_SKILLS": "0",
+                       "RESUME_CACHE_PATH": os.path.join(cache_dir, "resume_cache.sqlite3"),
+                       "LINKEDIN_SNIPPET_CACHE_PATH": os.path.join(cache_dir, "linkedin_snippets.sqlite3"),
+                       "LINKEDIN_PROFILE_CACHE_PATH": os.path.join(cache_dir, "linkedin_profiles.sqlite3")})
+    asyncio.run(run(args, behaviour))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the local skill extractor (skill_extractor.py) that lets /predict
+skip the LLM resume parse.
+
+Run from payparity-backend/:
+    python bench/bench_skills.py
+
+Two inputs:
+- Synthetic resumes, one per common skills-section layout (comma list,
+  bullets, grouped "Label: a, b" lines, pipes, prose only). For each one it
+  reports coverage, how many skills matched, and whether /predict would skip
+  the LLM (SKILL_COVERAGE_MIN / SKILL_MIN_COUNT). Prose-only resumes should
+  still go to the LLM.
+- The LLM skill lists in bias_log.txt ("Extracted Skills: ..."), fed back as
+  a "Skills:" section. Recall is the share of the LLM's items that the
+  extractor also found.
+
+Timings are µs per analyze() call, best of 5 rounds.
+"""
+import os
+import re
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+HEADER = """Priya Sharma | Bengaluru, India | priya@example.com
+Senior Software Engineer, Acme Corp                    Jan 2021 - Present
+- Built payment APIs serving 2M requests/day; led a team of 4
+Software Engineer, Initech                             Jun 2018 - Dec 2020
+Education: B.Tech Computer Science, 2014 - 2018
+"""
+
+RESUMES = {
+    "comma_list": HEADER + "Skills: Python, Java, SQL, Postgres, Redis, Docker, Kubernetes, AWS, Git, REST APIs\n",
+    "bullets": HEADER + "TECHNICAL SKILLS\n• Python\n• Django\n• React.js\n• MongoDB\n• Jenkins\n• Terraform\n"
+                        "• Agile\nPROJECTS\nInventory tracker in Go and React\n",
+    "grouped": HEADER + "Technical Skills\nLanguages: Python, TypeScript, C++, Go\n"
+                        "Frameworks: Spring-Boot, Node.js, Angular\nTools: Git, JIRA, Docker, CI/CD\n"
+                        "Databases: MySQL, Elasticsearch\n",
+    "pipes": HEADER + "Core Competencies: Financial Modeling | Excel | Tableau | Power BI | SQL | Forecasting\n",
+    "prose_only": HEADER + "I enjoy building backend services and have shipped several large systems with "
+                           "my team, mostly on cloud platforms.\n",
+}
+
+
+def best_us(fn, calls=200, repeat=5):
+    fn()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best * 1e6
+
+
+def llm_lists():
+    path = os.path.join(BACKEND_DIR, "bias_log.txt")
+    with open(path, encoding="utf-8") as f:
+        lines = [m.group(1) for m in re.finditer(r"^Extracted Skills: (.+)$", f.read(), re.M)]
+    return list(dict.fromkeys(lines))
+
+
+def main():
+    import app
+    app.ensure_resources_loaded()
+    extractor = app.skill_extractor
+
+    print(f"{'layout':<12} {'coverage':>9} {'skills':>7} {'LLM':>6} {'us/call':>9}")
+    skipped = 0
+    for name, text in RESUMES.items():
+        result = app.extract_skills_local(text)
+        skipped += result["confident"]
+        print(f"{name:<12} {result['coverage']:>9.0%} {len(result['skills']):>7} "
+              f"{'skip' if result['confident'] else 'call':>6} {best_us(lambda: extractor.analyze(text)):>9.1f}")
+        print(f"{'':<12} {', '.join(result['skills'])}")
+    print(f"LLM skipped for {skipped}/{len(RESUMES)} layouts")
+
+    print()
+    total = recalled = 0
+    for i, line in enumerate(llm_lists()):
+        items = [s.strip() for s in line.split(",") if s.strip()]
+        found = set(extractor.analyze("Skills: " + line)["skills"])
+        hits = [item for item in items if set(extractor.analyze("Skills: " + item)["skills"]) & found]
+        missed = [item for item in items if item not in hits]
+        total += len(items)
+        recalled += len(hits)
+        print(f"bias_log list {i + 1}: recall {len(hits)}/{len(items)}; missed: {', '.join(missed) or '-'}")
+    if total:
+        print(f"overall recall of LLM skills: {recalled / total:.0%}")
+
+
+if __name__ == "__main__":
+    main()
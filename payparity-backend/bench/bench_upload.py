@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: resume upload handling, old temp-file path vs reading the spooled
+upload directly.
+
+Run from payparity-backend/:
+    python bench/bench_upload.py --concurrency 1 16 64 --pages 2 --image-kb 0 500 2000
+
+"tempfile" reproduces the previous /predict flow: `await file.read()` copies
+the upload into memory, the bytes are written to a NamedTemporaryFile, and
+PyPDF2 reopens it by path. "spooled" hands the upload's SpooledTemporaryFile
+straight to extract_text_from_resume. Both run `concurrency` uploads at once.
+ms/upload is timed without tracing; peak is the tracemalloc peak of Python
+allocations in a separate round. --image-kb embeds a photo-sized image on the
+first page, as most real resume PDFs carry fonts and images.
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def make_pdf(pages: int, image_kb: int) -> bytes:
+    from reportlab.pdfgen import canvas
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf)
+    if image_kb:
+        from PIL import Image
+        from reportlab.lib.utils import ImageReader
+        side = int((image_kb * 1024 / 3) ** 0.5)
+        c.drawImage(ImageReader(Image.frombytes("RGB", (side, side), os.urandom(side * side * 3))), 400, 700, 120, 120)
+    for p in range(pages):
+        for i in range(45):
+            c.drawString(40, 800 - i * 17, f"Software Engineer, Acme Corp, Jan 2019 - Present. Python, SQL, AWS ({p}.{i})")
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+def spooled(data: bytes):
+    f = tempfile.SpooledTemporaryFile(max_size=2 * 1024 * 1024)
+    f.write(data)
+    f.seek(0)
+    return f
+
+
+async def old_path(upload, extract_by_path) -> str:
+    content = upload.read()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+        tmp.write(content)
+    try:
+        return await extract_by_path(tmp.name)
+    finally:
+        os.remove(tmp.name)
+
+
+async def run_round(mode: str, data: bytes, concurrency: int, app):
+    import pdf_extract
+
+    async def extract_by_path(path):
+        result = await asyncio.to_thread(pdf_extract.extract_pdf_text, path, char_budget=app.PDF_TEXT_BUDGET)
+        return "\n".join(t for _, t in result["pages"])
+
+    async def once():
+        uploads = [spooled(data) for _ in range(concurrency)]
+        try:
+            if mode == "tempfile":
+                await asyncio.gather(*(old_path(u, extract_by_path) for u in uploads))
+            else:
+                await asyncio.gather(*(app.extract_text_from_resume(u, "resume.pdf") for u in uploads))
+        finally:
+            for u in uploads:
+                u.close()
+
+    start = time.perf_counter()
+    await once()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    await once()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+async def main_async(concurrency_list, pages: int, image_kbs, repeat):
+    import contextlib
+    import app
+
+    print(f"{'size':>8} {'conc':>5} {'mode':<9} {'ms/upload':>10} {'peak MB':>9}")
+    for image_kb in image_kbs:
+        data = make_pdf(pages, image_kb)
+        for conc in concurrency_list:
+            for mode in ("tempfile", "spooled"):
+                best = None
+                for _ in range(repeat):
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        elapsed, peak = await run_round(mode, data, conc, app)
+                    if best is None or elapsed < best[0]:
+                        best = (elapsed, peak)
+                print(f"{len(data) / 1024:>6.0f}KB {conc:>5} {mode:<9} "
+                      f"{best[0] * 1000 / conc:>10.2f} {best[1] / 1024 / 1024:>9.2f}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    ap.add_argument("--pages", type=int, default=2)
+    ap.add_argument("--image-kb", type=int, nargs="+", default=[0, 500, 2000])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+    asyncio.run(main_async(args.concurrency, args.pages, args.image_kb, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Per-worker memory: `uvicorn app:app --workers N` vs the pre-fork launcher (serve.py).
+
+Run from payparity-backend/ (Linux only, reads /proc):
+    python bench/bench_workers.py --workers 4 8
+
+Each server is warmed up with /predict/batch requests, then RSS and PSS
+(proportional set size: shared pages divided between the processes sharing
+them) of every worker process are read from /proc/<pid>/smaps_rollup.
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROFILE = {"job_title": "Software Engineer", "experience_years": 3, "skills": ["Python", "SQL"],
+           "education_level": "Bachelors", "location": "Pune"}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def children_of(pid: int):
+    out = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{entry}/cmdline", "rb") as f:
+                cmdline = f.read().replace(b"\0", b" ").decode(errors="replace")
+        except OSError:
+            continue
+        if int(fields[1]) == pid and "resource_tracker" not in cmdline:
+            out.append(int(entry))
+    return out
+
+
+def memory_kb(pid: int):
+    rss = pss = 0
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Rss:"):
+                rss = int(line.split()[1])
+            elif line.startswith("Pss:"):
+                pss = int(line.split()[1])
+    return rss, pss
+
+
+def request(port: int, path: str, body=None, timeout=30):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(f"http://127.0.0.1:{port}{path}", data=data,
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return resp.status
+
+
+def measure(mode: str, workers: int, warmup: int):
+    port = free_port()
+    if mode == "uvicorn":
+        cmd = [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port),
+               "--workers", str(workers), "--log-level", "warning"]
+    else:
+        cmd = [sys.executable, "serve.py", "--port", str(port), "--workers", str(workers),
+               "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.time() + 120
+        while time.time() < deadline:
+            try:
+                request(port, "/predict/batch", {"profiles": [PROFILE]})
+                break
+            except Exception:
+                time.sleep(0.5)
+        for _ in range(warmup):
+            request(port, "/predict/batch", {"profiles": [PROFILE] * 10, "include_peers": True})
+        time.sleep(1.0)
+
+        pids = children_of(proc.pid)
+        stats = [memory_kb(p) for p in pids]
+        rss = sum(s[0] for s in stats) / len(stats) / 1024
+        pss = sum(s[1] for s in stats) / len(stats) / 1024
+        total_pss = sum(s[1] for s in stats) / 1024 + memory_kb(proc.pid)[1] / 1024
+        return len(pids), rss, pss, total_pss
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, nargs="+", default=[4, 8])
+    ap.add_argument("--warmup", type=int, default=200)
+    args = ap.parse_args()
+
+    print(f"{'workers':>7}  {'mode':<22} {'avg RSS/worker':>15} {'avg PSS/worker':>15} {'total PSS':>10}")
+    for n in args.workers:
+        for mode, label in (("uvicorn", "uvicorn --workers"), ("prefork", "serve.py (pre-fork)")):
+            found, rss, pss, total = measure(mode, n, args.warmup)
+            print(f"{n:>7}  {label:<22} {rss:>12.0f} MB {pss:>12.0f} MB {total:>7.0f} MB  ({found} workers)")
+
+
+if __name__ == "__main__":
+    main()
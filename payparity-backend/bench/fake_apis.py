@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for OpenRouter, Serper and OCR.Space, for load tests.
+
+Run from payparity-backend/:
+    python bench/fake_apis.py --latency-ms 300 --jitter-ms 100 --error-rate 0.02
+
+Each service listens on its own port (--port, --port + 1, --port + 2), so
+the app's per-service metrics stay separate. Point the app at them with:
+
+    OPENROUTER_CHAT_URL=http://127.0.0.1:9100/api/v1/chat/completions
+    SERPER_SEARCH_URL=http://127.0.0.1:9101/search
+    OCR_SPACE_URL=http://127.0.0.1:9102/parse/image
+
+(service_env() returns exactly this.) Every response waits --latency-ms
+plus up to --jitter-ms. Each request fails with --error-status at
+--error-rate. OpenRouter answers the resume, skills and LinkedIn parser
+prompts with canned JSON, the chat-summary prompt with a canned summary,
+and everything else with a chat reply. With "stream": true it sends the
+reply as SSE chunks, --token-ms apart.
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Dict
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+RESUME_INFO = {"Job_Title": "Software Engineer", "Education_Level": "Bachelors", "Location": "Bangalore",
+               "Skills": ["Python", "SQL", "AWS", "Docker", "React"]}
+LINKEDIN_INFO = {"Job_Title": "Data Scientist", "Skills": "Python, Machine Learning, SQL, Statistics",
+                 "Education_Level": "Masters", "Location": "Pune", "Total_Experience_Years": 4}
+CHAT_REPLY = ("Start by anchoring on the market data for your role: similar profiles in your city earn "
+              "15-20% more. Ask for a revision citing your recent project impact, and keep the tone "
+              "collaborative. If the base is fixed, negotiate the joining bonus or an early review.")
+OCR_TEXT = ("Jane Roe\nSenior Data Analyst, Globex, Mar 2019 - Present\nAnalyst, Initech, Jan 2016 - Feb 2019\n"
+            "Skills: SQL, Python, Tableau, Excel, Statistics\nEducation: MBA, Bangalore")
+CHAT_SUMMARY = ("User is a data analyst in Pune with a 12 LPA offer from Globex, targeting 15 LPA. "
+                "Coach advised citing market data and the churn-model impact, and asking for a joining bonus "
+                "if the base is fixed. Deadline to reply is Friday.")
+SNIPPET = "Data Scientist at Acme · Pune · 4 years of experience in Python, machine learning and SQL"
+
+
+class Behaviour:
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 500, token_ms: float = 20.0, seed: int = 0, reply_words: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.token_ms = token_ms
+        self.reply_words = reply_words
+        self._random = random.Random(seed)
+        self.requests: Dict[str, int] = {}
+        self.request_bytes: Dict[str, int] = {}
+
+    def chat_reply(self) -> str:
+        """CHAT_REPLY, or its words repeated to reply_words words."""
+        if not self.reply_words:
+            return CHAT_REPLY
+        words = CHAT_REPLY.split(" ")
+        return " ".join(words[i % len(words)] for i in range(self.reply_words))
+
+    async def respond(self, service: str, size: int = 0):
+        """Wait the configured latency; an error response if this request is to fail, else None.
+        size is the request body length, summed per service in request_bytes."""
+        self.requests[service] = self.requests.get(service, 0) + 1
+        self.request_bytes[service] = self.request_bytes.get(service, 0) + size
+        await asyncio.sleep((self.latency_ms + self._random.uniform(0, self.jitter_ms)) / 1000)
+        if self._random.random() < self.error_rate:
+            return JSONResponse({"error": {"message": f"injected {service} failure"}}, status_code=self.error_status)
+        return None
+
+
+def completion(content: str) -> Dict:
+    return {"id": "fake", "object": "chat.completion",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}]}
+
+
+def openrouter_app(behaviour: Behaviour) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/api/v1/chat/completions")
+    async def chat_completions(request: Request):
+        raw = await request.body()
+        error = await behaviour.respond("openrouter", len(raw))
+        if error is not None:
+            return error
+        body = json.loads(raw)
+        prompt = body["messages"][-1]["content"]
+        if "expert resume parser" in prompt and '"skills"' in prompt:
+            return completion(json.dumps({"skills": RESUME_INFO["Skills"]}))
+        if "expert resume parser" in prompt:
+            return completion("```json\n" + json.dumps(RESUME_INFO) + "\n```")
+        if "LinkedIn text" in prompt:
+            return completion(json.dumps(LINKEDIN_INFO))
+        if "running summary" in prompt:
+            return completion(CHAT_SUMMARY)
+        if not body.get("stream"):
+            return completion(behaviour.chat_reply())
+
+        async def chunks():
+            for word in behaviour.chat_reply().split(" "):
+                await asyncio.sleep(behaviour.token_ms / 1000)
+                yield f"data: {json.dumps({'choices': [{'delta': {'content': word + ' '}}]})}\n\n"
+            yield f"data: {json.dumps({'choices': [{'delta': {}, 'finish_reason': 'stop'}]})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    return app
+
+
+def serper_app(behaviour: Behaviour) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/search")
+    async def search(request: Request):
+        error = await behaviour.respond("serper")
+        if error is not None:
+            return error
+        query = (await request.json()).get("q", "")
+        # a distinct snippet per profile, so parsed-profile caching behaves as with real results
+        snippet = f"{SNIPPET} · {query.split()[-1] if query else ''}"
+        return {"searchParameters": {"q": query}, "organic": [{"title": "LinkedIn profile", "snippet": snippet}]}
+
+    return app
+
+
+def ocr_space_app(behaviour: Behaviour) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/parse/image")
+    async def parse_image(request: Request):
+        await request.body()
+        error = await behaviour.respond("ocr_space")
+        if error is not None:
+            return error
+        return {"ParsedResults": [{"ParsedText": OCR_TEXT}], "OCRExitCode": 1, "IsErroredOnProcessing": False}
+
+    return app
+
+
+def service_env(host: str, port: int) -> Dict[str, str]:
+    """Environment that points the app at fake services started on port, port+1, port+2."""
+    return {
+        "OPENROUTER_CHAT_URL": f"http://{host}:{port}/api/v1/chat/completions",
+        "SERPER_SEARCH_URL": f"http://{host}:{port + 1}/search",
+        "OCR_SPACE_URL": f"http://{host}:{port + 2}/parse/image",
+    }
+
+
+def serve_all(behaviour: Behaviour, host: str = "127.0.0.1", port: int = 9100) -> None:
+    """Run the three fake services in this thread until interrupted."""
+    apps = [openrouter_app(behaviour), serper_app(behaviour), ocr_space_app(behaviour)]
+    servers = [uvicorn.Server(uvicorn.Config(app, host=host, port=port + i, log_level="warning",
+                                             lifespan="off", backlog=4096))
+               for i, app in enumerate(apps)]
+
+    async def main():
+        await asyncio.gather(*(server.serve() for server in servers))
+
+    asyncio.run(main())
+
+
+def start_in_thread(behaviour: Behaviour, host: str = "127.0.0.1", port: int = 9100) -> threading.Thread:
+    thread = threading.Thread(target=serve_all, args=(behaviour, host, port), daemon=True, name="fake-apis")
+    thread.start()
+    time.sleep(0.5)
+    return thread
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Fake OpenRouter / Serper / OCR.Space servers")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=9100)
+    ap.add_argument("--latency-ms", type=float, default=300.0)
+    ap.add_argument("--jitter-ms", type=float, default=100.0)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--error-status", type=int, default=500)
+    ap.add_argument("--token-ms", type=float, default=20.0)
+    ap.add_argument("--reply-words", type=int, default=0, help="chat reply length (default: the canned reply)")
+    args = ap.parse_args()
+    for name, value in service_env(args.host, args.port).items():
+        print(f"{name}={value}")
+    serve_all(Behaviour(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status, args.token_ms,
+                        reply_words=args.reply_words), args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
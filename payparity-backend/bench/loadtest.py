@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Load test: concurrent /predict and /api/chat traffic against a real server
+process whose external APIs are local fakes (bench/fake_apis.py).
+
+Run from payparity-backend/:
+    python bench/loadtest.py --duration 30 --concurrency 16
+    python bench/loadtest.py --mix pdf=1,chat_stream=1 --latency-ms 800 --error-rate 0.05
+    python bench/loadtest.py --workers 4      # pre-forked, via serve.py
+
+It starts the fake OpenRouter/Serper/OCR.Space servers and the API
+(uvicorn app:app, or serve.py when --workers > 1) as subprocesses, waits for
+/ready, sends one warm-up request per scenario and then keeps --concurrency
+requests in flight for --duration seconds (or until --requests are done).
+
+Scenarios (weights via --mix):
+    pdf, docx, txt   resume upload to /predict (AI parse -> fake OpenRouter)
+    image            PNG resume to /predict (OCR -> fake OCR.Space)
+    linkedin         /predict with linkedin_url (fake Serper + OpenRouter)
+    chat             /api/chat
+    chat_stream      /api/chat/stream, read to the `done` event
+
+Reported per scenario: count, failures, requests/s and p50/p95/p99/max
+latency (for chat_stream also the time to first token), plus the mean time
+per stage from the Server-Timing header, and the server's peak RSS (sum over
+its process tree, sampled every 100 ms). Resumes cycle through --variants
+distinct files per type, so the resume-parse cache only hits after the
+first --variants uploads of each type (image resumes always OCR to the
+same fake text, so their parse is a cache hit after the first). Exits 1 if
+any request failed and --error-rate is 0.
+"""
+import argparse
+import asyncio
+import io
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "bench"))
+
+from fake_apis import service_env  # noqa: E402
+
+DEFAULT_MIX = "pdf=3,docx=1,txt=1,image=1,linkedin=1,chat=2,chat_stream=1"
+
+RESUME_LINES = [
+    "Priya Sharma - Software Engineer - Bangalore",
+    "Software Engineer, Acme Corp, Jan 2019 - Present",
+    "Junior Developer, Initech, Jun 2016 - Dec 2018",
+    "Skills: Python, SQL, AWS, Docker, React, Kubernetes",
+    "Education: B.Tech in Computer Science, 2016",
+]
+
+
+# ----------------------------
+# Resume fixtures
+# ----------------------------
+def resume_lines(variant: int):
+    return RESUME_LINES + [f"Reference number {variant}"]
+
+
+def make_pdf(variant: int) -> bytes:
+    from reportlab.pdfgen import canvas
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf)
+    for page in range(2):
+        for i, line in enumerate(resume_lines(variant) * 6):
+            c.drawString(40, 800 - i * 17, f"{line} ({page}.{i})")
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+def make_docx(variant: int) -> bytes:
+    from docx import Document
+    doc = Document()
+    for line in resume_lines(variant):
+        doc.add_paragraph(line)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def make_txt(variant: int) -> bytes:
+    return "\n".join(resume_lines(variant)).encode("utf-8")
+
+
+def make_png(variant: int) -> bytes:
+    from PIL import Image, ImageDraw
+    img = Image.new("L", (900, 300), 255)
+    draw = ImageDraw.Draw(img)
+    for i, line in enumerate(resume_lines(variant)):
+        draw.text((20, 20 + i * 40), line, fill=0)
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+FIXTURES = {
+    "pdf": (make_pdf, "resume.pdf", "application/pdf"),
+    "docx": (make_docx, "resume.docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    "txt": (make_txt, "resume.txt", "text/plain"),
+    "image": (make_png, "resume.png", "image/png"),
+}
+
+
+# ----------------------------
+# Scenarios
+# ----------------------------
+class Result:
+    __slots__ = ("scenario", "latency", "ok", "ttft", "stages", "detail")
+
+    def __init__(self, scenario, latency, ok, ttft=None, stages=None, detail=""):
+        self.scenario = scenario
+        self.latency = latency
+        self.ok = ok
+        self.ttft = ttft
+        self.stages = stages or {}
+        self.detail = detail
+
+
+def parse_server_timing(header: str):
+    stages = {}
+    for part in filter(None, (p.strip() for p in (header or "").split(","))):
+        name, _, dur = part.partition(";dur=")
+        if dur:
+            stages[name] = stages.get(name, 0.0) + float(dur)
+    return stages
+
+
+async def run_predict(client, scenario, files_by_kind, n):
+    if scenario == "linkedin":
+        return await client.post("/predict", data={"linkedin_url": f"https://www.linkedin.com/in/someone-{n}",
+                                                   "current_salary": "12 LPA"})
+    _, filename, mime = FIXTURES[scenario]
+    variants = files_by_kind[scenario]
+    return await client.post("/predict", files={"file": (filename, variants[n % len(variants)], mime)},
+                             data={"current_salary": "12 LPA"})
+
+
+CHAT_BODY = {"mode": "coach", "messages": [
+    {"role": "user", "content": "My offer is 18 LPA for a senior data analyst role in Bangalore. How do I negotiate?"}]}
+
+
+async def one_request(client, scenario, files_by_kind, n) -> Result:
+    started = time.perf_counter()
+    try:
+        if scenario == "chat_stream":
+            ttft, done = None, False
+            async with client.stream("POST", "/api/chat/stream", json=CHAT_BODY) as resp:
+                event = None
+                async for line in resp.aiter_lines():
+                    if line.startswith("event:"):
+                        event = line[6:].strip()
+                        if event == "delta" and ttft is None:
+                            ttft = time.perf_counter() - started
+                    elif line.startswith("data:") and event in ("done", "error"):
+                        done = event == "done"
+                        detail = line[5:].strip()[:120]
+                        break
+                else:
+                    detail = f"HTTP {resp.status_code}, stream ended without done"
+            return Result(scenario, time.perf_counter() - started, resp.status_code == 200 and done, ttft,
+                          parse_server_timing(resp.headers.get("server-timing")), "" if done else detail)
+        if scenario == "chat":
+            resp = await client.post("/api/chat", json=CHAT_BODY)
+            ok = resp.status_code == 200
+        else:
+            resp = await run_predict(client, scenario, files_by_kind, n)
+            ok = resp.status_code == 200 and resp.json().get("status") == "success"
+        return Result(scenario, time.perf_counter() - started, ok,
+                      stages=parse_server_timing(resp.headers.get("server-timing")),
+                      detail="" if ok else f"HTTP {resp.status_code}: {resp.text[:120]}")
+    except Exception as e:
+        return Result(scenario, time.perf_counter() - started, False, detail=f"{type(e).__name__}: {e}")
+
+
+async def drive(base_url, mix, files_by_kind, concurrency, duration, total, seed):
+    scenarios, weights = zip(*mix.items())
+    rng = random.Random(seed)
+    results = []
+    counter = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        for scenario in scenarios:  # warm-up, not recorded
+            await one_request(client, scenario, files_by_kind, 0)
+
+        async def worker():
+            nonlocal counter
+            while time.perf_counter() < deadline and (total is None or counter < total):
+                counter += 1
+                n = counter
+                results.append(await one_request(client, rng.choices(scenarios, weights)[0], files_by_kind, n))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return results, elapsed
+
+
+# ----------------------------
+# Processes and memory
+# ----------------------------
+def process_tree(pid):
+    pids = [pid]
+    for p in pids:
+        try:
+            for tid in os.listdir(f"/proc/{p}/task"):
+                with open(f"/proc/{p}/task/{tid}/children") as f:
+                    pids.extend(int(c) for c in f.read().split())
+        except OSError:
+            continue
+    return pids
+
+
+def rss_kb(pid, field="VmRSS"):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+class RssSampler(threading.Thread):
+    def __init__(self, pid, interval=0.1):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak_kb = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.peak_kb = max(self.peak_kb, sum(rss_kb(p) for p in process_tree(self.pid)))
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def wait_ready(base_url, proc, timeout=180):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            sys.exit(f"server exited with {proc.returncode} before becoming ready")
+        try:
+            if httpx.get(base_url + "/ready", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    sys.exit("server did not become ready in time")
+
+
+def stop_process(proc):
+    if proc.poll() is None:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+# ----------------------------
+# Report
+# ----------------------------
+def pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000 if values else float("nan")
+
+
+def report(results, elapsed, peak_rss_kb):
+    by_scenario = defaultdict(list)
+    for r in results:
+        by_scenario[r.scenario].append(r)
+    print(f"\n{'scenario':<12} {'n':>6} {'fail':>5} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, rs in sorted(by_scenario.items()) + [("TOTAL", results)]:
+        lat = [r.latency for r in rs]
+        print(f"{name:<12} {len(rs):>6} {sum(not r.ok for r in rs):>5} {len(rs) / elapsed:>7.1f} "
+              f"{pct(lat, .5):>8.1f} {pct(lat, .95):>8.1f} {pct(lat, .99):>8.1f} {max(lat) * 1000:>8.1f}")
+    ttft = [r.ttft for r in by_scenario.get("chat_stream", []) if r.ttft is not None]
+    if ttft:
+        print(f"chat_stream time to first token: p50 {pct(ttft, .5):.1f} ms, p95 {pct(ttft, .95):.1f} ms, "
+              f"p99 {pct(ttft, .99):.1f} ms")
+
+    print("\nmean ms per stage (Server-Timing):")
+    for name, rs in sorted(by_scenario.items()):
+        totals = defaultdict(float)
+        for r in rs:
+            for stage, ms in r.stages.items():
+                totals[stage] += ms
+        if totals:
+            print(f"  {name:<12} " + ", ".join(f"{stage} {ms / len(rs):.1f}" for stage, ms in totals.items()))
+
+    failures = [r for r in results if not r.ok]
+    if failures:
+        print(f"\n{len(failures)} failed requests, e.g.:")
+        for r in failures[:5]:
+            print(f"  {r.scenario}: {r.detail}")
+    print(f"\nserver peak RSS (process tree): {peak_rss_kb / 1024:.0f} MB")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--duration", type=float, default=30.0)
+    ap.add_argument("--requests", type=int, default=None, help="stop after this many requests")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--mix", default=DEFAULT_MIX)
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--port", type=int, default=8100)
+    ap.add_argument("--fake-port", type=int, default=9100)
+    ap.add_argument("--latency-ms", type=float, default=300.0)
+    ap.add_argument("--jitter-ms", type=float, default=100.0)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--token-ms", type=float, default=20.0)
+    ap.add_argument("--variants", type=int, default=50)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--server-log", default=os.devnull, help="file for the server's output")
+    args = ap.parse_args()
+
+    mix = {}
+    for item in args.mix.split(","):
+        name, _, weight = item.partition("=")
+        if name not in FIXTURES and name not in ("linkedin", "chat", "chat_stream"):
+            sys.exit(f"unknown scenario {name!r}")
+        mix[name] = float(weight or 1)
+    files_by_kind = {kind: [make(v) for v in range(args.variants)]
+                     for kind, (make, _, _) in FIXTURES.items() if kind in mix}
+
+    tmp = tempfile.mkdtemp(prefix="loadtest-")
+    env = {**os.environ, **service_env("127.0.0.1", args.fake_port),
+           "OPENROUTER_API_KEY": "fake-key", "SERPER_API_KEY": "fake-key", "OCR_BACKEND": "remote",
+           "RESUME_CACHE_PATH": os.path.join(tmp, "resume_cache.sqlite3"), "AUDIT_DIR": os.path.join(tmp, "audits"),
+           "LINKEDIN_SNIPPET_CACHE_PATH": os.path.join(tmp, "linkedin_snippets.sqlite3"),
+           "LINKEDIN_PROFILE_CACHE_PATH": os.path.join(tmp, "linkedin_profiles.sqlite3"),
+           "SLOW_REQUEST_SECONDS": "1000"}
+    fakes = subprocess.Popen(
+        [sys.executable, os.path.join(BACKEND_DIR, "bench", "fake_apis.py"), "--port", str(args.fake_port),
+         "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+         "--error-rate", str(args.error_rate), "--token-ms", str(args.token_ms)],
+        stdout=subprocess.DEVNULL)
+    if args.workers > 1:
+        cmd = [sys.executable, "serve.py", "--host", "127.0.0.1", "--port", str(args.port),
+               "--workers", str(args.workers), "--log-level", "warning"]
+    else:
+        cmd = [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(args.port),
+               "--log-level", "warning"]
+    log = open(args.server_log, "w")
+    server = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_ready(base_url, server)
+        print(f"server ready ({' '.join(cmd[1:3])}, workers={args.workers}); fake API latency "
+              f"{args.latency_ms:g}+{args.jitter_ms:g} ms, error rate {args.error_rate:g}; "
+              f"concurrency {args.concurrency}, mix {args.mix}")
+        sampler = RssSampler(server.pid)
+        sampler.start()
+        results, elapsed = asyncio.run(drive(base_url, mix, files_by_kind, args.concurrency,
+                                             args.duration, args.requests, args.seed))
+        sampler.stop()
+        report(results, elapsed, sampler.peak_kb)
+    finally:
+        stop_process(server)
+        stop_process(fakes)
+        log.close()
+    sys.exit(1 if args.error_rate == 0 and any(not r.ok for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
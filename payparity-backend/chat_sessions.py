@@ -0,0 +1,198 @@
+# payparity-backend/chat_sessions.py
+"""
+Server-held negotiation chat sessions, so /api/chat clients send only the
+new message instead of the whole conversation.
+
+A session is a dict: id, mode, profile, summary, messages (the recent
+turns, as {"role", "content"}), summarized (how many messages the summary
+covers), created_at and updated_at. Sessions live in an in-process LRU.
+They expire ttl_seconds after their last turn, and the least recently
+used ones are dropped past max_sessions.
+
+History is bounded by compaction rather than truncation. Once a session
+holds more than compact_after messages, the oldest ones (all but the last
+keep_recent) are folded into the running summary by the app's
+summarizer. apply_summary() then replaces them.
+
+The summarizer and a request's LLM call both take seconds, and meanwhile
+the cached dict can be swapped for a newer copy saved by another worker. So
+append() and apply_summary() re-read the session by id and change that
+newest copy. A turn appended while the summarizer runs is kept, because
+only the messages that were summarized are removed. A summary is dropped
+when `summarized` shows that someone else compacted the session first.
+
+With a persist_path, every save also writes the session to a small SQLite
+file (lazily connected per process, like ResultCache). A session missing
+from memory, or older there than on disk, is reloaded from the file. That
+lets sessions survive restarts and follow a user across the pre-forked
+workers of serve.py. Expired rows are deleted at most once every
+sweep_seconds, not on every save; get() checks the TTL itself, so a row
+that outlives its TTL until the next sweep is never served. These calls
+block on SQLite, so async callers run them in a thread (asyncio.to_thread).
+"""
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+class ChatSessions:
+    def __init__(self, max_sessions: int = 5000, ttl_seconds: float = 2 * 3600, compact_after: int = 8,
+                 keep_recent: int = 4, persist_path: Optional[str] = None, sweep_seconds: float = 60.0):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.compact_after = compact_after
+        self.keep_recent = keep_recent
+        self.persist_path = persist_path
+        self.sweep_seconds = sweep_seconds
+        self._swept_at = 0.0
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+        self.compactions = 0
+        self._sessions: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    # --- persistence ---
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if not self.persist_path:
+            return None
+        # SQLite connections must not cross a fork: reconnect in a new process
+        if self._pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.persist_path)), exist_ok=True)
+            conn = sqlite3.connect(self.persist_path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS sessions ("
+                         " id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS sessions_updated ON sessions(updated_at)")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def _load(self, session_id: str, newer_than: float) -> Optional[Dict]:
+        db = self._db()
+        if db is None:
+            return None
+        row = db.execute("SELECT data FROM sessions WHERE id = ? AND updated_at > ?",
+                         (session_id, newer_than)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    # --- sessions ---
+    def create(self, mode: str, profile: Optional[Dict] = None) -> Dict:
+        now = time.time()
+        session = {"id": secrets.token_urlsafe(16), "mode": mode, "profile": profile or {}, "summary": "",
+                   "messages": [], "summarized": 0, "created_at": now, "updated_at": now}
+        with self._lock:
+            self.created += 1
+        self.save(session)
+        return session
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        """The live session, or None when it is unknown or has expired."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+            newer_than = session["updated_at"] if session is not None else 0.0
+            stored = self._load(session_id, newer_than)
+            if stored is not None:
+                session = self._sessions[session_id] = stored
+                self._evict()
+        if session is None:
+            return None
+        if time.time() - session["updated_at"] > self.ttl_seconds:
+            self.delete(session_id)
+            with self._lock:
+                self.expired += 1
+            return None
+        return session
+
+    def save(self, session: Dict) -> None:
+        session["updated_at"] = time.time()
+        with self._lock:
+            self._sessions[session["id"]] = session
+            self._sessions.move_to_end(session["id"])
+            self._evict()
+            db = self._db()
+            if db is not None:
+                db.execute("INSERT OR REPLACE INTO sessions (id, data, updated_at) VALUES (?, ?, ?)",
+                           (session["id"], json.dumps(session, ensure_ascii=False), session["updated_at"]))
+                if session["updated_at"] - self._swept_at >= self.sweep_seconds:
+                    self._swept_at = session["updated_at"]
+                    db.execute("DELETE FROM sessions WHERE updated_at < ?", (self._swept_at - self.ttl_seconds,))
+
+    def append(self, session: Dict, messages: List[Dict]) -> Dict:
+        """Add messages to the newest copy of the session and save it; returns that copy."""
+        latest = self.get(session["id"]) or session
+        latest["messages"] = latest["messages"] + messages
+        self.save(latest)
+        return latest
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            found = self._sessions.pop(session_id, None) is not None
+            db = self._db()
+            if db is not None:
+                found = db.execute("DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount > 0 or found
+        return found
+
+    def _evict(self) -> None:
+        now = time.time()
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if len(self._sessions) > self.max_sessions:
+                self.evicted += 1
+            elif now - oldest["updated_at"] > self.ttl_seconds:
+                self.expired += 1
+            else:
+                break
+            self._sessions.popitem(last=False)
+
+    # --- compaction ---
+    def to_compact(self, session: Dict) -> List[Dict]:
+        """The oldest messages to fold into the summary, or [] while the history is short enough."""
+        messages = session["messages"]
+        if len(messages) <= self.compact_after:
+            return []
+        return messages[:len(messages) - self.keep_recent]
+
+    def apply_summary(self, session_id: str, summary: str, base: int, folded: int) -> bool:
+        """Replace the first `folded` messages with the updated running summary.
+        base is the session's `summarized` count when the summarizer read it; if that
+        changed, the summary is stale and nothing is applied (returns False)."""
+        session = self.get(session_id)
+        if session is None or session["summarized"] != base or len(session["messages"]) < folded:
+            return False
+        session["summary"] = summary
+        session["messages"] = session["messages"][folded:]
+        session["summarized"] += folded
+        with self._lock:
+            self.compactions += 1
+        self.save(session)
+        return True
+
+    def close(self) -> None:
+        if self._conn is None or self._pid != os.getpid():
+            return
+        with self._lock:
+            self._conn.close()
+            self._conn = None
+            self._pid = None
+
+    def stats(self) -> Dict:
+        return {
+            "sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+            "persistent": bool(self.persist_path),
+            "created": self.created,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "compactions": self.compactions,
+        }
@@ -0,0 +1,219 @@
+# payparity-backend/dataset_store.py
+"""
+Columnar, memory-mapped storage for the salary dataset.
+
+The CSV is converted once (at build time, or on first start) into a directory
+of .npy files plus a manifest:
+- string columns are dictionary encoded: a small category list in the
+  manifest and an int8/int16/int32 code array per column (-1 = missing)
+- numeric columns are downcast to the smallest integer/float dtype that holds them
+
+Workers open the arrays with np.load(mmap_mode="r"), so every uvicorn worker
+on the host shares one copy of the data through the OS page cache instead of
+each parsing the CSV into object-dtype strings.
+
+Files are never rewritten in place, since a worker may have them mapped.
+Each build goes into a fresh build-* directory inside out_dir, and the
+"current" symlink is then swapped to it atomically. Readers resolve the
+symlink once, so they always see one complete build. Builders hold a lock
+file in out_dir, so when several workers start together only one builds.
+The previous build is kept for readers that resolved it just before the
+swap. Older builds are removed.
+
+Build manually with:
+    python dataset_store.py output/19kdata.csv output/19kdata.columnar
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: no build lock
+    fcntl = None
+
+MANIFEST = "manifest.json"
+CURRENT = "current"
+LOCK = ".build.lock"
+FORMAT_VERSION = 1
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _code_dtype(n_categories: int):
+    # -1 is reserved for missing values
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _downcast(values: pd.Series) -> np.ndarray:
+    if pd.api.types.is_integer_dtype(values):
+        return pd.to_numeric(values, downcast="integer").to_numpy()
+    if pd.api.types.is_float_dtype(values):
+        return pd.to_numeric(values, downcast="float").to_numpy()
+    return values.to_numpy()
+
+
+@contextmanager
+def _build_lock(out_dir: str):
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, LOCK), "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _write_columns(csv_path: str, build_dir: str) -> Dict:
+    df = pd.read_csv(csv_path)
+    columns = []
+    for col in df.columns:
+        series = df[col]
+        entry = {"name": col}
+        if pd.api.types.is_numeric_dtype(series):
+            arr = _downcast(series)
+            entry["kind"] = "numeric"
+        else:
+            cat = series.astype("category")
+            categories = [str(c) for c in cat.cat.categories]
+            arr = cat.cat.codes.to_numpy().astype(_code_dtype(len(categories)))
+            entry["kind"] = "dictionary"
+            entry["categories"] = categories
+        entry["dtype"] = str(arr.dtype)
+        entry["file"] = f"{len(columns):02d}.npy"
+        np.save(os.path.join(build_dir, entry["file"]), np.ascontiguousarray(arr))
+        columns.append(entry)
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "source_sha256": file_digest(csv_path),
+        "rows": len(df),
+        "columns": columns,
+    }
+    with open(os.path.join(build_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    return manifest
+
+
+def _publish(out_dir: str, build_dir: str) -> None:
+    """Point out_dir/current at build_dir, then drop builds no reader can still be opening."""
+    current = os.path.join(out_dir, CURRENT)
+    previous = os.path.realpath(current) if os.path.islink(current) else None
+    link = os.path.join(out_dir, f".{CURRENT}.{os.getpid()}")
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(os.path.basename(build_dir), link)
+    os.replace(link, current)
+    keep = {os.path.realpath(build_dir), previous}
+    for name in os.listdir(out_dir):
+        path = os.path.join(out_dir, name)
+        if name.startswith("build-") and os.path.realpath(path) not in keep:
+            shutil.rmtree(path, ignore_errors=True)
+        elif name == MANIFEST or name.endswith(".npy"):
+            # Left over from the old in-place layout; mapped copies stay valid after unlink
+            os.remove(path)
+
+
+def _build(csv_path: str, out_dir: str) -> Dict:
+    # Caller holds the build lock
+    build_dir = tempfile.mkdtemp(prefix="build-", dir=out_dir)
+    try:
+        os.chmod(build_dir, 0o755)
+        manifest = _write_columns(csv_path, build_dir)
+        _publish(out_dir, build_dir)
+    except BaseException:
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+    return manifest
+
+
+def build_columnar(csv_path: str, out_dir: str) -> Dict:
+    """Convert csv_path into a new columnar build under out_dir and make it current; returns the manifest."""
+    with _build_lock(out_dir):
+        return _build(csv_path, out_dir)
+
+
+def _current_build(out_dir: str) -> str:
+    return os.path.realpath(os.path.join(out_dir, CURRENT))
+
+
+def _read_manifest(build_dir: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(build_dir, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format_version") != FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def read_manifest(out_dir: str) -> Optional[Dict]:
+    return _read_manifest(_current_build(out_dir))
+
+
+def is_current(csv_path: str, out_dir: str) -> bool:
+    manifest = read_manifest(out_dir)
+    return bool(manifest) and manifest.get("source_sha256") == file_digest(csv_path)
+
+
+def load_columnar(out_dir: str) -> pd.DataFrame:
+    """Open the store memory-mapped; dictionary columns become pandas Categoricals."""
+    # Resolve once so a concurrent rebuild cannot mix files from two builds
+    build_dir = _current_build(out_dir)
+    manifest = _read_manifest(build_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No columnar dataset at {out_dir}")
+    data = {}
+    for entry in manifest["columns"]:
+        arr = np.load(os.path.join(build_dir, entry["file"]), mmap_mode="r")
+        if entry["kind"] == "dictionary":
+            data[entry["name"]] = pd.Categorical.from_codes(arr, categories=entry["categories"])
+        else:
+            data[entry["name"]] = pd.Series(arr, copy=False)
+    return pd.DataFrame(data, copy=False)
+
+
+def load_dataset(csv_path: str, out_dir: str, auto_build: bool = True) -> pd.DataFrame:
+    """Columnar load when the store matches the CSV (building it if allowed), else read the CSV."""
+    if not is_current(csv_path, out_dir):
+        if not auto_build:
+            print(f"⚠️ Columnar dataset missing or stale at {out_dir}, reading CSV")
+            return pd.read_csv(csv_path)
+        try:
+            with _build_lock(out_dir):
+                # Another worker may have built it while we waited for the lock
+                if not is_current(csv_path, out_dir):
+                    print(f"🔹 Building columnar dataset at {out_dir}")
+                    _build(csv_path, out_dir)
+        except OSError as e:
+            print(f"⚠️ Could not build columnar dataset ({e}), reading CSV")
+            return pd.read_csv(csv_path)
+    return load_columnar(out_dir)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python dataset_store.py <csv_path> <out_dir>")
+        sys.exit(2)
+    m = build_columnar(sys.argv[1], sys.argv[2])
+    print(f"Wrote {m['rows']} rows, {len(m['columns'])} columns to {sys.argv[2]}")
@@ -0,0 +1,172 @@
+# payparity-backend/executors.py
+"""
+Executor layer for the CPU-bound stages of /predict.
+
+Each named stage is dispatched to one of:
+- "thread":  a shared thread pool, for work that releases the GIL (XGBoost
+             and numpy inference, lxml parsing in python-docx),
+- "process": a shared spawn-context process pool, for pure-Python parsing
+             (PyPDF2), which would serialize on the GIL in threads,
+- "inline":  the calling thread (debugging, or single-core hosts).
+
+Each pool accepts at most max_queue tasks (running + waiting). Past that,
+run() raises ExecutorBusy so the API can answer 503 instead of letting the
+backlog grow without bound. Per-stage counters record calls, errors,
+rejections, queue wait and run time.
+
+Functions sent to the process pool must be module-level (picklable), and
+their arguments must be picklable too (bytes, not open files). Keep them in
+small modules (pdf_extract.py, parse_stages.py) rather than app.py, because
+spawned workers import the function's module to unpickle it.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+STAGE_KINDS = ("thread", "process", "inline")
+DEFAULT_STAGE_KINDS = {"pdf": "process", "parse": "thread", "inference": "thread"}
+
+
+class ExecutorBusy(RuntimeError):
+    """The stage's pool already has max_queue tasks running or waiting."""
+
+
+def parse_stage_kinds(spec: str) -> Dict[str, str]:
+    """'pdf=thread,parse=process' -> {"pdf": "thread", "parse": "process"}."""
+    kinds = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        stage, _, kind = item.partition("=")
+        kind = kind.strip().lower()
+        if kind not in STAGE_KINDS:
+            raise ValueError(f"Unknown executor kind {kind!r} for stage {stage.strip()!r}, expected one of {STAGE_KINDS}")
+        kinds[stage.strip()] = kind
+    return kinds
+
+
+def _timed_call(fn: Callable, args: tuple, kwargs: dict):
+    """Runs in the worker: the start time (wall clock, comparable across
+    processes), the run time and the result."""
+    started = time.time()
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return started, time.perf_counter() - t0, result
+
+
+class StageExecutor:
+    def __init__(self, stage_kinds: Optional[Dict[str, str]] = None, threads: Optional[int] = None,
+                 processes: Optional[int] = None, max_queue: int = 64):
+        self.stage_kinds = {**DEFAULT_STAGE_KINDS, **(stage_kinds or {})}
+        cpus = os.cpu_count() or 1
+        self.threads = threads or min(32, cpus + 4)
+        self.processes = processes or cpus
+        self.max_queue = max_queue
+        self._pools: Dict[str, Executor] = {}
+        self._pending = {"thread": 0, "process": 0}
+        self._stats: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def kind(self, stage: str) -> str:
+        return self.stage_kinds.get(stage, "thread")
+
+    def _pool(self, kind: str) -> Executor:
+        pool = self._pools.get(kind)
+        if pool is None:
+            if kind == "process":
+                # spawn: the API process runs threads, which fork does not play well with
+                pool = ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context("spawn"))
+            else:
+                pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="stage")
+            self._pools[kind] = pool
+        return pool
+
+    def _stage_stats(self, stage: str) -> Dict:
+        stats = self._stats.get(stage)
+        if stats is None:
+            stats = self._stats[stage] = {"calls": 0, "errors": 0, "rejected": 0,
+                                          "queue_s": 0.0, "run_s": 0.0, "max_run_s": 0.0}
+        return stats
+
+    def _record(self, stage: str, queue_s: float, run_s: float) -> None:
+        with self._lock:
+            stats = self._stage_stats(stage)
+            stats["calls"] += 1
+            stats["queue_s"] += max(0.0, queue_s)
+            stats["run_s"] += run_s
+            stats["max_run_s"] = max(stats["max_run_s"], run_s)
+
+    def _count(self, stage: str, field: str) -> None:
+        with self._lock:
+            self._stage_stats(stage)[field] += 1
+
+    async def run(self, stage: str, fn: Callable, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the stage's executor and await the result."""
+        kind = self.kind(stage)
+        if kind == "inline":
+            try:
+                _, run_s, result = _timed_call(fn, args, kwargs)
+            except Exception:
+                self._count(stage, "errors")
+                raise
+            self._record(stage, 0.0, run_s)
+            return result
+
+        with self._lock:
+            if self._pending[kind] >= self.max_queue:
+                self._stage_stats(stage)["rejected"] += 1
+                raise ExecutorBusy(f"Server busy: {self._pending[kind]} {kind} tasks queued")
+            self._pending[kind] += 1
+        submitted = time.time()
+        pool = self._pool(kind)
+        try:
+            loop = asyncio.get_running_loop()
+            started, run_s, result = await loop.run_in_executor(pool, _timed_call, fn, args, kwargs)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a hostile PDF); start a fresh pool next time.
+            # Only drop this pool: a concurrent failure may already have replaced it.
+            if self._pools.get(kind) is pool:
+                del self._pools[kind]
+            pool.shutdown(wait=False, cancel_futures=True)
+            self._count(stage, "errors")
+            raise
+        except Exception:
+            self._count(stage, "errors")
+            raise
+        finally:
+            with self._lock:
+                self._pending[kind] -= 1
+        self._record(stage, started - submitted, run_s)
+        return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stages = {}
+            for stage, s in self._stats.items():
+                calls = s["calls"] or 1
+                stages[stage] = {
+                    "kind": self.kind(stage),
+                    "calls": s["calls"],
+                    "errors": s["errors"],
+                    "rejected": s["rejected"],
+                    "avg_queue_ms": round(s["queue_s"] / calls * 1000, 3),
+                    "avg_run_ms": round(s["run_s"] / calls * 1000, 3),
+                    "max_run_ms": round(s["max_run_s"] * 1000, 3),
+                }
+            return {
+                "threads": self.threads,
+                "processes": self.processes,
+                "max_queue": self.max_queue,
+                "pending": dict(self._pending),
+                "stages": stages,
+            }
+
+    def shutdown(self) -> None:
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._pools.clear()
@@ -0,0 +1,124 @@
+# payparity-backend/experience_timeline.py
+"""
+Single-pass experience timeline for resume text.
+
+ExperienceTimeline.from_text scans the text once with one regex that
+captures month/year/"Present" for both ends of every date range. It lowercases
+the text once, computes "now" once, and stores each range as a
+[start, end) interval in absolute months together with its ±120-character
+lowercase context. The ranges are sorted by start.
+
+years_for_title(title) then answers from that timeline without touching the
+text again. It keeps the ranges whose context mentions a title keyword and
+merges overlapping intervals before summing, so concurrent roles (a
+part-time job next to a full-time one, or the same role listed twice) are
+not double counted. The keyword -> matching-ranges lookups are cached, so
+scoring a resume against several candidate titles is cheap.
+"""
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+MONTHS = {
+    "jan": 1, "january":1, "feb":2, "february":2, "mar":3, "march":3,
+    "apr":4, "april":4, "may":5, "jun":6, "june":6, "jul":7, "july":7,
+    "aug":8, "august":8, "sep":9, "september":9, "oct":10, "october":10,
+    "nov":11, "november":11, "dec":12, "december":12
+}
+
+# Titles with these words fall back to the whole timeline when no range mentions the title
+GENERIC_TITLE_WORDS = ("developer", "engineer", "analyst", "intern", "manager")
+
+CONTEXT_CHARS = 120
+MAX_YEARS = 60.0
+
+DATE_RANGE = re.compile(r"""
+    (?:(?P<start_month>[A-Za-z]{3,9})\s+)?(?P<start_year>\d{4})
+    \s*[-–—]\s*
+    (?:(?:(?P<end_month>[A-Za-z]{3,9})\s+)?(?P<end_year>\d{4})|(?P<present>Present|present))
+""", flags=re.VERBOSE)
+TITLE_KEYWORD = re.compile(r"[A-Za-z0-9\-\+\.]+")
+
+
+def _year(s: str) -> Optional[int]:
+    y = int(s)
+    return y if 1900 <= y <= 2100 else None
+
+
+def merged_months(intervals: List[Tuple[int, int]]) -> int:
+    """Total months covered by (start, end) intervals sorted by start, overlaps counted once."""
+    total = 0
+    cur_start = cur_end = None
+    for start, end in intervals:
+        if end <= start:
+            continue
+        if cur_end is None or start > cur_end:
+            if cur_end is not None:
+                total += cur_end - cur_start
+            cur_start, cur_end = start, end
+        elif end > cur_end:
+            cur_end = end
+    if cur_end is not None:
+        total += cur_end - cur_start
+    return total
+
+
+class ExperienceTimeline:
+    def __init__(self, ranges: List[Dict]):
+        # dicts with start/end (absolute months = year * 12 + month, month 0
+        # when only the year is given), the date fields and the context
+        self.ranges = sorted(ranges, key=lambda r: (r["start"], r["end"]))
+        self._keyword_hits: Dict[str, List[int]] = {}
+
+    @classmethod
+    def from_text(cls, text: str, now: Optional[datetime] = None) -> "ExperienceTimeline":
+        if not text:
+            return cls([])
+        now = now or datetime.now()
+        lower = text.lower()
+        if len(lower) != len(text):
+            lower = None  # a few non-ASCII characters change length when lowercased
+        ranges = []
+        for m in DATE_RANGE.finditer(text):
+            sy = _year(m.group("start_year"))
+            sm = MONTHS.get((m.group("start_month") or "").lower(), 0)
+            if m.group("present"):
+                ey, em = now.year, now.month
+            else:
+                ey = _year(m.group("end_year"))
+                em = MONTHS.get((m.group("end_month") or "").lower(), 0)
+            if not (sy and ey):
+                continue
+            a, b = max(0, m.start() - CONTEXT_CHARS), m.end() + CONTEXT_CHARS
+            ranges.append({
+                "start_year": sy, "start_month": sm,
+                "end_year": ey, "end_month": em,
+                "start": sy * 12 + sm, "end": ey * 12 + em,
+                "context": lower[a:b] if lower is not None else text[a:b].lower(),
+            })
+        return cls(ranges)
+
+    def _ranges_with(self, keyword: str) -> List[int]:
+        hits = self._keyword_hits.get(keyword)
+        if hits is None:
+            hits = [i for i, r in enumerate(self.ranges) if keyword in r["context"]]
+            self._keyword_hits[keyword] = hits
+        return hits
+
+    def total_years(self) -> float:
+        """Years covered by every range on the timeline, overlaps and gaps excluded."""
+        months = merged_months([(r["start"], r["end"]) for r in self.ranges])
+        return float(round(min(months / 12.0, MAX_YEARS), 2))
+
+    def years_for_title(self, job_title: str) -> float:
+        """Years in ranges whose context mentions the title, with overlaps counted once."""
+        if not self.ranges or not job_title:
+            return 0.0
+        keywords = {w.lower() for w in TITLE_KEYWORD.findall(job_title)}
+        matched = sorted({i for kw in keywords for i in self._ranges_with(kw)})
+        if not matched:
+            if any(word in job_title.lower() for word in GENERIC_TITLE_WORDS):
+                return self.total_years()
+            return 0.0
+        months = merged_months([(self.ranges[i]["start"], self.ranges[i]["end"]) for i in matched])
+        return float(round(min(months / 12.0, MAX_YEARS), 2))
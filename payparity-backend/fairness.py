@@ -0,0 +1,73 @@
+# payparity-backend/fairness.py
+"""
+Precomputed pay-parity aggregates.
+
+Group sums and counts per (Job_Title, Gender) and (Job_Title, Location) are
+computed once with a vectorized groupby when the dataset loads. A fairness
+report for one or several job titles is then just a few dict merges: group
+means, the max/min group and their ratio, all as plain Python floats.
+"""
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+FAIRNESS_DIMENSIONS = ("Gender", "Location")
+
+
+class FairnessIndex:
+    def __init__(self, df: pd.DataFrame, bias_threshold: float = 1.1):
+        self.bias_threshold = bias_threshold
+        title_key = df["Job_Title"].astype(str).str.lower().str.strip()
+
+        # dimension -> title -> group -> [salary_sum, count]
+        self._groups: Dict[str, Dict[str, Dict[str, List[float]]]] = {}
+        for dim in FAIRNESS_DIMENSIONS:
+            agg = (
+                df.assign(_title=title_key)
+                .groupby(["_title", dim], observed=True)["Salary_INR"]
+                .agg(["sum", "count"])
+            )
+            table: Dict[str, Dict[str, List[float]]] = {}
+            for (title, group), total, count in zip(agg.index, agg["sum"].tolist(), agg["count"].tolist()):
+                table.setdefault(title, {})[str(group)] = [float(total), int(count)]
+            self._groups[dim] = table
+
+        self.titles = sorted(self._groups[FAIRNESS_DIMENSIONS[0]].keys())
+        self._report_cache: Dict[tuple, Dict] = {}
+
+    def _dimension_report(self, dim: str, titles: Iterable[str]) -> Optional[Dict]:
+        merged: Dict[str, List[float]] = {}
+        for title in titles:
+            for group, (total, count) in self._groups[dim].get(title, {}).items():
+                acc = merged.setdefault(group, [0.0, 0])
+                acc[0] += total
+                acc[1] += count
+        if not merged:
+            return None
+
+        group_means = {g: round(total / count, 2) for g, (total, count) in sorted(merged.items())}
+        max_group = max(group_means, key=group_means.get)
+        min_group = min(group_means, key=group_means.get)
+        low = group_means[min_group]
+        ratio = round(group_means[max_group] / low, 4) if low > 0 else None
+        return {
+            "max_group": max_group,
+            "min_group": min_group,
+            "ratio": ratio,
+            "bias_detected": bool(ratio is not None and ratio > self.bias_threshold),
+            "group_means": group_means,
+            "group_counts": {g: int(count) for g, (_, count) in sorted(merged.items())},
+        }
+
+    def report(self, titles: Optional[List[str]] = None) -> Dict:
+        """Fairness report over the given lowercased titles (all titles when None)."""
+        key = tuple(sorted(set(titles))) if titles is not None else None
+        cached = self._report_cache.get(key)
+        if cached is not None:
+            return cached
+
+        selected = self.titles if titles is None else key
+        report = {dim: self._dimension_report(dim, selected) for dim in FAIRNESS_DIMENSIONS}
+        if len(self._report_cache) < 4096:
+            self._report_cache[key] = report
+        return report
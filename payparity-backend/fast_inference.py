@@ -0,0 +1,182 @@
+# payparity-backend/fast_inference.py
+"""
+Lean inference path for the pickled XGBoost salary pipeline.
+
+The sklearn pipeline (ColumnTransformer -> XGBRegressor) spends most of a
+single-row prediction building a DataFrame, running four sub-pipelines and
+stacking a sparse matrix. FastSalaryPredictor pulls the fitted encoders out
+once into plain lookup tables and writes features straight into a
+preallocated float32 buffer that is handed to the booster's native
+inplace_predict.
+
+The ColumnTransformer emits a sparse matrix for our feature density, and
+XGBoost treats entries absent from a sparse matrix as *missing*, not zero.
+The buffer therefore starts as NaN and only non-zero features are written,
+which reproduces model.predict exactly.
+"""
+import math
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+FEATURE_COLUMNS = ["Gender", "Job_Title", "Experience_Years", "Skills_Required",
+                   "Education_Level", "Location", "Data_Source"]
+
+
+class FastSalaryPredictor:
+    def __init__(self, pipeline, buffer_rows: int = 1024):
+        preprocessor, regressor = pipeline.steps[0][1], pipeline.steps[-1][1]
+        # The saved model nests the ColumnTransformer inside another Pipeline
+        while hasattr(preprocessor, "steps"):
+            if len(preprocessor.steps) != 1:
+                raise ValueError("Unsupported preprocessor layout")
+            preprocessor = preprocessor.steps[0][1]
+        if not hasattr(preprocessor, "transformers_"):
+            raise ValueError("Expected a fitted ColumnTransformer")
+        if preprocessor.remainder != "drop":
+            raise ValueError("Unsupported ColumnTransformer remainder")
+
+        self.booster = regressor.get_booster()
+        best = getattr(regressor, "best_iteration", None) if hasattr(regressor, "best_iteration") else None
+        self.iteration_range = (0, best + 1) if best is not None else (0, 0)
+
+        # column -> (offset, {category: feature index}, fill value)
+        self.onehot: Dict[str, tuple] = {}
+        self.ordinal: Dict[str, tuple] = {}
+        self.numeric: Dict[str, tuple] = {}
+        self.text: Optional[tuple] = None
+
+        offset = 0
+        for name, trans, cols in preprocessor.transformers_:
+            if trans == "drop" or name == "remainder":
+                continue
+            steps = dict(trans.steps) if hasattr(trans, "steps") else {name: trans}
+            imputer = steps.get("imputer")
+            fill = imputer.statistics_ if imputer is not None else None
+            if "onehot" in steps:
+                enc = steps["onehot"]
+                if enc.drop is not None or enc.handle_unknown != "ignore":
+                    raise ValueError("Unsupported OneHotEncoder configuration")
+                for j, col in enumerate(cols):
+                    lookup = {cat: offset + k for k, cat in enumerate(enc.categories_[j])}
+                    self.onehot[col] = (lookup, fill[j] if fill is not None else None)
+                    offset += len(enc.categories_[j])
+            elif "ordinal" in steps:
+                enc = steps["ordinal"]
+                for j, col in enumerate(cols):
+                    lookup = {cat: float(k) for k, cat in enumerate(enc.categories_[j])}
+                    self.ordinal[col] = (offset, lookup, fill[j] if fill is not None else None)
+                    offset += 1
+            elif "tfidf" in steps:
+                vec = steps["tfidf"]
+                if vec.sublinear_tf or vec.norm not in ("l2", None) or vec.binary:
+                    raise ValueError("Unsupported TfidfVectorizer configuration")
+                col = cols if isinstance(cols, str) else cols[0]
+                idf = vec.idf_ if vec.use_idf else np.ones(len(vec.vocabulary_))
+                self.text = (col, offset, vec.build_analyzer(), dict(vec.vocabulary_),
+                             idf.tolist(), vec.norm == "l2")
+                offset += len(vec.vocabulary_)
+            elif "scaler" in steps:
+                scaler = steps["scaler"]
+                mean = scaler.mean_ if scaler.with_mean else np.zeros(len(cols))
+                scale = scaler.scale_ if scaler.with_std else np.ones(len(cols))
+                for j, col in enumerate(cols):
+                    self.numeric[col] = (offset, float(mean[j]), float(scale[j]),
+                                         float(fill[j]) if fill is not None else math.nan)
+                    offset += 1
+            else:
+                raise ValueError(f"Unsupported transformer '{name}'")
+
+        self.n_features = offset
+        if self.booster.num_features() != self.n_features:
+            raise ValueError(f"Feature count mismatch: encoders give {offset}, "
+                             f"booster expects {self.booster.num_features()}")
+
+        self.buffer_rows = buffer_rows
+        self._local = threading.local()
+        self._text_cache: Dict[str, List[tuple]] = {}
+
+    def _buffer(self, n: int) -> np.ndarray:
+        buf = getattr(self._local, "buf", None)
+        if buf is None or buf.shape[0] < n:
+            buf = np.empty((max(n, self.buffer_rows), self.n_features), dtype=np.float32)
+            self._local.buf = buf
+        out = buf[:n]
+        out.fill(np.nan)
+        return out
+
+    def _text_features(self, doc) -> List[tuple]:
+        doc = "" if doc is None or (isinstance(doc, float) and math.isnan(doc)) else str(doc)
+        feats = self._text_cache.get(doc)
+        if feats is not None:
+            return feats
+        col, offset, analyzer, vocab, idf, l2 = self.text
+        counts = Counter(vocab[t] for t in analyzer(doc) if t in vocab)
+        weights = [(i, tf * idf[i]) for i, tf in counts.items()]
+        if l2 and weights:
+            norm = math.sqrt(sum(w * w for _, w in weights))
+            weights = [(i, w / norm) for i, w in weights]
+        feats = [(offset + i, w) for i, w in weights if w != 0.0]
+        if len(self._text_cache) >= 4096:
+            self._text_cache.clear()
+        self._text_cache[doc] = feats
+        return feats
+
+    @staticmethod
+    def _is_missing(value) -> bool:
+        return value is None or (isinstance(value, float) and math.isnan(value))
+
+    def encode(self, rows: Sequence[Dict]) -> np.ndarray:
+        """Feature matrix (NaN = missing) for rows of raw model inputs."""
+        X = self._buffer(len(rows))
+        for r, row in enumerate(rows):
+            x = X[r]
+            for col, (lookup, fill) in self.onehot.items():
+                value = row.get(col)
+                if self._is_missing(value):
+                    value = fill
+                idx = lookup.get(value)
+                if idx is not None:
+                    x[idx] = 1.0
+            for col, (offset, lookup, fill) in self.ordinal.items():
+                value = row.get(col)
+                if self._is_missing(value):
+                    value = fill
+                if value not in lookup:
+                    raise ValueError(f"Found unknown categories ['{value}'] in column '{col}' during transform")
+                if lookup[value] != 0.0:
+                    x[offset] = lookup[value]
+            if self.text is not None:
+                for idx, w in self._text_features(row.get(self.text[0])):
+                    x[idx] = w
+            for col, (offset, mean, scale, fill) in self.numeric.items():
+                value = row.get(col)
+                value = fill if self._is_missing(value) else float(value)
+                z = (value - mean) / scale
+                if z != 0.0:
+                    x[offset] = z
+        return X
+
+    def predict_rows(self, rows: Sequence[Dict]) -> np.ndarray:
+        """Log-salary predictions, same as pipeline.predict(pd.DataFrame(rows))."""
+        if not rows:
+            return np.empty(0, dtype=np.float32)
+        X = self.encode(rows)
+        return np.array(self.booster.inplace_predict(X, iteration_range=self.iteration_range), copy=True)
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        return self.predict_rows(df.to_dict("records"))
+
+
+def validate_fast_predictor(fast: FastSalaryPredictor, pipeline, df: pd.DataFrame, atol: float = 1e-4) -> float:
+    """Max absolute difference between both paths on df; raises if above atol."""
+    rows = df[FEATURE_COLUMNS].to_dict("records")
+    expected = pipeline.predict(df[FEATURE_COLUMNS])
+    got = fast.predict_rows(rows)
+    max_diff = float(np.max(np.abs(expected - got))) if len(rows) else 0.0
+    if max_diff > atol:
+        raise ValueError(f"Fast inference diverges from model.predict (max diff {max_diff:.3g})")
+    return max_diff
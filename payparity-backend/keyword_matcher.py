@@ -0,0 +1,94 @@
+# payparity-backend/keyword_matcher.py
+"""
+Multi-keyword taxonomy matcher for job-category and domain detection.
+
+Built once from {label: [keywords]}. Keywords shared by several labels
+(e.g. "analyst" for tech and finance) are stored once and counted once
+per text. scores() counts hits per label, and best() returns the label with
+the most hits, with ties going to the label listed first (the order the old
+first-match chains used). Titles and skills lists go through the same
+scorer, so the two sides of the /predict mismatch check are comparable.
+
+Keywords longer than SHORT_KEYWORD_CHARS match by substring, like the
+`k in text` checks they replace ("developer" in "developers"). Shorter ones
+("ai", "it", "sql") only match a whole word, i.e. a run of letters and
+digits, so "ai" no longer hits "chain" or "email" while "AI/ML" still
+counts both.
+
+A keyword without whitespace can only occur inside one
+whitespace-separated token, so the text is split once (in C) and each
+distinct token's hits are computed once and cached. Repeated tokens such as
+"engineer" or "python," then cost one dict lookup. The few keywords that
+contain a space ("supply chain") are counted on the whole text.
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+SHORT_KEYWORD_CHARS = 3
+_WORD = re.compile(r"[^\W_]+")
+
+
+class KeywordMatcher:
+    def __init__(self, taxonomy: Dict[str, List[str]], cache_size: int = 50_000):
+        self.labels = list(taxonomy)
+        self.cache_size = cache_size
+        index: Dict[str, List[int]] = {}
+        for i, keywords in enumerate(taxonomy.values()):
+            for kw in keywords:
+                owners = index.setdefault(kw.lower(), [])
+                if i not in owners:
+                    owners.append(i)
+        spanning = {kw for kw in index if any(c.isspace() for c in kw)}
+        # whole-word keywords -> owners, checked against each word of a token
+        self._words = {kw: owners for kw, owners in index.items()
+                       if kw not in spanning and len(kw) <= SHORT_KEYWORD_CHARS}
+        self._in_token = [(kw, owners) for kw, owners in index.items() if kw not in spanning and kw not in self._words]
+        self._spanning = [(kw, owners) for kw, owners in index.items() if kw in spanning]
+        # token -> ((label index, hits), ...)
+        self._token_hits: Dict[str, Tuple[Tuple[int, int], ...]] = {}
+
+    def _hits(self, token: str) -> Tuple[Tuple[int, int], ...]:
+        hits = []
+        for kw, owners in self._in_token:
+            n = token.count(kw)
+            if n:
+                hits.extend((i, n) for i in owners)
+        if self._words:
+            for word in _WORD.findall(token):
+                owners = self._words.get(word)
+                if owners:
+                    hits.extend((i, 1) for i in owners)
+        if len(self._token_hits) >= self.cache_size:
+            self._token_hits.clear()
+        hits = self._token_hits[token] = tuple(hits)
+        return hits
+
+    def _counts(self, text: str) -> List[int]:
+        counts = [0] * len(self.labels)
+        if not text:
+            return counts
+        text = text.lower()
+        cache = self._token_hits
+        for token in text.split():
+            hits = cache.get(token)
+            if hits is None:
+                hits = self._hits(token)
+            for i, n in hits:
+                counts[i] += n
+        for kw, owners in self._spanning:
+            n = text.count(kw)
+            if n:
+                for i in owners:
+                    counts[i] += n
+        return counts
+
+    def scores(self, text: str) -> Dict[str, int]:
+        """Keyword hits per label (labels without hits are left out)."""
+        return {self.labels[i]: n for i, n in enumerate(self._counts(text)) if n}
+
+    def best(self, text: str, default: Optional[str] = None) -> Optional[str]:
+        """The label with the most hits; ties go to the label listed first."""
+        counts = self._counts(text)
+        top = max(counts, default=0)
+        return self.labels[counts.index(top)] if top else default
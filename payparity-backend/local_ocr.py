@@ -0,0 +1,127 @@
+# payparity-backend/local_ocr.py
+"""
+Local page-parallel OCR (Tesseract) as an alternative to the OCR.Space API.
+
+PDF pages are rasterized with pdf2image and OCR'd with pytesseract in a
+process pool, one page per task, up to max_pages pages. Each page's text is
+cached by the SHA-256 of its rendered pixels, so re-uploads (or the same
+scanned page inside different PDFs) skip Tesseract entirely.
+
+Needs the `tesseract` and `pdftoppm` (poppler) binaries on PATH; use
+local_ocr_available() to check before routing work here.
+
+Documents are passed to the workers as bytes, so uploads never need to be
+written to disk for OCR.
+"""
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from result_cache import ResultCache, content_key
+
+OCR_CACHE_VERSION = "tesseract-v1"
+
+_executor: Optional[ProcessPoolExecutor] = None
+_worker_cache: Optional[ResultCache] = None
+
+
+def local_ocr_available() -> bool:
+    if shutil.which("tesseract") is None or shutil.which("pdftoppm") is None:
+        return False
+    try:
+        import pytesseract  # noqa: F401
+        import pdf2image  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _init_worker(cache_path: Optional[str]) -> None:
+    global _worker_cache
+    _worker_cache = ResultCache(cache_path, ttl_seconds=30 * 24 * 3600, max_entries=20000) if cache_path else None
+
+
+def _ocr_image(image, lang: str) -> str:
+    import pytesseract
+    digest = hashlib.sha256(image.tobytes()).hexdigest()
+    key = content_key(OCR_CACHE_VERSION, lang, f"{image.mode}:{image.size}", digest)
+    if _worker_cache is not None:
+        cached = _worker_cache.get(key)
+        if cached is not None:
+            return cached
+    text = pytesseract.image_to_string(image, lang=lang)
+    if _worker_cache is not None:
+        _worker_cache.set(key, text)
+    return text
+
+
+def ocr_pdf_page(data: bytes, page_number: int, dpi: int, lang: str) -> str:
+    """Rasterize and OCR one (1-based) PDF page. Runs inside a pool worker."""
+    from pdf2image import convert_from_bytes
+    images = convert_from_bytes(data, dpi=dpi, first_page=page_number, last_page=page_number, grayscale=True)
+    return _ocr_image(images[0], lang) if images else ""
+
+
+def ocr_image_bytes(data: bytes, lang: str) -> str:
+    """OCR a single encoded image (PNG, JPEG, ...). Runs inside a pool worker."""
+    from PIL import Image
+    with Image.open(io.BytesIO(data)) as img:
+        img.load()
+        return _ocr_image(img.convert("L"), lang)
+
+
+def pdf_page_count(data: bytes) -> int:
+    from pdf2image import pdfinfo_from_bytes
+    return int(pdfinfo_from_bytes(data).get("Pages", 0))
+
+
+class LocalOCR:
+    def __init__(self, workers: Optional[int] = None, max_pages: int = 5, dpi: int = 200,
+                 lang: str = "eng", cache_path: Optional[str] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pages = max_pages
+        self.dpi = dpi
+        self.lang = lang
+        self.cache_path = cache_path
+
+    def _pool(self) -> ProcessPoolExecutor:
+        global _executor
+        if _executor is None:
+            # spawn: the API process runs threads, which fork does not play well with
+            _executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.cache_path,),
+            )
+        return _executor
+
+    async def extract(self, data: bytes, filename: str) -> str:
+        """OCR an image or the first max_pages pages of a PDF, pages in parallel."""
+        loop = asyncio.get_running_loop()
+        pool = self._pool()
+        if filename.lower().endswith(".pdf"):
+            pages = await loop.run_in_executor(None, pdf_page_count, data)
+            pages = min(pages, self.max_pages)
+            if pages < 1:
+                return ""
+            futures = [loop.run_in_executor(pool, ocr_pdf_page, data, n, self.dpi, self.lang)
+                       for n in range(1, pages + 1)]
+            texts: List[str] = await asyncio.gather(*futures)
+        else:
+            texts = [await loop.run_in_executor(pool, ocr_image_bytes, data, self.lang)]
+        text = "\n".join(t.strip() for t in texts if t and t.strip())
+        print(f"Local OCR extracted {len(text)} characters from {len(texts)} page(s).")
+        return text
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,212 @@
+# payparity-backend/normalizers.py
+"""
+Normalizers for salary, education and location inputs.
+
+Each comes in two forms:
+- scalar (parse_salary_input, normalize_education, normalize_location) for
+  one /predict request,
+- column (parse_salary_column, normalize_education_column,
+  normalize_location_column) for whole payroll columns.
+
+The column versions factorize the column and run the scalar function once per
+distinct value, then broadcast the results back to the rows. Payroll columns
+repeat a few hundred spellings ("12 LPA", "B.Tech", "Bangalore") across tens
+of thousands of rows, so that is most of the win. The results are the scalar
+results by construction. Columns where most rows are distinct (free-text
+salaries, IDs glued to values) gain nothing from factorizing, so they are
+mapped row by row instead. A random sample tells the two cases apart. The only difference: where parse_salary_input raises
+ValueError on a malformed number next to a unit ("1.2.3 lakh"),
+parse_salary_column gives NaN for that row instead of failing the column.
+
+Element-wise pandas .str ops were measured as an alternative
+(bench/bench_normalizers.py). On object dtype each op is its own
+Python-level pass, and the salary rules need about ten passes. They were 2x
+slower than this on repetitive columns, and slower than Series.apply on
+distinct ones.
+"""
+import re
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+# ----------------------------
+# Salary
+# ----------------------------
+SALARY_STRIP_TOKENS = ("₹", "rs", "inr")
+
+# Checked in order; the first pattern found anywhere in the text wins
+SALARY_UNIT_PATTERNS = [
+    # lakh: "5 lakh", "5lakh", "5 lakhs", "5l", "12 lpa"
+    (re.compile(r'([\d.]+)\s*l(?:akh|akhs)?(?:\s*p\.?a\.?)?\b'), 100000),
+    (re.compile(r'([\d.]+)\s*lpa\b'), 100000),
+    (re.compile(r'([\d.]+)\s*l\b'), 100000),
+    # crore: "5 cr", "5crore", "5 crores"
+    (re.compile(r'([\d.]+)\s*cr(?:ore|ores)?\b'), 10000000),
+    (re.compile(r'([\d.]+)\s*c\b'), 10000000),
+]
+
+
+def parse_salary_input(salary_input: str) -> float:
+    """Parse salary from various formats like '5 lakh', '5lpa', '5,00,000', etc."""
+    if not salary_input:
+        return 0.0
+
+    # Convert to string and clean
+    salary_str = str(salary_input).strip().lower()
+    for token in SALARY_STRIP_TOKENS:
+        salary_str = salary_str.replace(token, '')
+    salary_str = salary_str.strip()
+
+    for pattern, factor in SALARY_UNIT_PATTERNS:
+        match = pattern.search(salary_str)
+        if match:
+            value = float(match.group(1))
+            return value * factor  # Convert to actual amount
+
+    # Handle formats like "5,00,000" or "500000" or "500,000"
+    # Remove all commas and try to parse as number
+    numeric_str = salary_str.replace(',', '').replace(' ', '')
+    try:
+        value = float(numeric_str)
+        # If it's a reasonably large number, assume it's already in rupees
+        if value >= 1000:
+            return value
+        # If it's small, might be in lakhs
+        elif value > 0:
+            return value * 100000
+    except ValueError:
+        pass
+
+    return 0.0
+
+
+# ----------------------------
+# Education
+# ----------------------------
+# (label, substrings, exact values), checked in order on the stripped, lowercased text
+EDUCATION_RULES = [
+    ("PhD/Doctorate", ("phd", "ph.d", "doctorate", "dphil"), ()),
+    ("Masters/Postgraduate", ("master", "postgrad", "mba", "m.tech", "mtech", "msc", "m.sc"), ("pg", "ms")),
+    ("Bachelors", ("bachelor", "undergrad"), ("ug", "btech", "b.tech", "bsc", "b.sc", "be")),
+    ("High School", ("high school", "secondary", "12", "hsc", "10+2"), ()),
+]
+
+# Canonical spellings that none of the rules above catch
+EDUCATION_ALIASES = {
+    "masters": "Masters/Postgraduate",
+    "master": "Masters/Postgraduate",
+    "postgraduate": "Masters/Postgraduate",
+    "bachelors": "Bachelors",
+    "bachelor": "Bachelors",
+    "phd": "PhD/Doctorate",
+    "doctorate": "PhD/Doctorate",
+    "highschool": "High School",
+    "high-school": "High School",
+}
+
+
+def normalize_education(level: Optional[str]) -> str:
+    """Map various education strings to the categories used by the model/dataset.
+    Dataset categories: High School, Bachelors, Masters/Postgraduate, PhD/Doctorate
+    """
+    if not level or not isinstance(level, str):
+        return "Bachelors"
+    s = level.strip().lower()
+    for label, substrings, exact in EDUCATION_RULES:
+        if s in exact or any(k in s for k in substrings):
+            return label
+    return EDUCATION_ALIASES.get(s, "Bachelors")
+
+
+# ----------------------------
+# Location
+# ----------------------------
+REMOTE_ALIASES = {"remote", "wfh", "work from home", "anywhere"}
+
+
+def normalize_location(location: Optional[str], allowed_locations) -> str:
+    if not location or not isinstance(location, str):
+        return "Remote"
+    s = location.strip()
+    sl = s.lower()
+    if sl in REMOTE_ALIASES:
+        return "Remote"
+    candidate = s.title()
+    if candidate in allowed_locations:
+        return candidate
+    if s in allowed_locations:
+        return s
+    return "Remote"
+
+
+# ----------------------------
+# Column versions
+# ----------------------------
+# Rows sampled to estimate how many distinct values a column has
+DISTINCT_SAMPLE = 1024
+
+
+def _mostly_distinct(arr: np.ndarray) -> bool:
+    """Whether more than half the rows are likely distinct, judged from a random
+    sample. With D distinct values, s sampled rows repeat about s*s/(2D) of them."""
+    n = len(arr)
+    if n <= DISTINCT_SAMPLE:
+        sample = arr.tolist()
+    else:
+        # Random rows, not a stride, so a periodic column cannot fool the estimate
+        rows = np.random.default_rng(0).choice(n, DISTINCT_SAMPLE, replace=False)
+        sample = arr[rows].tolist()
+    try:
+        repeats = len(sample) - len(set(sample))
+    except TypeError:  # unhashable values are mapped one by one anyway
+        return True
+    if n <= DISTINCT_SAMPLE:
+        return repeats < n / 2
+    return repeats < DISTINCT_SAMPLE ** 2 / n
+
+
+def map_distinct(values: Iterable, fn: Callable) -> np.ndarray:
+    """fn applied once per distinct value, broadcast back to every row (object array)."""
+    import pandas as pd
+    arr = np.asarray(values)
+    if _mostly_distinct(arr):
+        # Factorizing would save few calls and costs a hashing pass: plain map
+        out = np.empty(len(arr), dtype=object)
+        out[:] = [fn(v) for v in arr.tolist()]
+        return out
+    if arr.dtype != object:
+        codes, uniques = pd.factorize(arr, use_na_sentinel=False)
+        return np.array([fn(u) for u in uniques.tolist()], dtype=object)[codes]
+
+    # Only strings are factorized: hashing mixed objects would merge True with 1
+    out = np.empty(len(arr), dtype=object)
+    is_str = np.fromiter((type(v) is str for v in arr), dtype=bool, count=len(arr))
+    if is_str.any():
+        codes, uniques = pd.factorize(arr[is_str])
+        out[is_str] = np.array([fn(u) for u in uniques], dtype=object)[codes]
+    for i in np.flatnonzero(~is_str):
+        out[i] = fn(arr[i])
+    return out
+
+
+def _salary_or_nan(value) -> float:
+    try:
+        return parse_salary_input(value)
+    except ValueError:
+        return float("nan")
+
+
+def parse_salary_column(values: Iterable) -> np.ndarray:
+    """parse_salary_input over a whole column, as a float64 array."""
+    return map_distinct(values, _salary_or_nan).astype(np.float64)
+
+
+def normalize_education_column(values: Iterable) -> np.ndarray:
+    """normalize_education over a whole column, as an object array of labels."""
+    return map_distinct(values, normalize_education)
+
+
+def normalize_location_column(values: Iterable, allowed_locations) -> np.ndarray:
+    """normalize_location over a whole column, as an object array."""
+    # A closure, not partial(..., allowed_locations=...): keyword partials are slow to call per row
+    return map_distinct(values, lambda v: normalize_location(v, allowed_locations))
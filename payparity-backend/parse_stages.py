@@ -0,0 +1,26 @@
+# payparity-backend/parse_stages.py
+"""
+Functions for the "parse" stage of /predict (see executors.py).
+
+They live outside app.py so that, with EXECUTOR_STAGES=parse=process, the
+spawned pool workers unpickle them by importing this small module instead of
+re-importing the whole app. Keep the imports here light.
+"""
+import io
+from typing import BinaryIO, Union
+
+from experience_timeline import ExperienceTimeline
+
+
+def docx_to_text(source: Union[bytes, BinaryIO]) -> str:
+    from docx import Document
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    source.seek(0)
+    doc = Document(source)
+    return "\n".join([p.text for p in doc.paragraphs])
+
+
+def compute_experience_for_title(text: str, job_title_input: str) -> float:
+    """Years of experience for the title, from the resume's merged date-range timeline."""
+    return ExperienceTimeline.from_text(text).years_for_title(job_title_input)
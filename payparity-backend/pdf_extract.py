@@ -0,0 +1,221 @@
+# payparity-backend/pdf_extract.py
+"""
+Streaming, page-parallel PDF text extraction with early exit.
+
+- iter_pdf_pages yields (page_index, text) one page at a time.
+- extract_pdf_text stops as soon as it has char_budget characters of text,
+  so a 30-page CV is not fully parsed when the resume parser only reads the
+  first few thousand characters.
+- Long documents are split into page ranges that run in a process pool
+  (PyPDF2 is pure Python, so threads would serialize on the GIL). Ranges
+  are submitted in waves, and no new wave starts once the budget is met.
+  extract_pdf_text uses this module's own pool; extract_pdf_text_with sends
+  the ranges to a caller's pool instead (the API's "pdf" stage pool), so a
+  stage worker never has to start a pool of its own.
+- Pages that come back (nearly) empty and draw an image are reported as
+  scanned, so the caller can OCR just those pages instead of the whole
+  document. Blank separator pages and short vector-only pages are not.
+
+A source is a path, the PDF bytes, or a seekable binary stream such as an
+upload's spooled file. Streams are read into bytes only for the process pool.
+"""
+import asyncio
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Awaitable, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+PdfSource = Union[str, bytes, BinaryIO]
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _reader(source: PdfSource):
+    from PyPDF2 import PdfReader
+    if isinstance(source, (bytes, bytearray)):
+        return PdfReader(io.BytesIO(source))
+    if not isinstance(source, str):
+        source.seek(0)
+    return PdfReader(source)
+
+
+def _picklable(source: PdfSource) -> Union[str, bytes]:
+    if isinstance(source, (str, bytes)):
+        return source
+    if isinstance(source, bytearray):
+        return bytes(source)
+    source.seek(0)
+    return source.read()
+
+
+def _has_images(resources, depth: int = 0) -> bool:
+    """Whether page (or form) resources contain an image XObject, directly or in a nested form."""
+    try:
+        xobjects = resources.get_object().get("/XObject") if resources is not None else None
+        if xobjects is None:
+            return False
+        for ref in xobjects.get_object().values():
+            obj = ref.get_object()
+            subtype = obj.get("/Subtype")
+            if subtype == "/Image":
+                return True
+            if subtype == "/Form" and depth < 3 and _has_images(obj.get("/Resources"), depth + 1):
+                return True
+    except Exception as e:
+        print(f"PDF image check failed: {e}")
+    return False
+
+
+def _iter_pages(source: PdfSource, start: int = 0, stop: Optional[int] = None,
+                min_page_chars: int = 20) -> Iterator[Tuple[int, str, bool]]:
+    """(page_index, text, scanned) where scanned = little text and at least one image."""
+    reader = _reader(source)
+    stop = len(reader.pages) if stop is None else min(stop, len(reader.pages))
+    for i in range(start, stop):
+        page = reader.pages[i]
+        try:
+            text = page.extract_text() or ""
+        except Exception as e:
+            print(f"PDF page {i + 1} extraction failed: {e}")
+            text = ""
+        scanned = len(text.strip()) < min_page_chars and _has_images(page.get("/Resources"))
+        yield i, text, scanned
+
+
+def iter_pdf_pages(source: PdfSource, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+    for i, text, _ in _iter_pages(source, start, stop):
+        yield i, text
+
+
+def _extract_range(source: PdfSource, start: int, stop: int, min_page_chars: int) -> List[Tuple[int, str, bool]]:
+    return list(_iter_pages(source, start, stop, min_page_chars))
+
+
+def pdf_page_count(source: PdfSource) -> int:
+    return len(_reader(source).pages)
+
+
+def _pool(workers: int) -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+def _add_pages(pages: List[Tuple[int, str]], scanned: List[int], part) -> int:
+    """Append (index, text, scanned) rows; returns the characters of text added."""
+    added = 0
+    for i, text, is_scanned in part:
+        pages.append((i, text))
+        if is_scanned:
+            scanned.append(i)
+        added += len(text.strip())
+    return added
+
+
+def _result(pages: List[Tuple[int, str]], scanned: List[int], page_count: int) -> Dict:
+    return {
+        "pages": pages,
+        "scanned": scanned,
+        "page_count": page_count,
+        "complete": len(pages) == page_count,
+    }
+
+
+def _ranges(start: int, page_count: int, chunk_pages: int) -> List[Tuple[int, int]]:
+    return [(s, min(s + chunk_pages, page_count)) for s in range(start, page_count, chunk_pages)]
+
+
+def extract_pdf_text(source: PdfSource, char_budget: int = 10000, min_page_chars: int = 20,
+                     parallel_min_pages: int = 12, workers: Optional[int] = None,
+                     chunk_pages: int = 4) -> Dict:
+    """Extract page text until char_budget characters are collected.
+
+    Returns {"pages": [(index, text), ...] in page order, "scanned": [indices of
+    pages with fewer than min_page_chars characters and an image to OCR],
+    "page_count": n, "complete": whether every page was read}.
+    """
+    workers = workers or min(4, os.cpu_count() or 1)
+    page_count = pdf_page_count(source)
+    pages: List[Tuple[int, str]] = []
+    scanned: List[int] = []
+    collected = 0
+
+    if page_count >= parallel_min_pages and workers > 1:
+        pool = _pool(workers)
+        source = _picklable(source)
+        ranges = _ranges(0, page_count, chunk_pages)
+        for w in range(0, len(ranges), workers):
+            wave = [pool.submit(_extract_range, source, s, e, min_page_chars) for s, e in ranges[w:w + workers]]
+            for fut in wave:
+                collected += _add_pages(pages, scanned, fut.result())
+            if collected >= char_budget:
+                break
+    else:
+        for row in _iter_pages(source, min_page_chars=min_page_chars):
+            collected += _add_pages(pages, scanned, [row])
+            if collected >= char_budget:
+                break
+
+    return _result(pages, scanned, page_count)
+
+
+def extract_pdf_head(source: PdfSource, char_budget: int = 10000, min_page_chars: int = 20,
+                     parallel_min_pages: int = 12, chunk_pages: int = 4) -> Dict:
+    """The full extract_pdf_text result for short documents; for long ones
+    only the first chunk_pages pages (the rest is left to the caller)."""
+    page_count = pdf_page_count(source)
+    if page_count < parallel_min_pages:
+        return extract_pdf_text(source, char_budget, min_page_chars, parallel_min_pages, workers=1)
+    pages: List[Tuple[int, str]] = []
+    scanned: List[int] = []
+    _add_pages(pages, scanned, _iter_pages(source, 0, chunk_pages, min_page_chars))
+    return _result(pages, scanned, page_count)
+
+
+async def extract_pdf_text_with(run: Callable[..., Awaitable], source: Union[str, bytes], char_budget: int = 10000,
+                                min_page_chars: int = 20, parallel_min_pages: int = 12, workers: int = 1,
+                                chunk_pages: int = 4) -> Dict:
+    """extract_pdf_text with every call sent through run(fn, *args), e.g. a
+    stage executor's process pool, instead of this module's own pool. The
+    first pages are read in one call; a long document's remaining page
+    ranges then go out in waves of `workers` until char_budget is met.
+    """
+    if workers <= 1:
+        return await run(extract_pdf_text, source, char_budget, min_page_chars, parallel_min_pages, 1, chunk_pages)
+    head = await run(extract_pdf_head, source, char_budget, min_page_chars, parallel_min_pages, chunk_pages)
+    pages, scanned, page_count = list(head["pages"]), list(head["scanned"]), head["page_count"]
+    collected = sum(len(text.strip()) for _, text in pages)
+    if head["complete"] or collected >= char_budget:
+        return head
+
+    ranges = _ranges(len(pages), page_count, chunk_pages)
+    for w in range(0, len(ranges), workers):
+        wave = await asyncio.gather(*(run(_extract_range, source, s, e, min_page_chars) for s, e in ranges[w:w + workers]))
+        for part in wave:
+            collected += _add_pages(pages, scanned, part)
+        if collected >= char_budget:
+            break
+    return _result(pages, scanned, page_count)
+
+
+def write_page_pdfs(source: PdfSource, page_indices: List[int]) -> List[bytes]:
+    """One single-page PDF per given page, so OCR text maps back to its page."""
+    from PyPDF2 import PdfWriter
+    reader = _reader(source)
+    documents = []
+    for i in page_indices:
+        writer = PdfWriter()
+        writer.add_page(reader.pages[i])
+        out = io.BytesIO()
+        writer.write(out)
+        documents.append(out.getvalue())
+    return documents
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
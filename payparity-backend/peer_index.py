@@ -0,0 +1,119 @@
+# payparity-backend/peer_index.py
+"""
+Pre-built job-title index for peer comparisons.
+
+Built once from the salary dataset at startup so that a peer lookup never
+scans the ~20k rows again:
+- lowercased title -> row ids (sorted by salary)
+- token -> titles inverted index for the broad keyword fallback
+- per-title salary arrays sorted for binary-search nearest-salary lookup
+"""
+from bisect import bisect_left
+from typing import Dict, List, Set
+
+import numpy as np
+import pandas as pd
+
+
+class PeerIndex:
+    def __init__(self, df: pd.DataFrame, max_cached_queries: int = 4096):
+        titles = df["Job_Title"].astype(str)
+        self._job_title = titles.tolist()
+        self._experience = df["Experience_Years"].astype(int).tolist()
+        self._education = df["Education_Level"].astype(str).tolist()
+        self._location = df["Location"].astype(str).tolist()
+        self._salary = df["Salary_INR"].to_numpy(dtype=float)
+        self._skills = df["Skills_Required"].fillna("").astype(str).tolist()
+
+        lowered = titles.str.lower().to_numpy()
+        self.titles: List[str] = sorted(set(lowered.tolist()))
+
+        # title -> (salaries ascending, row ids in the same order)
+        self._by_title: Dict[str, tuple] = {}
+        for title in self.titles:
+            rows = np.flatnonzero(lowered == title)
+            order = np.lexsort((rows, self._salary[rows]))
+            rows = rows[order]
+            self._by_title[title] = (self._salary[rows].tolist(), rows)
+
+        # whitespace token -> titles containing it
+        self._tokens: Dict[str, Set[str]] = {}
+        for title in self.titles:
+            for tok in title.split():
+                self._tokens.setdefault(tok, set()).add(title)
+
+        self._max_cached = max_cached_queries
+        self._substring_cache: Dict[str, List[str]] = {}
+        self._keyword_cache: Dict[str, Set[str]] = {}
+
+    def read_only_arrays(self):
+        """NumPy arrays backing the index (for freezing before a pre-fork)."""
+        yield self._salary
+        for _, rows in self._by_title.values():
+            yield rows
+
+    def __len__(self) -> int:
+        return len(self._salary)
+
+    def _titles_containing(self, needle: str) -> List[str]:
+        hit = self._substring_cache.get(needle)
+        if hit is None:
+            hit = [t for t in self.titles if needle in t]
+            if len(self._substring_cache) >= self._max_cached:
+                self._substring_cache.clear()
+            self._substring_cache[needle] = hit
+        return hit
+
+    def _titles_for_keyword(self, keyword: str) -> Set[str]:
+        # A whitespace-free keyword is a substring of a title iff it is a
+        # substring of one of the title's tokens.
+        hit = self._keyword_cache.get(keyword)
+        if hit is None:
+            exact = self._tokens.get(keyword)
+            hit = set(exact) if exact else set()
+            for tok, titles in self._tokens.items():
+                if keyword in tok:
+                    hit |= titles
+            if len(self._keyword_cache) >= self._max_cached:
+                self._keyword_cache.clear()
+            self._keyword_cache[keyword] = hit
+        return hit
+
+    def _row_count(self, titles) -> int:
+        return sum(len(self._by_title[t][1]) for t in titles)
+
+    def match_titles(self, job_title: str) -> List[str]:
+        """Titles matching a job title, with the broad keyword fallback for few matches."""
+        job_title_lower = job_title.lower().strip()
+        matched = self._titles_containing(job_title_lower)
+
+        if self._row_count(matched) < 5:
+            keywords = [kw for kw in job_title_lower.split() if len(kw) > 3]
+            if keywords:
+                broad: Set[str] = set()
+                for kw in keywords:
+                    broad |= self._titles_for_keyword(kw)
+                matched = sorted(broad)
+        return matched
+
+    def nearest(self, job_title: str, predicted_salary: float, k: int = 5) -> List[Dict]:
+        """k peers with matching titles whose salaries are closest to predicted_salary."""
+        candidates = []
+        for title in self.match_titles(job_title):
+            salaries, rows = self._by_title[title]
+            pos = bisect_left(salaries, predicted_salary)
+            for i in range(max(0, pos - k), min(len(salaries), pos + k)):
+                candidates.append((abs(salaries[i] - predicted_salary), int(rows[i])))
+        candidates.sort()
+
+        peer_list = []
+        for _, row in candidates[:k]:
+            peer_list.append({
+                "job_title": self._job_title[row],
+                "experience_years": self._experience[row],
+                "education": self._education[row],
+                "location": self._location[row],
+                "salary": round(float(self._salary[row]), 2),
+                "skills": self._skills[row]
+            })
+        return peer_list
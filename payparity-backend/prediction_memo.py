@@ -0,0 +1,72 @@
+# payparity-backend/prediction_memo.py
+"""
+Bounded in-process LRU memo for salary predictions.
+
+After parsing, a prediction depends only on the normalized feature tuple, so
+identical inputs (repeat submissions, the LinkedIn path) can skip DataFrame
+construction and model inference entirely. The memo is tied to a model
+signature (file path, size, mtime) and clears itself when the model changes.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+
+def file_signature(path: str) -> Tuple:
+    try:
+        st = os.stat(path)
+        return (path, st.st_size, st.st_mtime_ns)
+    except OSError:
+        return (path, None, None)
+
+
+class PredictionMemo:
+    def __init__(self, max_entries: int = 10000, signature: Optional[Tuple] = None):
+        self.max_entries = max_entries
+        self.signature = signature
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._data: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[float]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: float) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def reset(self, signature: Optional[Tuple] = None) -> None:
+        """Drop every entry, e.g. because the model behind them changed."""
+        with self._lock:
+            self._data.clear()
+            self.signature = signature
+            self.invalidations += 1
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
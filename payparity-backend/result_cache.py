@@ -0,0 +1,154 @@
+# payparity-backend/result_cache.py
+"""
+Persistent content-addressed cache for expensive parse results (LLM calls).
+
+Entries live in a small SQLite file so they survive restarts and are shared
+by every worker on the host. Keys are SHA-256 digests of the input content
+plus a version tag; values are JSON. Entries expire after a TTL and the
+least recently used ones are evicted once the cache grows past max_entries.
+Eviction runs every evict_every writes rather than on each one, so the file
+can briefly hold up to evict_every - 1 entries more than max_entries.
+With stale_seconds > 0, an expired entry is kept that much longer, and
+lookup() returns it flagged as stale so the caller can serve it while it
+refreshes the entry (stale-while-revalidate).
+The SQLite connection is opened lazily per process, so a cache created before
+a pre-fork (see serve.py) is safe to use in the forked workers.
+
+Every method does blocking SQLite I/O: async code should call them through
+asyncio.to_thread().
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+def content_key(*parts: str) -> str:
+    """Stable hash of the given parts (e.g. prompt version + extracted text)."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update((part or "").encode("utf-8", errors="replace"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, path: str, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 5000,
+                 stale_seconds: float = 0.0, evict_every: int = 32):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.evict_every = max(1, evict_every)
+        self._writes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def _ensure_connection(self) -> None:
+        # SQLite connections must not cross a fork: reconnect in a new process
+        if self._pid == os.getpid():
+            return
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache(accessed_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_created ON cache(created_at)")
+        self._conn = conn
+        self._pid = os.getpid()
+
+    def get(self, key: str) -> Optional[Any]:
+        """The cached value if it is still fresh, else None."""
+        found = self.lookup(key)
+        return found[0] if found is not None and found[1] else None
+
+    def lookup(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """(value, fresh) for an entry within ttl_seconds + stale_seconds, else None."""
+        self._ensure_connection()
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at = row
+            age = now - created_at
+            if age > self.ttl_seconds + self.stale_seconds:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            fresh = age <= self.ttl_seconds
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+        return json.loads(value), fresh
+
+    def set(self, key: str, value: Any) -> None:
+        self._ensure_connection()
+        now = time.time()
+        blob = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, blob, now, now),
+            )
+            self._writes += 1
+            if self._writes % self.evict_every == 0:
+                self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        cur = self._conn.execute("DELETE FROM cache WHERE created_at < ?",
+                                 (now - self.ttl_seconds - self.stale_seconds,))
+        self.evictions += cur.rowcount
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            cur = self._conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            )
+            self.evictions += cur.rowcount
+
+    def stats(self) -> Dict:
+        self._ensure_connection()
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "stale_seconds": self.stale_seconds,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        if self._conn is None or self._pid != os.getpid():
+            return
+        with self._lock:
+            self._conn.close()
+            self._conn = None
+            self._pid = None
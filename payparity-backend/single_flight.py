@@ -0,0 +1,78 @@
+# payparity-backend/single_flight.py
+"""
+Request coalescing ("single flight") for slow upstream calls.
+
+When the same LinkedIn URL or resume is submitted by many users within
+seconds, each /predict would make the same Serper/OpenRouter call.
+SingleFlight.do(kind, key, fn) runs fn() for the first caller with a
+given key. Callers that arrive while that call is still in flight await
+the same task instead of starting their own. Once the call finishes the key
+is released, so later callers go through the persistent caches as usual.
+
+- Callers wait on the shared task through asyncio.shield(). A client that
+  disconnects only cancels its own wait, and the call still completes for
+  the other waiters (and fills the caches).
+- Every waiter gets the same result object, or the same exception. Results
+  must be treated as read-only.
+- Coalescing is per process and per event loop. Under the pre-fork
+  launcher (serve.py) each worker coalesces its own requests. The SQLite
+  caches already share finished results between workers.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class SingleFlight:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._inflight: Dict[Tuple[str, Hashable], asyncio.Task] = {}
+        # kind -> [calls made upstream, callers that joined one]
+        self._counts: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, kind: str, index: int) -> None:
+        with self._lock:
+            self._counts.setdefault(kind, [0, 0])[index] += 1
+
+    async def do(self, kind: str, key: Hashable, fn: Callable[[], Awaitable[Any]],
+                 on_start: Optional[Callable[[], None]] = None) -> Any:
+        """fn()'s result, shared with every concurrent caller using the same kind and key.
+        on_start() runs only when this caller starts a new call rather than joining one."""
+        if not self.enabled:
+            self._count(kind, 0)
+            if on_start is not None:
+                on_start()
+            return await fn()
+        loop = asyncio.get_running_loop()
+        flight = (kind, key)
+        task = self._inflight.get(flight)
+        if task is not None and task.get_loop() is loop:
+            self._count(kind, 1)
+        else:
+            self._count(kind, 0)
+            if on_start is not None:
+                on_start()
+            task = loop.create_task(fn())
+            self._inflight[flight] = task
+            task.add_done_callback(lambda t: self._release(flight, t))
+        return await asyncio.shield(task)
+
+    def _release(self, flight: Tuple[str, Hashable], task: asyncio.Task) -> None:
+        if self._inflight.get(flight) is task:
+            del self._inflight[flight]
+        # Retrieve the outcome so a failure nobody waited for is not logged as "never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts = {kind: list(c) for kind, c in self._counts.items()}
+        inflight: Dict[str, int] = {}
+        for kind, _ in list(self._inflight):
+            inflight[kind] = inflight.get(kind, 0) + 1
+        return {
+            "enabled": self.enabled,
+            "kinds": {kind: {"calls": calls, "coalesced": joined, "inflight": inflight.get(kind, 0)}
+                      for kind, (calls, joined) in counts.items()},
+        }
@@ -0,0 +1,386 @@
+# payparity-backend/skill_extractor.py
+"""
+Offline skill extraction from resume text, the fast path before the LLM parser.
+
+The vocabulary is SKILL_TAXONOMY (canonical name -> aliases) plus any extra
+skill names passed in, e.g. the dataset's Skills_Required values. Every
+alias is tokenized the same way as the resume and stored in a token trie.
+analyze() walks the text once. At each token it takes the longest alias
+that starts there and reports the canonical name, so "Postgres", "postgresql"
+and "PostgreSQL DB" all become "PostgreSQL". Matching whole tokens keeps
+"ai" out of "chain" and "r" out of "react".
+
+Short aliases that are also ordinary words ("go", "r", "excel", "spring")
+are only matched inside a skills section.
+
+analyze() also measures coverage: the fraction of the items listed in the
+resume's skills section ("Skills: Python, SQL, Postgres") that matched the
+vocabulary. When coverage is high, the matched list is what an LLM would
+have returned, and the caller can skip the LLM. A resume without a
+recognisable skills section has coverage 0.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# canonical skill -> aliases (the canonical name is always an alias too)
+SKILL_TAXONOMY: Dict[str, List[str]] = {
+    # Programming languages
+    "Python": ["python3", "python 3", "py"],
+    "Java": ["core java", "java 8", "java 11", "java 17"],
+    "JavaScript": ["js", "javascript es6", "es6", "ecmascript", "java script"],
+    "TypeScript": ["ts"],
+    "C": ["c language", "c programming"],
+    "C++": ["cpp", "c plus plus"],
+    "C#": ["c sharp", "csharp"],
+    "Go": ["golang", "go lang"],
+    "Rust": [],
+    "Ruby": [],
+    "PHP": ["php7", "php 8"],
+    "Kotlin": [],
+    "Swift": [],
+    "Objective-C": ["objective c", "objc"],
+    "Scala": [],
+    "R": ["r language", "r programming", "rstudio", "r studio"],
+    "MATLAB": ["matlab/simulink"],
+    "Dart": [],
+    "Perl": [],
+    "Shell Scripting": ["bash", "shell", "shell script", "bash scripting", "unix shell", "powershell"],
+    "SQL": ["structured query language", "t-sql", "tsql", "pl/sql", "plsql", "sql queries"],
+    "HTML": ["html5", "html 5"],
+    "CSS": ["css3", "css 3"],
+    "Solidity": [],
+    "VBA": ["excel vba", "macros"],
+    # Web and frameworks
+    "React": ["react.js", "reactjs", "react js", "react hooks"],
+    "Redux": ["redux toolkit"],
+    "Angular": ["angular.js", "angularjs", "angular js"],
+    "Vue.js": ["vue", "vuejs", "vue js", "nuxt", "nuxt.js"],
+    "Next.js": ["nextjs", "next js"],
+    "Node.js": ["node", "nodejs", "node js"],
+    "Express.js": ["express", "expressjs", "express js"],
+    "Django": ["django rest framework", "drf"],
+    "Flask": [],
+    "FastAPI": ["fast api"],
+    "Spring Boot": ["spring", "springboot", "spring framework", "spring mvc", "spring boot microservices"],
+    "Hibernate": ["jpa", "hibernate (jpa)"],
+    "ASP.NET": ["asp.net core", ".net", ".net core", "dotnet", "dot net"],
+    "Ruby on Rails": ["rails", "ror"],
+    "Laravel": [],
+    "jQuery": ["jquery"],
+    "Bootstrap": [],
+    "Tailwind CSS": ["tailwind", "tailwindcss"],
+    "Sass": ["scss"],
+    "GraphQL": [],
+    "REST APIs": ["rest", "rest api", "restful", "restful apis", "restful api", "rest apis", "restful services",
+                  "web services", "api development"],
+    "Microservices": ["microservice", "microservices architecture"],
+    "Spring Cloud": ["eureka", "openfeign", "feign", "spring cloud gateway"],
+    "API Gateway": ["aws api gateway"],
+    "MERN Stack": ["mern"],
+    "MEAN Stack": ["mean stack"],
+    "Full Stack Development": ["full stack", "full-stack", "fullstack"],
+    "Frontend Development": ["front end", "front-end", "frontend"],
+    "Backend Development": ["back end", "back-end", "backend"],
+    "Web Development": ["web dev", "web design and development"],
+    # Mobile
+    "Android Development": ["android", "android app development", "android studio", "android studios", "android sdk"],
+    "iOS Development": ["ios", "xcode", "swiftui"],
+    "Flutter": [],
+    "React Native": [],
+    # Data stores
+    "PostgreSQL": ["postgres", "postgre", "psql", "postgresql db"],
+    "MySQL": ["my sql"],
+    "MongoDB": ["mongo", "mongo db"],
+    "Redis": [],
+    "Oracle Database": ["oracle", "oracle db", "oracle sql"],
+    "SQL Server": ["mssql", "ms sql", "microsoft sql server", "ms sql server"],
+    "SQLite": [],
+    "Cassandra": ["apache cassandra"],
+    "Elasticsearch": ["elastic search", "elk", "elk stack"],
+    "DynamoDB": ["dynamo db"],
+    "Firebase": ["firestore"],
+    "Snowflake": [],
+    "BigQuery": ["big query", "google bigquery"],
+    # Cloud and DevOps
+    "AWS": ["amazon web services", "aws cloud", "ec2", "s3", "aws lambda", "lambda"],
+    "Azure": ["microsoft azure", "azure devops"],
+    "Google Cloud": ["gcp", "google cloud platform"],
+    "Docker": ["docker server", "docker compose", "docker-compose", "containerization"],
+    "Kubernetes": ["k8s", "kubectl", "helm", "eks", "aks", "gke"],
+    "Terraform": ["infrastructure as code", "iac"],
+    "Ansible": [],
+    "Jenkins": [],
+    "CI/CD": ["ci cd", "ci/cd pipelines", "continuous integration", "continuous deployment", "github actions",
+              "gitlab ci"],
+    "Git": ["github", "gitlab", "bitbucket", "version control"],
+    "Linux": ["unix", "ubuntu", "kali linux", "red hat", "rhel", "centos"],
+    "Nginx": [],
+    "Apache Kafka": ["kafka"],
+    "RabbitMQ": ["rabbit mq"],
+    "Maven": [],
+    "Gradle": [],
+    "JUnit": ["junit5", "junit 5"],
+    "Selenium": ["selenium webdriver"],
+    "Jira": ["atlassian jira"],
+    "Postman": [],
+    "Networking": ["network configuration", "tcp/ip", "cisco packet tracer", "ccna", "routing and switching"],
+    "Cybersecurity": ["cyber security", "network security", "information security", "infosec",
+                      "penetration testing", "ethical hacking", "vapt"],
+    # Data and ML
+    "Machine Learning": ["ml", "machine-learning", "supervised learning", "unsupervised learning",
+                         "supervised learning models", "unsupervised learning models"],
+    "Deep Learning": ["dl", "neural networks", "cnn", "rnn", "lstm"],
+    "Artificial Intelligence": ["ai", "a.i"],
+    "Natural Language Processing": ["nlp", "text mining"],
+    "Computer Vision": ["image processing"],
+    "Generative AI": ["genai", "gen ai", "llm", "llms", "large language models", "prompt engineering", "rag"],
+    "TensorFlow": ["tensor flow"],
+    "Keras": [],
+    "PyTorch": ["torch"],
+    "scikit-learn": ["sklearn", "scikit learn", "scikit"],
+    "Pandas": [],
+    "NumPy": ["numpy"],
+    "SciPy": [],
+    "Matplotlib": [],
+    "Seaborn": [],
+    "Plotly": [],
+    "OpenCV": ["open cv"],
+    "Hugging Face": ["huggingface", "transformers", "bert", "distil bert", "distilbert"],
+    "LangChain": ["lang chain"],
+    "XGBoost": [],
+    "LightGBM": [],
+    "SVM": ["support vector machines", "one-class svm"],
+    "Apache Spark": ["spark", "pyspark", "spark sql"],
+    "Hadoop": ["hdfs", "hive", "mapreduce"],
+    "Airflow": ["apache airflow"],
+    "ETL": ["etl & data pipelines", "data pipelines", "elt", "data pipeline"],
+    "Data Engineering": [],
+    "Data Science": [],
+    "Data Analysis": ["data analytics", "analytics", "exploratory data analysis", "eda", "data validation"],
+    "Data Visualization": ["data visualisation", "dashboards", "dashboarding"],
+    "Statistics": ["statistical analysis", "statistical modeling", "hypothesis testing", "regression analysis"],
+    "Power BI": ["powerbi", "power-bi", "dax"],
+    "Tableau": [],
+    "Excel": ["ms excel", "microsoft excel", "advanced excel", "pivot tables", "vlookup", "spreadsheets"],
+    "Looker": ["looker studio", "google data studio"],
+    "SAS": [],
+    "SPSS": [],
+    # Design
+    "Figma": [],
+    "Adobe Photoshop": ["photoshop"],
+    "Adobe Illustrator": ["illustrator"],
+    "Adobe XD": ["xd"],
+    "Adobe InDesign": ["indesign"],
+    "Adobe Premiere Pro": ["premiere pro", "premiere"],
+    "After Effects": ["adobe after effects"],
+    "Canva": [],
+    "Sketch": [],
+    "UI/UX Design": ["ui/ux", "ux/ui", "ui ux", "ui design", "ux design", "user experience", "user interface design",
+                     "wireframing", "prototyping", "user research"],
+    "Graphic Design": ["visual design"],
+    "Creative Design": [],
+    "Visual Communication": [],
+    "Video Editing": ["video production"],
+    "AutoCAD": ["auto cad"],
+    "SolidWorks": ["solid works"],
+    "Blender": [],
+    "Unity": ["unity3d", "unity 3d"],
+    # Business, finance, operations
+    "Project Management": ["project planning", "pmp", "program management"],
+    "Agile": ["scrum", "kanban", "agile methodologies", "agile/scrum", "sprint planning"],
+    "Product Management": ["product strategy", "product roadmap", "roadmapping"],
+    "Business Analysis": ["requirements gathering", "brd", "business requirements"],
+    "Financial Analysis": ["financial statement analysis", "ratio analysis"],
+    "Financial Modeling": ["financial modelling", "valuation", "dcf"],
+    "Accounting": ["bookkeeping", "book keeping", "accounts payable", "accounts receivable"],
+    "Taxation": ["gst", "income tax", "direct tax", "indirect tax"],
+    "Tally": ["tally erp", "tally erp 9", "tally prime"],
+    "QuickBooks": ["quick books"],
+    "Auditing": ["audit", "internal audit", "statutory audit"],
+    "Budgeting": ["budget planning", "financial planning"],
+    "Forecasting": ["demand forecasting", "sales forecasting"],
+    "SAP": ["sap erp", "sap fico", "sap mm", "sap sd", "s/4hana"],
+    "Salesforce": ["salesforce crm", "sfdc"],
+    "CRM": ["crm tools", "crm software"],
+    "HubSpot": ["hub spot"],
+    "Zoho CRM": ["zoho"],
+    "Digital Marketing": ["online marketing", "performance marketing", "social media marketing", "smm",
+                          "email marketing", "google ads", "facebook ads", "sem", "ppc"],
+    "SEO": ["search engine optimization", "search engine optimisation"],
+    "Content Writing": ["copywriting", "content creation", "technical writing", "blogging"],
+    "Sales": ["b2b sales", "b2c sales", "inside sales", "field sales", "lead generation", "business development"],
+    "Marketing": ["brand management", "branding", "market research", "marketing strategy"],
+    "Customer Relations": ["customer service", "customer support", "client relationship management",
+                           "client relations", "customer relationship management"],
+    "Supply Chain Management": ["supply chain", "logistics", "procurement", "inventory management", "vendor management"],
+    "Operations Management": ["operations", "process improvement", "six sigma", "lean"],
+    "Recruitment": ["talent acquisition", "recruiting", "sourcing", "onboarding"],
+    "HR Management": ["human resources", "hrm", "employee relations", "payroll", "performance management"],
+    "Compliance": ["regulatory compliance", "risk management", "kyc", "aml"],
+    "Legal Research": ["contract drafting", "legal drafting", "litigation", "due diligence"],
+    "Teaching": ["lesson planning", "curriculum design", "classroom management", "tutoring", "mentoring"],
+    "Research": ["research and development", "r&d", "literature review"],
+    "Patient Care": ["patient management", "nursing care"],
+    "Clinical Skills": ["clinical research", "clinical trials", "diagnosis"],
+    "Medical Knowledge": ["pharmacology", "anatomy", "physiology"],
+    "Equipment Operation": ["machine operation"],
+    "Maintenance": ["preventive maintenance", "troubleshooting"],
+    "Administrative Skills": ["administration", "office administration", "ms office", "microsoft office",
+                              "documentation", "data entry"],
+    # Professional skills
+    "Communication": ["communication skills", "effective communication", "verbal communication",
+                      "written communication", "presentation skills", "public speaking", "presentation"],
+    "Leadership": ["team leadership", "people management"],
+    "Team Management": ["team handling", "managing teams"],
+    "Teamwork": ["team work", "team player", "collaboration", "team collaboration"],
+    "Problem Solving": ["problem-solving", "troubleshooting skills"],
+    "Critical Thinking": ["analytical thinking", "analytical skills"],
+    "Strategic Planning": ["strategy", "strategic thinking"],
+    "Time Management": ["prioritization"],
+    "Negotiation": ["negotiation skills"],
+    "Decision Making": ["decision-making"],
+    "Adaptability": ["flexibility"],
+    "Creativity": ["creative thinking", "innovation"],
+    "Emotional Intelligence": [],
+    "Attention to Detail": ["detail oriented", "detail-oriented"],
+}
+
+# Aliases that are ordinary words outside a skills list
+SECTION_ONLY_ALIASES = {
+    "c", "r", "go", "rust", "swift", "dart", "spring", "express", "node", "excel", "rest", "shell", "sketch",
+    "unity", "lean", "operations", "strategy", "presentation", "lambda", "s3", "ai", "ml", "dl", "ts", "js", "py",
+    "ios", "android", "frontend", "backend", "audit", "research", "teaching", "sales", "marketing", "canva",
+    "premiere", "xd", "iac", "rag", "torch", "spark", "hive", "elt", "eda", "crm", "sem", "helm",
+    "maintenance", "diagnosis", "documentation", "administration", "innovation", "flexibility", "collaboration",
+    "analytics", "forecasting", "valuation", "sourcing", "onboarding", "mentoring", "tutoring", "troubleshooting",
+    "prioritization", "branding", "logistics", "procurement", "payroll", "blogging", "dashboards", "transformers",
+    "oracle", "mongo", "postgre", "sap", "sas", "gst", "tally", "zoho", "version control", "communication",
+    "leadership", "teamwork", "statistics", "accounting", "compliance", "recruiting",
+}
+
+# Headings that open a skills section ("Technical Skills", "Tech Stack:")
+SKILL_HEADING = re.compile(
+    r"^(?:key |core |technical |professional |soft |hard |it |relevant |tools and |tools & )?"
+    r"(?:skills?(?: set| summary| & tools| and tools| & technologies| and technologies)?|skillset|competencies|"
+    r"technologies|tech stack|technical expertise|areas of expertise|expertise|tools(?: & technologies| and technologies)?|"
+    r"proficiencies)$"
+)
+# Headings that close it
+OTHER_HEADING = re.compile(
+    r"^(?:work |professional |employment |relevant )?(?:experience|history|employment|education|academics?|"
+    r"qualifications?|projects?|academic projects|certifications?|courses|summary|profile|objective|"
+    r"achievements|accomplishments|awards|honou?rs|publications|interests|hobbies|extra[- ]curricular activities|"
+    r"activities|references|declaration|personal (?:details|information)|internships?|volunteering|contact)$"
+)
+# Dots stay inside tokens ("node.js", "asp.net", ".net"); "-", "/" and "&" split them,
+# for aliases and resumes alike, so "CI/CD" and "ci cd" are the same tokens
+TOKEN = re.compile(r"\.?[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+ITEM_SEPARATORS = re.compile(r"[,;|•·●▪■◦►✓*]|\s{3,}|\t|\s[-–—]\s")
+BULLET_PREFIX = re.compile(r"^\s*(?:[-–—•·●▪■◦►✓*>o]\s+|\d+[.)]\s+)")
+MAX_ITEM_WORDS = 8
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN.findall(text.lower())
+
+
+class SkillExtractor:
+    def __init__(self, taxonomy: Dict[str, List[str]] = SKILL_TAXONOMY, extra_skills: Iterable[str] = (),
+                 section_only: Iterable[str] = SECTION_ONLY_ALIASES):
+        self._root: Dict = {}
+        self.size = 0
+        section_only = {tuple(tokenize(alias)) for alias in section_only}
+        for canonical, aliases in taxonomy.items():
+            for alias in [canonical, *aliases]:
+                self._add(alias, canonical, section_only)
+        for skill in extra_skills:
+            skill = skill.strip()
+            if skill and not self._lookup(tokenize(skill)):
+                self._add(skill, skill, section_only)
+
+    def _add(self, alias: str, canonical: str, section_only) -> None:
+        tokens = tuple(tokenize(alias))
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if None not in node:
+            self.size += 1
+        # an exact alias wins over one that only tokenizes the same ("c++" vs "c")
+        node[None] = (canonical, tokens in section_only)
+
+    def _lookup(self, tokens: List[str]) -> Optional[Tuple[str, bool]]:
+        node = self._root
+        for token in tokens:
+            node = node.get(token)
+            if node is None:
+                return None
+        return node.get(None)
+
+    def _scan_tokens(self, tokens: List[str], in_section: bool, found: Dict[str, None]) -> int:
+        """Longest-match walk over tokens; adds canonical names to found, returns the match count."""
+        matches = 0
+        i, n = 0, len(tokens)
+        while i < n:
+            node = self._root
+            j = i
+            last = None
+            while j < n:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                entry = node.get(None)
+                if entry is not None and (in_section or not entry[1]):
+                    last = (j, entry[0])
+            if last is None:
+                i += 1
+                continue
+            i, canonical = last
+            found[canonical] = None
+            matches += 1
+        return matches
+
+    def analyze(self, text: str) -> Dict:
+        """Skills found in text (canonical names, in order of first mention), plus
+        coverage of the skills section: matched items / listed items."""
+        found: Dict[str, None] = {}
+        items = covered = 0
+        in_section = False
+        for line in (text or "").splitlines():
+            stripped = BULLET_PREFIX.sub("", line).strip()
+            if not stripped:
+                continue
+            head, _, rest = stripped.partition(":")
+            heading = head.strip(" -–").lower()
+            if SKILL_HEADING.match(heading):
+                in_section = True
+                if not rest.strip():
+                    continue
+                stripped = rest
+            elif OTHER_HEADING.match(heading):
+                in_section = False
+                if not rest.strip():
+                    continue
+                stripped = rest
+
+            if not in_section:
+                self._scan_tokens(tokenize(stripped), False, found)
+                continue
+            for item in ITEM_SEPARATORS.split(stripped):
+                label, colon, values = item.partition(":")
+                # "Programming Languages: Python" -> the label is not a skill
+                if colon and len(label.split()) <= 4:
+                    item = values
+                tokens = tokenize(item)
+                if not tokens:
+                    continue
+                items += 1
+                if self._scan_tokens(tokens, True, found) and len(tokens) <= MAX_ITEM_WORDS:
+                    covered += 1
+        return {
+            "skills": list(found),
+            "section_items": items,
+            "coverage": round(covered / items, 3) if items else 0.0,
+        }
@@ -0,0 +1,32 @@
+# payparity-backend/tests/conftest.py
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DATASET_PATH = os.path.join(BACKEND_DIR, "output/19kdata.csv")
+MODEL_PATH = os.path.join(BACKEND_DIR, "output/xgb_salary_model_optimized.pkl")
+
+
+@pytest.fixture(scope="session")
+def salary_dataset() -> pd.DataFrame:
+    return pd.read_csv(DATASET_PATH)
+
+
+@pytest.fixture(scope="session")
+def app_module(tmp_path_factory):
+    """app.py with its caches in a temp dir and the model + dataset loaded."""
+    cache_dir = tmp_path_factory.mktemp("cache")
+    for var, name in [("RESUME_CACHE_PATH", "resume_cache.sqlite3"),
+                      ("LINKEDIN_SNIPPET_CACHE_PATH", "linkedin_snippets.sqlite3"),
+                      ("LINKEDIN_PROFILE_CACHE_PATH", "linkedin_profiles.sqlite3"),
+                      ("OCR_CACHE_PATH", "ocr_cache.sqlite3"),
+                      ("AUDIT_DIR", "audits")]:
+        os.environ[var] = str(cache_dir / name)
+    import app
+    app.ensure_resources_loaded()
+    return app
@@ -0,0 +1,113 @@
+# payparity-backend/tests/test_audit_jobs.py
+import io
+
+import pandas as pd
+import pytest
+
+from audit_jobs import AuditJobs
+
+# 6 records: a blank line, a quoted title spanning two lines and a quoted
+# name with a blank line inside it
+PAYROLL = (
+    "Name,Title,Experience,Salary\n"
+    "A,Data Analyst,3,600000\n"
+    "B,\"Senior\nEngineer\",5,1500000\n"
+    "\n"
+    "C,Chef,2,300000\n"
+    "\"D\n\nDee\",Nurse,4,400000\n"
+    "E,Teacher,6,500000\n"
+    "\n"
+    "F,Lawyer,8,2000000\n"
+)
+NAMES = ["A", "B", "C", "D\n\nDee", "E", "F"]
+
+
+class Crash(Exception):
+    pass
+
+
+def scorer(crash_on_call=None):
+    calls = []
+
+    def score_chunk(frame: pd.DataFrame) -> pd.DataFrame:
+        calls.append(len(frame))
+        if len(calls) == crash_on_call:
+            raise Crash()
+        return frame[["row", "name", "job_title"]].assign(verdict="fair")
+
+    score_chunk.calls = calls
+    return score_chunk
+
+
+def run_once(jobs: AuditJobs) -> None:
+    job = jobs._claim()
+    assert job is not None
+    jobs._process(job)
+
+
+@pytest.fixture
+def root(tmp_path):
+    return str(tmp_path / "audits")
+
+
+def submit(jobs: AuditJobs, text: str = PAYROLL) -> str:
+    return jobs.submit(io.BytesIO(text.encode()), "payroll.csv")["job_id"]
+
+
+def results(jobs: AuditJobs, job_id: str) -> pd.DataFrame:
+    return pd.read_csv(jobs.results_path(job_id), dtype=str, keep_default_na=False)
+
+
+def test_counts_records_not_lines(root):
+    jobs = AuditJobs(root, scorer(), chunk_rows=4)
+    job_id = submit(jobs)
+    run_once(jobs)
+    job = jobs.get(job_id)
+    assert (job["status"], job["total_rows"], job["processed_rows"], job["progress"]) == ("completed", 6, 6, 1.0)
+    out = results(jobs, job_id)
+    assert out["name"].tolist() == NAMES
+    assert out["job_title"].tolist()[1] == "Senior\nEngineer"
+    assert out["row"].tolist() == [str(i) for i in range(1, 7)]
+
+
+@pytest.mark.parametrize("crash_on_call", [2, 3])
+def test_resume_after_crash_writes_each_row_once(root, crash_on_call):
+    jobs = AuditJobs(root, scorer(crash_on_call), chunk_rows=2)
+    job_id = submit(jobs)
+    with pytest.raises(Crash):
+        run_once(jobs)
+    job = jobs.get(job_id)
+    done = 2 * (crash_on_call - 1)
+    assert (job["status"], job["processed_rows"], job["total_rows"]) == ("running", done, 6)
+    assert job["progress"] == round(done / 6, 4)
+
+    # another worker picks the job up once the lease has expired
+    jobs._execute("UPDATE jobs SET lease_until = 0 WHERE id = ?", (job_id,))
+    resumed = AuditJobs(root, scorer(), chunk_rows=2)
+    run_once(resumed)
+    job = resumed.get(job_id)
+    assert (job["status"], job["processed_rows"], job["progress"]) == ("completed", 6, 1.0)
+    assert job["counts"] == {"fair": 6}
+    out = results(resumed, job_id)
+    assert out["name"].tolist() == NAMES
+    assert out["row"].tolist() == [str(i) for i in range(1, 7)]
+
+
+def test_uncommitted_results_are_dropped_on_resume(root):
+    jobs = AuditJobs(root, scorer(), chunk_rows=2)
+    job_id = submit(jobs)
+    run_once(jobs)
+    # a crash between writing a chunk and committing it leaves extra bytes
+    jobs._execute("UPDATE jobs SET status = 'running', processed_rows = 4, results_bytes = ?, lease_until = 0,"
+                  " counts = '{\"fair\": 4}' WHERE id = ?",
+                  (len(results(jobs, job_id).iloc[:4].to_csv(index=False, lineterminator="\n").encode()), job_id))
+    run_once(AuditJobs(root, scorer(), chunk_rows=2))
+    out = results(jobs, job_id)
+    assert out["name"].tolist() == NAMES
+    assert jobs.get(job_id)["counts"] == {"fair": 6}
+
+
+def test_missing_required_column_is_rejected(root):
+    jobs = AuditJobs(root, scorer())
+    with pytest.raises(ValueError, match="current_salary"):
+        submit(jobs, "Name,Title,Experience\nA,Chef,2\n")
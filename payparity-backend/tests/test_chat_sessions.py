@@ -0,0 +1,139 @@
+# payparity-backend/tests/test_chat_sessions.py
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from chat_sessions import ChatSessions
+
+
+def turn(n: int) -> list:
+    return [{"role": "user", "content": f"question {n}"}, {"role": "assistant", "content": f"answer {n}"}]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "chat_sessions.sqlite3")
+
+
+def test_compaction_keeps_turns_added_meanwhile():
+    sessions = ChatSessions(compact_after=4, keep_recent=2)
+    session = sessions.create("coach")
+    for n in range(3):
+        session = sessions.append(session, turn(n))
+    base, folded = session["summarized"], sessions.to_compact(session)
+    assert len(folded) == 4
+
+    sessions.append(session, turn(3))  # arrives while the summarizer runs
+    assert sessions.apply_summary(session["id"], "summary of 0-1", base, len(folded))
+    latest = sessions.get(session["id"])
+    assert latest["summary"] == "summary of 0-1"
+    assert latest["summarized"] == 4
+    assert latest["messages"] == turn(2) + turn(3)
+
+
+def test_summary_survives_a_newer_copy_from_another_worker(path):
+    worker_a = ChatSessions(compact_after=4, keep_recent=2, persist_path=path)
+    worker_b = ChatSessions(compact_after=4, keep_recent=2, persist_path=path)
+    session = worker_a.create("coach")
+    for n in range(3):
+        session = worker_a.append(session, turn(n))
+    held = worker_a.get(session["id"])  # what compaction starts from
+    base, folded = held["summarized"], worker_a.to_compact(held)
+
+    time.sleep(0.01)
+    worker_b.append(worker_b.get(session["id"]), turn(3))
+    assert worker_a.apply_summary(session["id"], "summary", base, len(folded))
+
+    for worker in (worker_a, worker_b, ChatSessions(persist_path=path)):
+        latest = worker.get(session["id"])
+        assert latest["messages"] == turn(2) + turn(3)
+        assert (latest["summary"], latest["summarized"]) == ("summary", 4)
+
+
+def test_stale_summary_is_dropped():
+    sessions = ChatSessions(compact_after=4, keep_recent=2)
+    session = sessions.create("coach")
+    for n in range(3):
+        session = sessions.append(session, turn(n))
+    base, folded = session["summarized"], sessions.to_compact(session)
+    assert sessions.apply_summary(session["id"], "first", base, len(folded))
+    # a second summarizer that read the same history finishes later
+    assert not sessions.apply_summary(session["id"], "second", base, len(folded))
+    latest = sessions.get(session["id"])
+    assert (latest["summary"], latest["summarized"], latest["messages"]) == ("first", 4, turn(2))
+    assert sessions.stats()["compactions"] == 1
+
+
+def test_apply_summary_on_missing_session():
+    sessions = ChatSessions()
+    assert not sessions.apply_summary("missing", "summary", 0, 2)
+
+
+def test_ttl_expiry_and_lru_eviction():
+    sessions = ChatSessions(max_sessions=2, ttl_seconds=60)
+    first, second = sessions.create("coach"), sessions.create("coach")
+    sessions.create("coach")
+    assert sessions.get(first["id"]) is None
+    assert sessions.get(second["id"]) is not None
+    second["updated_at"] -= 120
+    assert sessions.get(second["id"]) is None
+    stats = sessions.stats()
+    assert (stats["evicted"], stats["expired"]) == (1, 1)
+
+
+def stored_ids(sessions):
+    return {row[0] for row in sessions._db().execute("SELECT id FROM sessions")}
+
+
+def test_expired_rows_are_swept_periodically(path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    sessions = ChatSessions(ttl_seconds=60, persist_path=path, sweep_seconds=30)
+    old = sessions.create("coach")  # first save sweeps
+    clock[0] += 100
+    fresh = sessions.create("coach")  # 100s since the last sweep: sweeps, old is past its TTL
+    assert stored_ids(sessions) == {fresh["id"]}
+
+    another = sessions.create("coach")
+    clock[0] += 100
+    sessions.save(sessions.get(fresh["id"]) or fresh)  # sweeps again
+    clock[0] += 10
+    newest = sessions.create("coach")  # 10s after the last sweep: no sweep
+    assert stored_ids(sessions) == {fresh["id"], newest["id"]}
+    assert another["id"] not in stored_ids(sessions)
+    # between sweeps an expired row is still never served
+    clock[0] += 61
+    assert ChatSessions(ttl_seconds=60, persist_path=path).get(newest["id"]) is None
+    assert old["id"] not in stored_ids(sessions)
+
+
+def test_chat_endpoint_keeps_session_io_off_the_event_loop(app_module, monkeypatch, path):
+    sessions = ChatSessions(persist_path=path)
+    threads = []
+
+    def record(method):
+        def wrapper(*args, **kwargs):
+            threads.append((method.__name__, threading.current_thread()))
+            return method(*args, **kwargs)
+        return wrapper
+
+    for name in ("create", "get", "save", "append"):
+        monkeypatch.setattr(sessions, name, record(getattr(sessions, name)))
+
+    async def fake_reply(messages):
+        threads.append(("reply", threading.current_thread()))
+        return f"reply to {messages[-1]['content']}"
+
+    monkeypatch.setattr(app_module, "chat_sessions", sessions)
+    monkeypatch.setattr(app_module, "call_openrouter", fake_reply)
+    with TestClient(app_module.app) as client:
+        first = client.post("/api/chat", json={"message": "offer is 12 LPA"}).json()
+        second = client.post("/api/chat", json={"session_id": first["session_id"], "message": "counter?"}).json()
+    assert second["message"] == "reply to counter?"
+    assert [m["content"] for m in sessions.get(first["session_id"])["messages"]] == [
+        "offer is 12 LPA", "reply to offer is 12 LPA", "counter?", "reply to counter?"]
+    loop_threads = {thread for name, thread in threads if name == "reply"}
+    session_threads = {thread for name, thread in threads if name != "reply"}
+    assert session_threads and not session_threads & loop_threads
@@ -0,0 +1,89 @@
+# payparity-backend/tests/test_dataset_store.py
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+
+import dataset_store
+from dataset_store import CURRENT, build_columnar, is_current, load_columnar, load_dataset
+from tests.conftest import DATASET_PATH
+
+
+def write_csv(path, rows: int, offset: int = 0) -> str:
+    pd.DataFrame({
+        "Job_Title": [f"Title {i % 7}" for i in range(offset, offset + rows)],
+        "Location": [None if i % 11 == 0 else f"City {i % 3}" for i in range(offset, offset + rows)],
+        "Salary": [100_000 + i for i in range(offset, offset + rows)],
+        "Experience_Years": [i % 30 + 0.5 for i in range(offset, offset + rows)],
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+def builds(out_dir) -> list:
+    return sorted(name for name in os.listdir(out_dir) if name.startswith("build-"))
+
+
+def test_roundtrip_matches_csv(tmp_path):
+    csv = write_csv(tmp_path / "data.csv", 200)
+    out = str(tmp_path / "data.columnar")
+    build_columnar(csv, out)
+    assert is_current(csv, out)
+    df, expected = load_columnar(out), pd.read_csv(csv)
+    assert list(df.columns) == list(expected.columns)
+    for col in expected.columns:
+        assert df[col].astype(object).where(df[col].notna(), None).tolist() == \
+            expected[col].astype(object).where(expected[col].notna(), None).tolist()
+
+
+def test_real_dataset_roundtrip(tmp_path, salary_dataset):
+    df = load_dataset(DATASET_PATH, str(tmp_path / "19kdata.columnar"))
+    assert len(df) == len(salary_dataset)
+    for col in salary_dataset.columns:
+        assert df[col].astype(str).tolist() == salary_dataset[col].astype(str).tolist()
+
+
+def test_rebuild_swaps_without_touching_mapped_build(tmp_path):
+    out = str(tmp_path / "data.columnar")
+    build_columnar(write_csv(tmp_path / "a.csv", 50), out)
+    before = load_columnar(out)
+    first = os.path.realpath(os.path.join(out, CURRENT))
+
+    csv_b = write_csv(tmp_path / "b.csv", 80, offset=1000)
+    build_columnar(csv_b, out)
+    assert os.path.realpath(os.path.join(out, CURRENT)) != first
+    assert is_current(csv_b, out)
+    # The first build is kept for readers that resolved it, and its arrays are unchanged
+    assert os.path.isdir(first)
+    assert before["Salary"].tolist() == list(range(100_000, 100_050))
+    assert load_columnar(out)["Salary"].tolist() == list(range(101_000, 101_080))
+
+    build_columnar(write_csv(tmp_path / "c.csv", 10), out)
+    assert not os.path.exists(first)
+    assert len(builds(out)) == 2
+
+
+def test_old_in_place_layout_is_replaced(tmp_path):
+    out = tmp_path / "data.columnar"
+    out.mkdir()
+    np.save(out / "00.npy", np.arange(3))
+    (out / dataset_store.MANIFEST).write_text('{"format_version": 1}')
+    csv = write_csv(tmp_path / "data.csv", 20)
+    assert not is_current(csv, str(out))
+    load_dataset(csv, str(out))
+    assert is_current(csv, str(out))
+    assert not (out / "00.npy").exists() and not (out / dataset_store.MANIFEST).exists()
+
+
+def _load(args) -> int:
+    csv, out = args
+    return len(load_dataset(csv, out))
+
+
+def test_concurrent_workers_build_once(tmp_path):
+    csv = write_csv(tmp_path / "data.csv", 300)
+    out = str(tmp_path / "data.columnar")
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        assert pool.map(_load, [(csv, out)] * 4) == [300] * 4
+    assert len(builds(out)) == 1
+    assert is_current(csv, out)
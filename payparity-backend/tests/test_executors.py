@@ -0,0 +1,68 @@
+# payparity-backend/tests/test_executors.py
+import asyncio
+import io
+import os
+import sys
+
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+
+from executors import StageExecutor, parse_stage_kinds
+from parse_stages import compute_experience_for_title, docx_to_text
+
+RESUME = """Senior Data Analyst, Globex                 Mar 2019 - Dec 2022
+Analyst, Initech                            Jan 2016 - Feb 2019
+"""
+
+
+def docx_bytes(text: str) -> bytes:
+    from docx import Document
+    doc = Document()
+    for line in text.splitlines():
+        doc.add_paragraph(line)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def app_imported() -> bool:
+    return "app" in sys.modules
+
+
+def crash() -> None:
+    os._exit(1)
+
+
+@pytest.fixture
+def process_executor():
+    executor = StageExecutor(parse_stage_kinds("parse=process"), processes=1)
+    yield executor
+    executor.shutdown()
+
+
+def test_parse_stage_runs_in_process_pool_without_app(process_executor):
+    async def run():
+        text = await process_executor.run("parse", docx_to_text, docx_bytes(RESUME))
+        years = await process_executor.run("parse", compute_experience_for_title, text, "Data Analyst")
+        loaded = await process_executor.run("parse", app_imported)
+        return text, years, loaded
+
+    text, years, loaded = asyncio.run(run())
+    assert text.splitlines() == RESUME.splitlines()
+    assert years == compute_experience_for_title(RESUME, "Data Analyst")
+    assert not loaded
+    assert process_executor.stats()["stages"]["parse"]["errors"] == 0
+
+
+def test_broken_pool_is_shut_down_and_replaced(process_executor):
+    async def run():
+        with pytest.raises(BrokenProcessPool):
+            await process_executor.run("parse", crash)
+        return await process_executor.run("parse", compute_experience_for_title, RESUME, "Analyst")
+
+    broken = process_executor._pool("process")
+    years = asyncio.run(run())
+    assert years > 0
+    assert process_executor._pools["process"] is not broken
+    assert broken._shutdown_thread
+    assert process_executor.stats()["stages"]["parse"]["errors"] == 1
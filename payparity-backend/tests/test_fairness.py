@@ -0,0 +1,69 @@
+# payparity-backend/tests/test_fairness.py
+"""FairnessIndex must report what a direct pandas groupby over the selected rows gives."""
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from fairness import FAIRNESS_DIMENSIONS, FairnessIndex
+
+FRAME = pd.DataFrame({
+    "Job_Title": ["Data Analyst", "data analyst ", "Data Analyst", "Data Analyst", "Data Scientist",
+                  "Data Scientist", "Data Scientist", "Chef"],
+    "Gender": ["Female", "Male", "Male", "Non-binary", "Female", "Male", "Male", "Female"],
+    "Location": ["Pune", "Pune", "Delhi", "Mumbai", "Delhi", "Delhi", "Chennai", "Pune"],
+    "Salary_INR": [600000, 700000, 900000, 650000, 1500000, 1800000, 1300000, 400000],
+})
+
+
+def direct_report(df, titles, dim, bias_threshold):
+    rows = df[df["Job_Title"].str.lower().str.strip().isin(titles)]
+    grouped = rows.groupby(dim)["Salary_INR"].agg(["mean", "count"])
+    means = {group: round(float(mean), 2) for group, mean in grouped["mean"].items()}
+    high, low = max(means.values()), min(means.values())
+    return {
+        "max_group": max(means, key=means.get),
+        "min_group": min(means, key=means.get),
+        "ratio": round(high / low, 4),
+        "bias_detected": round(high / low, 4) > bias_threshold,
+        "group_means": means,
+        "group_counts": {group: int(count) for group, count in grouped["count"].items()},
+    }
+
+
+@pytest.mark.parametrize("titles", [["data analyst"], ["data scientist"], ["data analyst", "data scientist"],
+                                    ["chef"]])
+def test_report_matches_groupby(titles):
+    index = FairnessIndex(FRAME, bias_threshold=1.1)
+    report = index.report(titles)
+    for dim in FAIRNESS_DIMENSIONS:
+        assert report[dim] == direct_report(FRAME, titles, dim, 1.1)
+
+
+def test_single_member_groups():
+    report = FairnessIndex(FRAME).report(["data analyst"])
+    # "Non-binary" and "Mumbai" each have one analyst
+    assert report["Gender"]["group_counts"]["Non-binary"] == 1
+    assert report["Gender"]["group_means"]["Non-binary"] == 650000.0
+    assert report["Location"]["group_counts"]["Mumbai"] == 1
+    # "chef" has a single row, so every group is the max and the min
+    chef = FairnessIndex(FRAME).report(["chef"])["Gender"]
+    assert (chef["max_group"], chef["min_group"], chef["ratio"], chef["bias_detected"]) == ("Female", "Female", 1.0, False)
+
+
+def test_all_titles_matches_whole_frame_groupby():
+    report = FairnessIndex(FRAME).report()
+    titles = FRAME["Job_Title"].str.lower().str.strip().unique().tolist()
+    for dim in FAIRNESS_DIMENSIONS:
+        assert report[dim] == direct_report(FRAME, titles, dim, 1.1)
+
+
+def test_title_that_matches_nothing():
+    assert FairnessIndex(FRAME).report(["astronaut"]) == {dim: None for dim in FAIRNESS_DIMENSIONS}
+
+
+def test_endpoint_with_unknown_title(app_module):
+    with TestClient(app_module.app) as client:
+        body = client.get("/fairness", params={"job_title": "Underwater Basket Weaver"}).json()
+        assert body["status"] == "error"
+        body = client.get("/fairness", params={"job_title": "Data Analyst"}).json()
+        assert body["status"] == "success" and body["matched_titles"] >= 1
@@ -0,0 +1,70 @@
+# payparity-backend/tests/test_fast_inference.py
+"""FastSalaryPredictor must reproduce the sklearn pipeline's model.predict."""
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from fast_inference import FEATURE_COLUMNS, FastSalaryPredictor
+from tests.conftest import MODEL_PATH
+
+ATOL = 1e-4
+
+
+@pytest.fixture(scope="module")
+def model():
+    return joblib.load(MODEL_PATH)
+
+
+@pytest.fixture(scope="module")
+def fast(model):
+    return FastSalaryPredictor(model, buffer_rows=64)
+
+
+def assert_same_predictions(model, fast, rows):
+    expected = model.predict(pd.DataFrame(rows, columns=FEATURE_COLUMNS))
+    np.testing.assert_allclose(fast.predict_rows(rows), expected, rtol=0, atol=ATOL)
+
+
+def test_matches_pipeline_on_dataset_rows(model, fast, salary_dataset):
+    df = salary_dataset.sample(3000, random_state=7).copy()
+    df["Data_Source"] = np.where(np.arange(len(df)) % 2, "LinkedIn", "ResumeUpload")
+    # larger than buffer_rows, so the buffer is regrown and reused
+    assert_same_predictions(model, fast, df[FEATURE_COLUMNS].to_dict("records"))
+
+
+def test_single_row_and_repeated_calls(model, fast, salary_dataset):
+    row = salary_dataset.iloc[0].to_dict()
+    row["Data_Source"] = "ResumeUpload"
+    for _ in range(3):
+        assert_same_predictions(model, fast, [row])
+
+
+def test_unseen_and_missing_values(model, fast):
+    base = {"Gender": "Non-binary", "Job_Title": "Software Engineer", "Experience_Years": 4,
+            "Skills_Required": "Python, SQL", "Education_Level": "Bachelors", "Location": "Pune",
+            "Data_Source": "ResumeUpload"}
+    rows = [
+        base,
+        {**base, "Job_Title": "Chief Vibes Officer", "Location": "Atlantis", "Gender": "Unknown"},
+        {**base, "Skills_Required": ""},
+        {**base, "Skills_Required": "Kubernetes, Rust, quantum basket weaving, python, PYTHON"},
+        {**base, "Location": None, "Gender": None, "Experience_Years": None},
+        {**base, "Experience_Years": 0},
+        {**base, "Experience_Years": 45.5},
+        {**base, "Education_Level": "PhD/Doctorate"},
+    ]
+    assert_same_predictions(model, fast, rows)
+
+
+def test_empty_batch(fast):
+    assert fast.predict_rows([]).shape == (0,)
+
+
+def test_unknown_ordinal_category_raises_like_pipeline(model, fast):
+    row = {"Gender": "Male", "Job_Title": "Software Engineer", "Experience_Years": 3, "Skills_Required": "Python",
+           "Education_Level": "Diploma", "Location": "Pune", "Data_Source": "ResumeUpload"}
+    with pytest.raises(ValueError):
+        model.predict(pd.DataFrame([row], columns=FEATURE_COLUMNS))
+    with pytest.raises(ValueError):
+        fast.predict_rows([row])
@@ -0,0 +1,188 @@
+# payparity-backend/tests/test_keyword_matcher.py
+"""KeywordMatcher against the old first-match chains (copied from the
+baseline app.py) and against plain per-keyword scoring."""
+import os
+import random
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from keyword_matcher import SHORT_KEYWORD_CHARS, KeywordMatcher
+from tests.conftest import BACKEND_DIR
+
+DOMAIN_KEYWORDS = {
+    "tech": ["python", "java", "developer", "engineer", "ai", "ml", "cloud", "data", "react", "node", "sql", "software"],
+    "healthcare": ["doctor", "nurse", "medical", "surgery", "patient", "clinic", "hospital", "health"],
+    "finance": ["finance", "accounting", "tax", "audit", "bank", "investment", "economics"],
+    "education": ["teacher", "professor", "lecturer", "trainer", "education", "school"],
+    "legal": ["law", "attorney", "advocate", "legal", "compliance", "paralegal"],
+    "design": ["designer", "artist", "creative", "ui", "ux", "graphics", "illustrator", "animation", "fashion"],
+    "sales/marketing": ["marketing", "sales", "advertising", "promotion", "branding", "customer", "retail"],
+    "management": ["manager", "operations", "executive", "project", "product", "supply", "logistics", "coordinator"],
+}
+JOB_CATEGORY_KEYWORDS = {
+    "tech": ["developer", "engineer", "software", "data", "ml", "ai", "blockchain", "cloud", "it", "cyber", "analyst",
+             "programmer", "full stack", "frontend", "backend", "system", "network"],
+    "design/arts": ["artist", "designer", "graphic", "illustrator", "musician", "writer", "editor", "creative",
+                    "ux", "ui", "photographer", "animator", "fashion"],
+    "healthcare": ["doctor", "nurse", "medical", "dentist", "physician", "therapist", "surgeon", "pharmacist"],
+    "finance": ["finance", "accountant", "bank", "investment", "trader", "auditor", "analyst", "tax"],
+    "sales/marketing": ["sales", "marketing", "brand", "advertising", "growth", "business development"],
+    "education": ["teacher", "professor", "lecturer", "trainer", "education", "counselor"],
+    "legal": ["lawyer", "attorney", "legal", "advocate", "paralegal", "compliance"],
+    "operations/management": ["manager", "operations", "project", "product", "supply chain", "logistics", "executive"],
+    "hr/recruitment": ["hr", "recruiter", "talent", "human resource", "payroll"],
+}
+
+
+# --- legacy implementation (baseline app.py) ---
+def legacy_job_category(job_title):
+    jt = job_title.lower().strip()
+    category_map = {
+        "tech": ["developer", "engineer", "software", "data", "ml", "ai", "blockchain", "cloud", "it", "cyber", "analyst",
+                 "programmer", "full stack", "frontend", "backend", "system", "network"],
+        "design/arts": ["artist", "designer", "graphic", "illustrator", "musician", "writer", "editor", "creative",
+                        "ux", "ui", "photographer", "animator", "fashion"],
+        "healthcare": ["doctor", "nurse", "medical", "dentist", "physician", "therapist", "surgeon", "pharmacist"],
+        "finance": ["finance", "accountant", "bank", "investment", "trader", "auditor", "analyst", "tax"],
+        "sales/marketing": ["sales", "marketing", "brand", "advertising", "growth", "business development"],
+        "education": ["teacher", "professor", "lecturer", "trainer", "education", "counselor"],
+        "legal": ["lawyer", "attorney", "legal", "advocate", "paralegal", "compliance"],
+        "operations/management": ["manager", "operations", "project", "product", "supply chain", "logistics", "executive"],
+        "hr/recruitment": ["hr", "recruiter", "talent", "human resource", "payroll"],
+        "other": []
+    }
+    for cat, keywords in category_map.items():
+        if any(k in jt for k in keywords):
+            return cat.title()
+    return "Other"
+
+
+def legacy_domain(text):
+    tech_keywords = ["python", "java", "developer", "engineer", "ai", "ml", "cloud", "data", "react", "node", "sql", "software"]
+    healthcare_keywords = ["doctor", "nurse", "medical", "surgery", "patient", "clinic", "hospital", "health"]
+    finance_keywords = ["finance", "accounting", "tax", "audit", "bank", "investment", "economics"]
+    education_keywords = ["teacher", "professor", "lecturer", "trainer", "education", "school"]
+    legal_keywords = ["law", "attorney", "advocate", "legal", "compliance", "paralegal"]
+    design_keywords = ["designer", "artist", "creative", "ui", "ux", "graphics", "illustrator", "animation", "fashion"]
+    sales_keywords = ["marketing", "sales", "advertising", "promotion", "branding", "customer", "retail"]
+    ops_keywords = ["manager", "operations", "executive", "project", "product", "supply", "logistics", "coordinator"]
+    text = text.lower()
+    if any(k in text for k in tech_keywords): return "tech"
+    if any(k in text for k in healthcare_keywords): return "healthcare"
+    if any(k in text for k in finance_keywords): return "finance"
+    if any(k in text for k in education_keywords): return "education"
+    if any(k in text for k in legal_keywords): return "legal"
+    if any(k in text for k in design_keywords): return "design"
+    if any(k in text for k in sales_keywords): return "sales/marketing"
+    if any(k in text for k in ops_keywords): return "management"
+    return "other"
+
+
+def reference_counts(taxonomy, text):
+    """Hits per label (the matcher's definition): str.count per distinct keyword,
+    whole words only for keywords of SHORT_KEYWORD_CHARS or fewer."""
+    text = text.lower()
+    words = re.findall(r"[^\W_]+", text)
+    return [sum(words.count(kw) if len(kw) <= SHORT_KEYWORD_CHARS and " " not in kw else text.count(kw)
+                for kw in {k.lower() for k in keywords})
+            for keywords in taxonomy.values()]
+
+
+def has_short_keyword(taxonomy, text):
+    """Whether a short keyword occurs anywhere, even inside a word (where the old chains matched it)."""
+    return any(kw in text.lower() for keywords in taxonomy.values() for kw in keywords if len(kw) <= SHORT_KEYWORD_CHARS)
+
+
+def skills_lists():
+    with open(os.path.join(BACKEND_DIR, "bias_log.txt"), encoding="utf-8") as f:
+        return [line.split(":", 1)[1].strip() for line in f if line.startswith("Extracted Skills:")]
+
+
+def titles(salary_dataset):
+    return sorted(salary_dataset["Job_Title"].dropna().unique())
+
+
+def random_texts(taxonomy, n=300, seed=3):
+    """Keywords glued to each other, to punctuation and to odd whitespace, so
+    hits inside words, across tokens and for multi-word keywords all occur."""
+    rng = random.Random(seed)
+    words = [kw for keywords in taxonomy.values() for kw in keywords]
+    words += ["Chain", "retail", "HTML", "Über", "x", "", "  ", "\n", "\t", ",", "-", "/", "(", "İ", "ß"]
+    seps = ["", " ", "  ", ", ", "\n", "\t", "-", "\u00a0", "\u2003"]
+    texts = []
+    for _ in range(n):
+        parts = [rng.choice(words) for _ in range(rng.randint(0, 12))]
+        texts.append("".join(p + rng.choice(seps) for p in parts))
+        texts[-1] = texts[-1].upper() if rng.random() < 0.2 else texts[-1]
+    return texts
+
+
+@pytest.mark.parametrize("taxonomy", [DOMAIN_KEYWORDS, JOB_CATEGORY_KEYWORDS], ids=["domain", "category"])
+def test_counts_match_str_count(taxonomy, salary_dataset):
+    matcher = KeywordMatcher(taxonomy)
+    for text in skills_lists() + titles(salary_dataset) + random_texts(taxonomy):
+        assert matcher._counts(text) == reference_counts(taxonomy, text), text
+        # a second pass is served from the token cache
+        assert matcher._counts(text) == reference_counts(taxonomy, text), text
+
+
+@pytest.mark.parametrize("taxonomy,legacy", [(DOMAIN_KEYWORDS, legacy_domain),
+                                             (JOB_CATEGORY_KEYWORDS, lambda t: legacy_job_category(t).lower())],
+                         ids=["domain", "category"])
+def test_best_agrees_with_legacy_when_one_label_hits(taxonomy, legacy, salary_dataset):
+    matcher = KeywordMatcher(taxonomy)
+    for text in skills_lists() + titles(salary_dataset) + random_texts(taxonomy):
+        if has_short_keyword(taxonomy, text):
+            continue  # the old chains matched "ai" in "chain"; covered below
+        hit = [label for label, n in zip(matcher.labels, reference_counts(taxonomy, text)) if n]
+        # some label hits exactly when the old chain found one
+        assert (matcher.best(text.strip()) is None) == (legacy(text) == "other"), text
+        if len(hit) == 1:
+            assert matcher.best(text.strip()) == legacy(text) == hit[0], text
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("Supply Chain Manager", {"management": 2}),
+    ("email, hair care, taxi, lawn, itinerary", {}),
+    ("AI/ML, SQL (PostgreSQL), UI-UX", {"tech": 3, "design": 2}),
+    ("tax law", {"finance": 1, "legal": 1}),
+    ("mysql", {}),
+])
+def test_short_keywords_match_whole_words(text, expected):
+    assert KeywordMatcher(DOMAIN_KEYWORDS).scores(text) == expected
+
+
+def test_best_scores_by_hits_then_taxonomy_order():
+    matcher = KeywordMatcher(JOB_CATEGORY_KEYWORDS)
+    assert matcher.best("Supply Chain Manager") == "operations/management"
+    assert matcher.scores("Supply Chain Manager") == {"operations/management": 2}
+    # one hit each: the label listed first wins, as in the old chain
+    assert matcher.scores("Bank Developer") == {"tech": 1, "finance": 1}
+    assert matcher.best("Bank Developer") == "tech"
+    assert matcher.best("", "other") == "other"
+    # "it" no longer hits "editor"
+    assert matcher.scores("Video Editor") == {"design/arts": 1}
+
+
+def test_token_cache_is_bounded():
+    matcher = KeywordMatcher(DOMAIN_KEYWORDS, cache_size=8)
+    for i in range(50):
+        matcher.best(f"python{i} engineer{i}")
+    assert len(matcher._token_hits) <= 8
+    assert matcher.scores("python1 engineer1") == {"tech": 2}
+
+
+def test_title_and_skills_domains_agree(app_module):
+    """Regression: "ai" inside "chain" and "email" made the skills look like tech."""
+    assert app_module.detect_domain("supply chain manager") == "management"
+    assert app_module.detect_domain("logistics, procurement, sap, vendor negotiation, email") == "management"
+    resume = ("Rahul Verma | Mumbai\nSupply Chain Manager, Acme Logistics   Jan 2018 - Dec 2023\n"
+              "Education: MBA\nSkills: Logistics, Procurement, SAP, Vendor Negotiation, Email\n")
+    with TestClient(app_module.app) as client:
+        body = client.post("/predict", data={"job_title": "Supply Chain Manager"},
+                           files={"file": ("resume.txt", resume.encode(), "text/plain")}).json()
+    assert body["status"] == "success", body
+    assert body["comparison"].get("status") != "mismatch"
+    assert isinstance(body["predicted_salary"], float)
@@ -0,0 +1,69 @@
+# payparity-backend/tests/test_metrics.py
+from metrics import MetricsRegistry, request_timings, server_timing, span
+
+
+def test_render_exposition_text():
+    registry = MetricsRegistry()
+    uploads = registry.counter("uploads", "Uploaded files by type", ["type"])
+    latency = registry.histogram("latency_seconds", "Latency\nin seconds (C:\\)", ["route"], buckets=(0.1, 1.0))
+    uploads.inc("pdf")
+    uploads.inc("pdf", amount=2)
+    uploads.inc('a "quoted"\\path\nnext')
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, "/predict")
+
+    def cache_stats():
+        yield "cache_hits", "counter", "Cache hits", [({"cache": "resume"}, 7)]
+        yield "cache_entries", "gauge", "Cache entries", [({}, 3.5)]
+
+    def broken():
+        def samples():
+            yield {"cache": "ocr"}, 1
+            raise RuntimeError("stats unavailable")
+        yield "half_written", "counter", "Never rendered", samples()
+
+    registry.add_collector(cache_stats)
+    registry.add_collector(broken)
+
+    assert registry.render() == "\n".join([
+        "# HELP uploads Uploaded files by type",
+        "# TYPE uploads counter",
+        'uploads_total{type="pdf"} 3',
+        'uploads_total{type="a \\"quoted\\"\\\\path\\nnext"} 1',
+        "# HELP latency_seconds Latency\\nin seconds (C:\\\\)",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/predict",le="0.1"} 2',
+        'latency_seconds_bucket{route="/predict",le="1"} 3',
+        'latency_seconds_bucket{route="/predict",le="+Inf"} 4',
+        'latency_seconds_sum{route="/predict"} 3.65',
+        'latency_seconds_count{route="/predict"} 4',
+        "# HELP cache_hits Cache hits",
+        "# TYPE cache_hits counter",
+        'cache_hits_total{cache="resume"} 7',
+        "# HELP cache_entries Cache entries",
+        "# TYPE cache_entries gauge",
+        "cache_entries 3.5",
+    ]) + "\n"
+
+
+def test_empty_registry_and_unobserved_metrics():
+    registry = MetricsRegistry()
+    registry.histogram("idle_seconds", "Never observed")
+    assert registry.render() == "# HELP idle_seconds Never observed\n# TYPE idle_seconds histogram\n"
+
+
+def test_span_records_histogram_and_request_timings():
+    registry = MetricsRegistry()
+    stages = registry.histogram("stage_seconds", "Stage time", ["stage"])
+    token = request_timings.set([])
+    try:
+        with span(stages, "pdf_text"):
+            pass
+        timings = request_timings.get()
+    finally:
+        request_timings.reset(token)
+    with span(stages, "pdf_text"):  # outside a request: histogram only
+        pass
+    assert stages.count("pdf_text") == 2
+    assert [stage for stage, _ in timings] == ["pdf_text"]
+    assert server_timing([("pdf_text", 0.0123), ("resume_parse", 0.85)]) == "pdf_text;dur=12.3, resume_parse;dur=850.0"
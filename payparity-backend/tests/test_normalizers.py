@@ -0,0 +1,135 @@
+# payparity-backend/tests/test_normalizers.py
+"""Property tests: every column normalizer must return, row for row, what its
+scalar counterpart returns. Where the scalar salary parser raises
+ValueError, the column result must be NaN. Columns are built from a grammar
+of salary strings ("₹5,00,000", "12 LPA", "1.2 Cr", "5 l.p.a.", junk, None,
+NaN, numbers), education strings and locations, with random casing and
+padding."""
+import math
+import random
+
+import numpy as np
+import pytest
+
+import normalizers as N
+
+NUMS = ["5", "12", "0.5", "5.5", "1,00,000", "5,00,000", "500000", "500,000", "1200", "999", "0", "-3",
+        "1e5", "nan", "inf", "1.2.3", ".", "12.", "٥", "1_000", "00012", "3.14159"]
+UNITS = ["", "lakh", "lakhs", "Lakh", "L", "l", "lpa", "LPA", "l.p.a.", "l pa", "cr", "crore", "crores",
+         "Cr", "c", "k", "K", "per annum", "pa", "rs", "INR", "₹", " "]
+PREFIXES = ["", "₹", "Rs ", "rs.", "INR ", "inr", "  ", "CTC: "]
+EDUCATION = ["PhD", "Ph.D.", "Doctorate", "DPhil", "Masters", "master's", "Postgraduate", "PG", "pg", "MBA",
+             "M.Tech", "MTech", "MSc", "M.Sc", "MS", "ms", "Bachelors", "Bachelor of Engineering",
+             "Undergraduate", "UG", "BTech", "B.Tech", "BSc", "B.Sc", "BE", "be", "High School", "Secondary",
+             "12th", "HSC", "10+2", "highschool", "high-school", "Diploma", "", "  ", "None", "Bcom", "BA",
+             "msw", "pgdm", "Doctor of Medicine"]
+ALLOWED = {"Bangalore", "Pune", "Hyderabad", "New Delhi", "Remote", "Mumbai", "navi mumbai", "Chennai"}
+LOCATIONS = ["bangalore", "BANGALORE", " Pune ", "pune", "new delhi", "NEW DELHI", "Remote", "wfh", "WFH",
+             "work from home", "Anywhere", "navi mumbai", "Navi Mumbai", "Mumbai", "chennai ", "Kolkata", "",
+             "  ", "london", "hyderabad"]
+ODD_VALUES = [None, "", 0, 0.0, float("nan"), 5, 5.0, 1200, "   "]
+
+
+def gen_salary(r):
+    if r.random() < 0.05:
+        return r.choice(ODD_VALUES)
+    s = r.choice(PREFIXES) + r.choice(NUMS) + r.choice(["", "", " ", "  "]) + r.choice(UNITS)
+    if r.random() < 0.1:
+        s += " " + r.choice(NUMS) + r.choice(UNITS)
+    return s.upper() if r.random() < 0.2 else s
+
+
+def gen_education(r):
+    if r.random() < 0.05:
+        return r.choice([None, 5, float("nan"), ""])
+    s = r.choice(EDUCATION)
+    if r.random() < 0.3:
+        s = r.choice(["  ", "", " in CS"]) + s + r.choice([" ", " (CS)", "", "\t"])
+    return s.upper() if r.random() < 0.2 else s
+
+
+def gen_location(r):
+    if r.random() < 0.05:
+        return r.choice([None, 3, float("nan")])
+    return r.choice(LOCATIONS)
+
+
+def scalar_salary(v):
+    try:
+        return N.parse_salary_input(v)
+    except ValueError:
+        return float("nan")
+
+
+def same(want, got) -> bool:
+    if isinstance(want, float) and math.isnan(want):
+        return isinstance(got, float) and math.isnan(got)
+    return want == got and type(want) is type(got)
+
+
+def column(gen, seed: int, rows: int, distinct: bool = False) -> list:
+    r = random.Random(seed)
+    values = [gen(r) for _ in range(rows)]
+    if distinct:
+        # mostly distinct rows take the plain-map path of map_distinct
+        values = [f"{v} {i}" if isinstance(v, str) and i % 5 else v for i, v in enumerate(values)]
+    return values
+
+
+SHAPES = [(rows, distinct) for rows in (0, 1, 50, 3000) for distinct in (False, True)]
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("rows,distinct", SHAPES)
+def test_salary_column_matches_scalar(seed, rows, distinct):
+    values = column(gen_salary, seed, rows, distinct)
+    got = N.parse_salary_column(values)
+    assert got.dtype == np.float64 and len(got) == rows
+    for v, g in zip(values, got.tolist()):
+        assert same(scalar_salary(v), g), v
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("rows,distinct", SHAPES)
+def test_education_column_matches_scalar(seed, rows, distinct):
+    values = column(gen_education, seed, rows, distinct)
+    got = N.normalize_education_column(values)
+    assert len(got) == rows
+    for v, g in zip(values, got):
+        assert same(N.normalize_education(v), g), v
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("rows,distinct", SHAPES)
+def test_location_column_matches_scalar(seed, rows, distinct):
+    values = column(gen_location, seed, rows, distinct)
+    got = N.normalize_location_column(values, ALLOWED)
+    assert len(got) == rows
+    for v, g in zip(values, got):
+        assert same(N.normalize_location(v, ALLOWED), g), v
+
+
+def test_non_object_inputs_match_scalar():
+    for values in (np.array([5.0, 1200.0, np.nan, 0.0, 5.0]), np.array([5, 12, 5]), ["12 LPA", "5 lakh", "12 LPA"]):
+        for v, g in zip(np.asarray(values).tolist(), N.parse_salary_column(values).tolist()):
+            assert same(scalar_salary(v), g), v
+
+
+def test_objects_that_hash_equal_are_not_merged():
+    values = [True, 1, 1.0, "1", None, float("nan")] * 3
+    got = N.normalize_education_column(values)
+    assert [N.normalize_education(v) for v in values] == got.tolist()
+
+
+def test_mostly_distinct_estimate():
+    rng = random.Random(0)
+    pool = [f"value {i}" for i in range(300)]
+    repeated = np.array([rng.choice(pool) for _ in range(50000)], dtype=object)
+    distinct = np.array([f"row {i}" for i in range(50000)], dtype=object)
+    # every 4th row distinct, so a strided sample would only ever see distinct rows
+    periodic = np.array([d if i % 4 == 0 else v for i, (v, d) in enumerate(zip(repeated, distinct))], dtype=object)
+    assert not N._mostly_distinct(repeated)
+    assert N._mostly_distinct(distinct)
+    assert not N._mostly_distinct(periodic)
+    assert N._mostly_distinct(np.array(["a", "b", "c"], dtype=object))
+    assert not N._mostly_distinct(np.array(["a", "a", "a", "b"], dtype=object))
@@ -0,0 +1,119 @@
+# payparity-backend/tests/test_pdf_extract.py
+import asyncio
+import functools
+import io
+
+import pytest
+
+import pdf_extract
+from executors import StageExecutor, parse_stage_kinds
+
+LINE = "Software Engineer, Acme Corp, Jan 2019 - Present. Python, SQL, AWS"
+
+
+def make_pdf(pages) -> bytes:
+    """pages: list of (text lines, image width or None); the width tells pages' images apart."""
+    from PIL import Image
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf)
+    for lines, image_width in pages:
+        for i, line in enumerate(lines):
+            c.drawString(40, 800 - i * 17, line)
+        if image_width:
+            c.drawImage(ImageReader(Image.new("RGB", (image_width, 20), "white")), 40, 300, 200, 100)
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+def image_width(document: bytes) -> int:
+    from PyPDF2 import PdfReader
+    xobjects = PdfReader(io.BytesIO(document)).pages[0]["/Resources"]["/XObject"]
+    return next(int(obj.get_object()["/Width"]) for obj in xobjects.values())
+
+
+TEXT = [LINE] * 5
+PAGES = [
+    (TEXT, None),          # 0 text
+    ([], None),            # 1 blank separator page
+    (["Page 3"], None),    # 2 short text, nothing to OCR
+    ([], 30),              # 3 scan
+    (["Page 5"], 50),      # 4 scan with a short text footer
+    (TEXT, 70),            # 5 text with a logo
+]
+
+
+@pytest.mark.parametrize("parallel_min_pages,workers", [(100, 1), (2, 2)])
+def test_scanned_means_little_text_and_an_image(parallel_min_pages, workers):
+    result = pdf_extract.extract_pdf_text(make_pdf(PAGES), char_budget=10**6,
+                                          parallel_min_pages=parallel_min_pages, workers=workers, chunk_pages=2)
+    assert result["scanned"] == [3, 4]
+    assert [i for i, _ in result["pages"]] == list(range(len(PAGES)))
+    assert result["complete"]
+    pdf_extract.shutdown()
+
+
+def test_write_page_pdfs_keeps_one_page_each():
+    documents = pdf_extract.write_page_pdfs(make_pdf(PAGES), [3, 4])
+    assert [image_width(doc) for doc in documents] == [30, 50]
+
+
+def test_ocr_text_goes_back_to_its_own_page(app_module, monkeypatch):
+    async def fake_ocr(content: bytes, filename: str) -> str:
+        return f"OCR text of image {image_width(content)}"
+
+    monkeypatch.setattr(app_module, "extract_text_with_ocr", fake_ocr)
+    monkeypatch.setattr(app_module.stage_executor, "kind", lambda stage: "inline")
+    monkeypatch.setattr(app_module.stage_executor, "run",
+                        lambda stage, fn, *args, **kwargs: asyncio.to_thread(fn, *args, **kwargs))
+    text = asyncio.run(app_module.extract_pdf_text_with_page_ocr(io.BytesIO(make_pdf(PAGES)), "resume.pdf"))
+    lines = [line for line in text.splitlines() if line.strip()]
+    assert "OCR text of image 30" in lines and "OCR text of image 50" in lines
+    assert "OCR text of image 70" not in text
+    assert "Page 3" in lines and "Page 5" not in lines  # page 5's footer is replaced by its OCR text
+    assert lines.index("Page 3") < lines.index("OCR text of image 30") < lines.index("OCR text of image 50")
+    assert lines.index("OCR text of image 50") < len(lines) - len(TEXT)
+
+
+def long_pdf(pages: int) -> bytes:
+    return make_pdf([([f"{LINE} ({p}.{i})" for i in range(20)], 30 if p == 9 else None) for p in range(pages)])
+
+
+@pytest.mark.parametrize("char_budget", [10**6, 4000])
+def test_stage_pool_extraction_matches_extract_pdf_text(char_budget):
+    data = long_pdf(16)
+    expected = pdf_extract.extract_pdf_text(data, char_budget=char_budget, workers=1)
+    executor = StageExecutor(parse_stage_kinds("pdf=process"), processes=2)
+    try:
+        run = functools.partial(executor.run, "pdf")
+        result = asyncio.run(pdf_extract.extract_pdf_text_with(run, data, char_budget=char_budget, workers=2))
+    finally:
+        executor.shutdown()
+    assert result["page_count"] == 16
+    if char_budget == 10**6:
+        assert result == expected and result["scanned"] == []
+    else:
+        # it reads whole 4-page ranges, so it can stop a few pages after the serial loop
+        assert not result["complete"]
+        assert result["pages"][:len(expected["pages"])] == expected["pages"]
+        assert len(result["pages"]) % 4 == 0
+
+
+def test_stage_pool_extraction_sends_ranges_as_separate_tasks():
+    calls = []
+
+    async def run(fn, *args):
+        calls.append(fn.__name__)
+        return await asyncio.to_thread(fn, *args)
+
+    data = long_pdf(16)
+    result = asyncio.run(pdf_extract.extract_pdf_text_with(run, data, char_budget=10**6, workers=2))
+    assert calls == ["extract_pdf_head"] + ["_extract_range"] * 3
+    assert result == pdf_extract.extract_pdf_text(data, char_budget=10**6, workers=1)
+
+    calls.clear()
+    short = long_pdf(5)
+    result = asyncio.run(pdf_extract.extract_pdf_text_with(run, short, char_budget=10**6, workers=2))
+    assert calls == ["extract_pdf_head"] and result["complete"]
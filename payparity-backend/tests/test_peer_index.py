@@ -0,0 +1,62 @@
+# payparity-backend/tests/test_peer_index.py
+"""PeerIndex.nearest must return what the original per-request DataFrame scan returned."""
+import re
+
+import pandas as pd
+import pytest
+
+from peer_index import PeerIndex
+
+
+def legacy_peer_comparisons(salary_dataset, job_title, predicted_salary):
+    """get_peer_comparisons before the index (baseline app.py)."""
+    job_title_lower = job_title.lower().strip()
+    similar_jobs = salary_dataset[
+        salary_dataset['Job_Title'].str.lower().str.contains(job_title_lower, na=False, regex=False) |
+        salary_dataset['Job_Title'].str.lower().str.strip().eq(job_title_lower)
+    ]
+    if len(similar_jobs) < 5:
+        keywords = job_title_lower.split()
+        if keywords:
+            pattern = '|'.join([re.escape(kw) for kw in keywords if len(kw) > 3])
+            if pattern:
+                similar_jobs = salary_dataset[
+                    salary_dataset['Job_Title'].str.lower().str.contains(pattern, na=False, regex=True)
+                ]
+    if len(similar_jobs) == 0:
+        return []
+    similar_jobs = similar_jobs.copy()
+    similar_jobs['salary_diff'] = abs(similar_jobs['Salary_INR'] - predicted_salary)
+    closest_peers = similar_jobs.nsmallest(5, 'salary_diff')
+    return [{
+        "job_title": row['Job_Title'],
+        "experience_years": int(row['Experience_Years']),
+        "education": row['Education_Level'],
+        "location": row['Location'],
+        "salary": round(float(row['Salary_INR']), 2),
+        "skills": row['Skills_Required'] if pd.notna(row['Skills_Required']) else "",
+    } for _, row in closest_peers.iterrows()]
+
+
+@pytest.fixture(scope="module")
+def peer_index(salary_dataset):
+    return PeerIndex(salary_dataset)
+
+
+QUERIES = [
+    "Software Engineer", "software engineer ", "Data", "Senior Backend Developer", "Nurse",
+    "Chief Happiness Officer", "ML", "Product Manager", "Graphic Designer", "analyst", "xyz",
+]
+
+
+@pytest.mark.parametrize("job_title", QUERIES)
+@pytest.mark.parametrize("predicted_salary", [0, 350000, 1250000.5, 9_000_000])
+def test_nearest_matches_legacy_scan(salary_dataset, peer_index, job_title, predicted_salary):
+    assert peer_index.nearest(job_title, predicted_salary, k=5) == \
+        legacy_peer_comparisons(salary_dataset, job_title, predicted_salary)
+
+
+def test_every_dataset_title_matches_legacy_scan(salary_dataset, peer_index):
+    for i, title in enumerate(sorted(set(salary_dataset["Job_Title"].astype(str)))):
+        salary = 300000 + 97_000 * (i % 40)
+        assert peer_index.nearest(title, salary, k=5) == legacy_peer_comparisons(salary_dataset, title, salary), title
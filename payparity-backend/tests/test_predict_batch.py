@@ -0,0 +1,81 @@
+# payparity-backend/tests/test_predict_batch.py
+import pytest
+from fastapi.testclient import TestClient
+
+RESUME = """Priya Sharma | Pune, Maharashtra | priya@example.com
+Software Engineer, Acme Corp                Jan 2019 - Dec 2023
+Built payment services in Python and Java.
+Education: B.Tech in Computer Science
+Skills: Python, Java, SQL, Docker, Kubernetes, AWS, Git
+"""
+
+
+@pytest.fixture(scope="module")
+def client(app_module):
+    with TestClient(app_module.app) as client:
+        yield client
+
+
+def batch_profile(parsed_info: dict, current_salary: str) -> dict:
+    return {
+        "job_title": parsed_info["Job_Title"],
+        "experience_years": parsed_info["Experience_Years"],
+        "skills": parsed_info["Skills_Required"],
+        "education_level": parsed_info["Education_Level"],
+        "location": parsed_info["Location"],
+        "current_salary": current_salary,
+    }
+
+
+@pytest.mark.parametrize("job_title,current_salary", [("Software Engineer", "12 LPA"),
+                                                      ("Backend Developer", "9,00,000")])
+def test_batch_matches_single_predict(client, job_title, current_salary):
+    single = client.post("/predict", data={"job_title": job_title, "current_salary": current_salary},
+                         files={"file": ("resume.txt", RESUME.encode(), "text/plain")}).json()
+    assert single["status"] == "success", single
+
+    body = client.post("/predict/batch", json={"profiles": [batch_profile(single["parsed_info"], current_salary)]}).json()
+    assert (body["status"], body["count"], body["failed"]) == ("success", 1, 0)
+    result = body["results"][0]
+    assert result["predicted_salary"] == single["predicted_salary"]
+    assert result["parsed_info"] == single["parsed_info"]
+    assert result["comparison"] == single["comparison"]
+
+
+def test_empty_batch_is_rejected(client):
+    response = client.post("/predict/batch", json={"profiles": []})
+    assert response.status_code == 400
+
+
+def test_oversized_batch_is_rejected(client, app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "MAX_BATCH_SIZE", 2)
+    response = client.post("/predict/batch", json={"profiles": [{"job_title": "Analyst"}] * 3})
+    assert response.status_code == 413
+
+
+def test_invalid_profile_fails_alone(client):
+    good = {"job_title": "Data Analyst", "experience_years": 3, "skills": ["SQL", "Excel"]}
+    profiles = [good, {"experience_years": 2}, {"job_title": "QA Engineer", "data_source": "Fax"}, "not a profile", good]
+    body = client.post("/predict/batch", json={"profiles": profiles}).json()
+    assert (body["status"], body["count"], body["failed"]) == ("success", 5, 3)
+    statuses = [r["status"] for r in body["results"]]
+    assert statuses == ["success", "error", "error", "error", "success"]
+    assert "job_title" in body["results"][1]["message"]
+    assert "data_source" in body["results"][2]["message"]
+    assert body["results"][0] == body["results"][4]
+
+
+def test_scoring_error_fails_only_that_profile(client, app_module, monkeypatch):
+    real = app_module.detect_job_category
+
+    def flaky(title):
+        if title == "Broken Title":
+            raise ValueError("cannot categorize")
+        return real(title)
+
+    monkeypatch.setattr(app_module, "detect_job_category", flaky)
+    profiles = [{"job_title": "Data Analyst"}, {"job_title": "Broken Title"}, {"job_title": "Product Manager"}]
+    body = client.post("/predict/batch", json={"profiles": profiles}).json()
+    assert [r["status"] for r in body["results"]] == ["success", "error", "success"]
+    assert body["results"][1]["message"] == "cannot categorize"
+    assert body["results"][2]["parsed_info"]["Job_Title"] == "Product Manager"
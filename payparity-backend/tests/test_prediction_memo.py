@@ -0,0 +1,58 @@
+# payparity-backend/tests/test_prediction_memo.py
+import os
+import shutil
+
+from prediction_memo import PredictionMemo, file_signature
+
+ROW = {"Gender": "Male", "Job_Title": "Data Analyst", "Experience_Years": 3.0, "Skills_Required": "SQL, Excel",
+       "Education_Level": "Bachelors", "Location": "Bangalore", "Data_Source": "ResumeUpload"}
+
+
+def test_hits_misses_and_lru_eviction():
+    memo = PredictionMemo(max_entries=2)
+    assert memo.get("a") is None
+    memo.set("a", 1.0)
+    memo.set("b", 2.0)
+    assert memo.get("a") == 1.0  # "b" is now the least recently used
+    memo.set("c", 3.0)
+    assert memo.get("b") is None
+    assert (memo.get("a"), memo.get("c")) == (1.0, 3.0)
+    assert memo.stats() == {"entries": 2, "max_entries": 2, "hits": 3, "misses": 2,
+                            "invalidations": 0, "hit_rate": 0.6}
+
+
+def test_disabled_memo_stores_nothing():
+    memo = PredictionMemo(max_entries=0)
+    memo.set("a", 1.0)
+    assert memo.get("a") is None and len(memo) == 0
+
+
+def test_file_signature_changes_with_the_file(tmp_path):
+    path = tmp_path / "model.pkl"
+    path.write_bytes(b"v1")
+    first = file_signature(str(path))
+    os.utime(path, ns=(0, first[2] + 1_000_000_000))
+    assert file_signature(str(path)) != first
+    assert file_signature(str(tmp_path / "missing.pkl"))[1:] == (None, None)
+
+
+def test_model_reload_clears_memo(app_module, monkeypatch, tmp_path):
+    model_copy = tmp_path / "model.pkl"
+    shutil.copyfile(app_module.MODEL_PATH, model_copy)
+    memo = PredictionMemo()
+    memo.signature = file_signature(str(model_copy))
+    for name, value in [("MODEL_PATH", str(model_copy)), ("prediction_memo", memo), ("MODEL_CHECK_INTERVAL", 0),
+                        ("model", app_module.model), ("fast_predictor", app_module.fast_predictor)]:
+        monkeypatch.setattr(app_module, name, value)
+
+    real = app_module.predict_adjusted_salaries([ROW], ["tech"])[0]
+    key = tuple(ROW[f] for f in app_module.MODEL_FEATURES)
+    memo.set(key, -1.0)  # stands in for a prediction from the old model
+    assert app_module.predict_adjusted_salaries([ROW], ["tech"])[0] == -1.0
+
+    stat = model_copy.stat()
+    os.utime(model_copy, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert app_module.predict_adjusted_salaries([ROW], ["tech"])[0] == real
+    assert memo.invalidations == 1
+    assert memo.signature == file_signature(str(model_copy))
+    assert memo.get(key) == real
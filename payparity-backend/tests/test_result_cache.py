@@ -0,0 +1,103 @@
+# payparity-backend/tests/test_result_cache.py
+import pytest
+
+import result_cache
+from result_cache import ResultCache, content_key
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(result_cache.time, "time", clock)
+    return clock
+
+
+def make_cache(tmp_path, **kwargs) -> ResultCache:
+    return ResultCache(str(tmp_path / "cache.sqlite3"), **kwargs)
+
+
+def entries(cache: ResultCache) -> int:
+    return cache.stats()["entries"]
+
+
+def test_content_key_is_stable_and_separates_parts():
+    assert content_key("v1", "text") == content_key("v1", "text")
+    assert content_key("v1", "text") != content_key("v2", "text")
+    assert content_key("ab", "c") != content_key("a", "bc")
+
+
+def test_roundtrip_and_counters(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    assert cache.get("k") is None
+    cache.set("k", {"Skills": ["Python"], "n": 1})
+    assert cache.get("k") == {"Skills": ["Python"], "n": 1}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_entry_expires_after_ttl(tmp_path, clock):
+    cache = make_cache(tmp_path, ttl_seconds=60)
+    cache.set("k", "v")
+    clock.now += 60
+    assert cache.get("k") == "v"
+    clock.now += 1
+    assert cache.get("k") is None
+    assert entries(cache) == 0
+
+
+def test_stale_entries_are_flagged_then_dropped(tmp_path, clock):
+    cache = make_cache(tmp_path, ttl_seconds=60, stale_seconds=30)
+    cache.set("k", "v")
+    assert cache.lookup("k") == ("v", True)
+    clock.now += 75
+    assert cache.lookup("k") == ("v", False)
+    assert cache.get("k") is None  # get() only returns fresh values
+    clock.now += 20
+    assert cache.lookup("k") is None
+    assert cache.stats()["stale_hits"] == 2
+
+
+def test_lru_eviction_past_max_entries(tmp_path, clock):
+    cache = make_cache(tmp_path, max_entries=3, evict_every=1)
+    for key in "abc":
+        cache.set(key, key)
+        clock.now += 1
+    cache.get("a")  # "b" is now the least recently used
+    clock.now += 1
+    cache.set("d", "d")
+    assert entries(cache) == 3
+    assert cache.get("b") is None
+    assert [cache.get(k) for k in "acd"] == ["a", "c", "d"]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_eviction_is_batched_every_n_writes(tmp_path, clock):
+    cache = make_cache(tmp_path, max_entries=2, evict_every=4)
+    for i in range(3):
+        cache.set(str(i), i)
+        clock.now += 1
+    assert entries(cache) == 3  # no eviction pass yet
+    cache.set("3", 3)
+    assert entries(cache) == 2
+    assert cache.get("2") == 2 and cache.get("3") == 3
+
+
+def test_expired_rows_are_purged_on_eviction_pass(tmp_path, clock):
+    cache = make_cache(tmp_path, ttl_seconds=10, evict_every=1)
+    cache.set("old", 1)
+    clock.now += 11
+    cache.set("new", 2)
+    assert entries(cache) == 1
+
+
+def test_persists_across_instances(tmp_path, clock):
+    make_cache(tmp_path).set("k", [1, 2])
+    assert make_cache(tmp_path).get("k") == [1, 2]
@@ -0,0 +1,53 @@
+# payparity-backend/tests/test_single_flight.py
+import asyncio
+
+from single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call_and_one_start():
+    flights = SingleFlight()
+    calls, starts = [], []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": 42}
+
+    async def run():
+        return await asyncio.gather(*(flights.do("kind", "key", fetch, on_start=lambda: starts.append(1))
+                                      for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1 and len(starts) == 1
+    assert all(r is results[0] for r in results)
+    assert flights.stats()["kinds"]["kind"] == {"calls": 1, "coalesced": 4, "inflight": 0}
+
+
+def test_on_start_runs_again_once_the_call_finished():
+    flights = SingleFlight()
+    starts = []
+
+    async def fetch():
+        return 1
+
+    async def run():
+        for _ in range(3):
+            await flights.do("kind", "key", fetch, on_start=lambda: starts.append(1))
+
+    asyncio.run(run())
+    assert len(starts) == 3
+
+
+def test_disabled_starts_every_call():
+    flights = SingleFlight(enabled=False)
+    starts = []
+
+    async def fetch():
+        await asyncio.sleep(0)
+        return 1
+
+    async def run():
+        await asyncio.gather(*(flights.do("kind", "key", fetch, on_start=lambda: starts.append(1)) for _ in range(3)))
+
+    asyncio.run(run())
+    assert len(starts) == 3
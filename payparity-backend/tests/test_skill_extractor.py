@@ -0,0 +1,110 @@
+# payparity-backend/tests/test_skill_extractor.py
+import pytest
+
+from skill_extractor import SkillExtractor, tokenize
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    return SkillExtractor(extra_skills=["Vendor Negotiation", "Python"])
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("Skills: Postgres, postgresql, PostgreSQL DB", ["PostgreSQL"]),
+    ("Skills: ReactJS, react.js, K8s, golang", ["React", "Kubernetes", "Go"]),
+    ("Skills: CI/CD, ci cd, GitHub Actions", ["CI/CD"]),
+    ("Skills: C++, C#, .NET, Node.js", ["C++", "C#", "ASP.NET", "Node.js"]),
+    ("Skills: Vendor Negotiation, Negotiation Skills", ["Vendor Negotiation", "Negotiation"]),
+])
+def test_aliases_map_to_canonical_names(extractor, text, expected):
+    assert extractor.analyze(text)["skills"] == expected
+
+
+def test_longest_alias_wins(extractor):
+    # "spring boot microservices" is one alias, not Spring Boot + Microservices
+    assert extractor.analyze("Skills: Spring Boot Microservices")["skills"] == ["Spring Boot"]
+    assert extractor.analyze("Skills: Machine Learning, Deep Learning")["skills"] == ["Machine Learning", "Deep Learning"]
+
+
+@pytest.mark.parametrize("text", [
+    "Managed a chain of stores and sent weekly emails",  # "ai" in "chain" and "emails"
+    "Reacted quickly to incidents; Javanese speaker",          # "react", "java" inside words
+    "Carried out rollouts for the Gopher club",                # "r", "go" inside words
+])
+def test_matches_whole_tokens_only(extractor, text):
+    assert extractor.analyze(text)["skills"] == []
+
+
+def test_section_only_aliases(extractor):
+    prose = "Experience\nWe go to Excel in sales and marketing with AI and ML in mind."
+    assert extractor.analyze(prose)["skills"] == []
+    listed = "Skills: Go, Excel, Sales, Marketing, AI, ML"
+    assert extractor.analyze(listed)["skills"] == ["Go", "Excel", "Sales", "Marketing", "Artificial Intelligence",
+                                                  "Machine Learning"]
+    # unambiguous aliases count anywhere
+    assert extractor.analyze("Built services in Python and Kubernetes")["skills"] == ["Python", "Kubernetes"]
+
+
+def test_section_starts_and_ends_at_headings(extractor):
+    text = """Technical Skills
+    - Python, Docker
+    Programming Languages: Go, Rust
+Experience
+    Led a team of 5 to go live with Rust rewrites
+Tools & Technologies: Excel"""
+    result = extractor.analyze(text)
+    assert result["skills"] == ["Python", "Docker", "Go", "Rust", "Excel"]
+    # "Python", "Docker", "Go", "Rust", "Excel"; the "Programming Languages" label is not an item
+    assert (result["section_items"], result["coverage"]) == (5, 1.0)
+
+
+def test_coverage_counts_unmatched_and_long_items(extractor):
+    result = extractor.analyze("Skills: Python, Quuxology, SQL, " + " ".join(["word"] * 9) + " Docker")
+    assert result["skills"] == ["Python", "SQL", "Docker"]
+    # the 10-word item matched Docker but is too long to count as covered
+    assert (result["section_items"], result["coverage"]) == (4, 0.5)
+    assert extractor.analyze("Python developer with no skills heading")["coverage"] == 0.0
+
+
+def test_tokenize_keeps_dots_and_splits_separators():
+    assert tokenize("ASP.NET/.net-Core & C++ | CI/CD") == ["asp.net", ".net", "core", "c++", "ci", "cd"]
+
+
+# --- the app's use of it: when the LLM is skipped, and the fields filled in instead ---
+
+@pytest.mark.parametrize("skills,confident", [
+    ("Python, SQL, Docker, Quuxology, Zorbing", True),    # coverage 0.6, 3 skills
+    ("Python, SQL, Docker, Quuxology, Zorbing, Flibber", False),  # coverage 0.5
+    ("Python, SQL, Docker", True),                        # 3 skills
+    ("Python, SQL", False),                               # only 2 skills
+    ("Python, Python 3, py", False),                      # 3 items, 1 distinct skill
+])
+def test_confidence_threshold_edges(app_module, skills, confident):
+    assert (app_module.SKILL_COVERAGE_MIN, app_module.SKILL_MIN_COUNT) == (0.6, 3)
+    assert app_module.extract_skills_local(f"Skills: {skills}")["confident"] is confident
+
+
+def test_local_skills_can_be_disabled(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "LOCAL_SKILLS_ENABLED", False)
+    assert not app_module.extract_skills_local("Skills: Python, SQL, Docker")["confident"]
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("Ph.D. in Physics; M.Tech; B.Tech", "PhD/Doctorate"),
+    ("MBA, IIM Ahmedabad. B.Com, Delhi University", "Masters/Postgraduate"),
+    ("B.E. in Mechanical Engineering", "Bachelors"),
+    ("Higher Secondary (Class XII), 2019", "High School"),
+    ("Call me, be on time, ms office", "Bachelors"),  # "me", "be" and "ms" are not degrees
+])
+def test_detect_education(app_module, text, expected):
+    assert app_module.detect_education(text) == expected
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("Priya Sharma | Bengaluru | priya@example.com\nPreviously at Pune office", "Bangalore"),
+    ("Worked in Mumbai, moved to Delhi", "Mumbai"),
+    ("Puneet Kumar, remote worker", "Remote"),  # "Pune" inside a name does not count
+    ("", "Remote"),
+])
+def test_detect_location(app_module, text, expected):
+    assert app_module.detect_location(text) == expected
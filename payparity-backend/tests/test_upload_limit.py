@@ -0,0 +1,72 @@
+# payparity-backend/tests/test_upload_limit.py
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+BOUNDARY = "payparityboundary"
+CHUNK = 16 * 1024
+
+
+@pytest.fixture
+def small_limit(app_module, monkeypatch):
+    monkeypatch.setitem(app_module.UPLOAD_LIMITS, "/predict", 1024)
+    return app_module.UPLOAD_FORM_OVERHEAD + 1024
+
+
+def multipart_chunks(file_bytes: int):
+    head = (f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"resume.txt\"\r\n"
+            "Content-Type: text/plain\r\n\r\n").encode()
+    body = head + b"x" * file_bytes + f"\r\n--{BOUNDARY}--\r\n".encode()
+    return [body[i:i + CHUNK] for i in range(0, len(body), CHUNK)]
+
+
+def call_asgi(app, chunks, headers):
+    """Drive the ASGI app with a streamed body; returns (status, json body, chunks read)."""
+    pending = list(chunks)
+    sent = []
+
+    async def receive():
+        if not pending:
+            return {"type": "http.request", "body": b"", "more_body": False}
+        chunk = pending.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": bool(pending)}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+             "scheme": "http", "path": "/predict", "raw_path": b"/predict", "root_path": "", "query_string": b"",
+             "headers": headers, "client": ("127.0.0.1", 1234), "server": ("testserver", 80)}
+    asyncio.run(app(scope, receive, send))
+    start = next(m for m in sent if m["type"] == "http.response.start")
+    body = b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+    return start["status"], json.loads(body), len(chunks) - len(pending)
+
+
+def test_content_length_over_limit_is_rejected_before_reading(app_module, small_limit):
+    chunks = multipart_chunks(small_limit * 2)
+    headers = [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode()),
+               (b"content-length", str(sum(map(len, chunks))).encode())]
+    status, body, read = call_asgi(app_module.app, chunks, headers)
+    assert status == 413
+    assert body["detail"] == app_module.upload_too_large(1024).detail
+    assert read == 0
+
+
+def test_chunked_body_over_limit_stops_at_the_limit(app_module, small_limit):
+    chunks = multipart_chunks(small_limit * 4)
+    headers = [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode()),
+               (b"transfer-encoding", b"chunked")]
+    status, body, read = call_asgi(app_module.app, chunks, headers)
+    assert status == 413
+    assert body["detail"] == app_module.upload_too_large(1024).detail
+    assert read == small_limit // CHUNK + 1 < len(chunks)
+
+
+def test_upload_under_limit_reaches_the_endpoint(app_module, small_limit):
+    with TestClient(app_module.app) as client:
+        response = client.post("/predict", files={"file": ("resume.txt", b"too short", "text/plain")})
+    assert response.status_code == 200
+    assert response.json()["status"] == "error"  # rejected by /predict itself, not the size limit
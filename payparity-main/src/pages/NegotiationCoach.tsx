@@ -31,6 +31,10 @@ const NegotiationCoach = () => {
   const [userMessage, setUserMessage] = useState('');
   const [isTyping, setIsTyping] = useState(false);
   const chatContainerRef = useRef<HTMLDivElement>(null);
+  // Server-held chat session: after the first turn only session_id and the new message are sent
+  const sessionIdRef = useRef<string | null>(null);
+  // Profile the session was last given, resent only when it is edited
+  const sentProfileRef = useRef<string | null>(null);
 
   // Profile state
   const [profile, setProfile] = useState({
@@ -59,35 +63,137 @@ const NegotiationCoach = () => {
   const handleSendMessage = async () => {
     if (!userMessage.trim()) return;
 
-    const newMessages = [...chatMessages, { role: 'user' as const, content: userMessage }];
+    const message = userMessage;
+    const newMessages = [...chatMessages, { role: 'user' as const, content: message }];
     setChatMessages(newMessages);
     setUserMessage('');
     setIsTyping(true);
 
-    try {
-      const response = await axios.post(`${BACKEND_URL}/api/chat`, {
-        messages: newMessages,
-        mode: mode,
-        profile: {
-          title: profile.title || undefined,
-          location: profile.location || undefined,
-          years_experience: profile.years_experience ? Number(profile.years_experience) : undefined,
-          current_comp: profile.current_comp ? Number(profile.current_comp) : undefined,
-          target_comp: profile.target_comp ? Number(profile.target_comp) : undefined,
-          currency: profile.currency || undefined,
-        },
-      });
+    const profilePayload = {
+      title: profile.title || undefined,
+      location: profile.location || undefined,
+      years_experience: profile.years_experience ? Number(profile.years_experience) : undefined,
+      current_comp: profile.current_comp ? Number(profile.current_comp) : undefined,
+      target_comp: profile.target_comp ? Number(profile.target_comp) : undefined,
+      currency: profile.currency || undefined,
+    };
+    const profileJson = JSON.stringify(profilePayload);
+
+    // The first turn starts a session with the mode and profile; later turns send
+    // only session_id and the new message (plus the profile if it was edited)
+    const buildPayload = () => {
+      const payload: Record<string, unknown> = { message };
+      if (sessionIdRef.current) {
+        payload.session_id = sessionIdRef.current;
+      } else {
+        payload.mode = mode;
+      }
+      if (!sessionIdRef.current || profileJson !== sentProfileRef.current) {
+        payload.profile = profilePayload;
+      }
+      return payload;
+    };
+
+    const rememberSession = (sessionId?: string | null) => {
+      if (sessionId) {
+        sessionIdRef.current = sessionId;
+        sentProfileRef.current = profileJson;
+      }
+    };
 
-      const cleaned = cleanMarkdown(response.data.message);
-      const aiMessage = { role: 'assistant' as const, content: cleaned };
+    // 404: the server no longer has the session (expired or evicted), so start a new one
+    const sessionExpired = (status?: number) => {
+      if (status !== 404 || !sessionIdRef.current) return false;
+      sessionIdRef.current = null;
+      sentProfileRef.current = null;
+      return true;
+    };
+
+    const showReply = (text: string) => {
+      const aiMessage = { role: 'assistant' as const, content: cleanMarkdown(text) };
       setChatMessages([...newMessages, aiMessage]);
-    } catch (error) {
-      console.error('Error:', error);
-      const errorMessage = {
-        role: 'assistant' as const,
-        content: 'Sorry, I encountered an error. Please try again.',
-      };
-      setChatMessages([...newMessages, errorMessage]);
+    };
+
+    // Stream tokens over SSE so the reply appears as it is generated
+    const streamReply = async (): Promise<void> => {
+      const response = await fetch(`${BACKEND_URL}/api/chat/stream`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(buildPayload()),
+      });
+      if (sessionExpired(response.status)) return streamReply();
+      if (!response.ok || !response.body) {
+        throw new Error(`Stream request failed: ${response.status}`);
+      }
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let reply = '';
+      let finished = false;
+
+      while (!finished) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+          const rawEvent = buffer.slice(0, boundary);
+          buffer = buffer.slice(boundary + 2);
+
+          let eventName = 'message';
+          let data = '';
+          for (const line of rawEvent.split('\n')) {
+            if (line.startsWith('event:')) eventName = line.slice(6).trim();
+            else if (line.startsWith('data:')) data += line.slice(5).trim();
+          }
+          if (!data) continue;
+          const parsed = JSON.parse(data);
+
+          if (eventName === 'delta') {
+            reply += parsed.content;
+            setIsTyping(false);
+            showReply(reply);
+          } else if (eventName === 'done') {
+            // The server has saved the turn: never resend it, even if the reply is empty
+            rememberSession(parsed.session_id);
+            showReply(parsed.message || reply || 'Sorry, I had no reply to that. Please try rephrasing.');
+            finished = true;
+          } else if (eventName === 'error') {
+            throw new Error(parsed.detail || 'Stream error');
+          }
+        }
+      }
+      // Without `done` the server did not record the turn, so it is safe to retry
+      if (!finished) throw new Error('Stream ended before the reply was complete');
+    };
+
+    const postReply = async (): Promise<void> => {
+      try {
+        const response = await axios.post(`${BACKEND_URL}/api/chat`, buildPayload());
+        rememberSession(response.data.session_id);
+        showReply(response.data.message);
+      } catch (error) {
+        if (axios.isAxiosError(error) && sessionExpired(error.response?.status)) return postReply();
+        throw error;
+      }
+    };
+
+    try {
+      await streamReply();
+    } catch (streamError) {
+      console.warn('Streaming failed, falling back to /api/chat:', streamError);
+      try {
+        await postReply();
+      } catch (error) {
+        console.error('Error:', error);
+        const errorMessage = {
+          role: 'assistant' as const,
+          content: 'Sorry, I encountered an error. Please try again.',
+        };
+        setChatMessages([...newMessages, errorMessage]);
+      }
     } finally {
       setIsTyping(false);
     }
@@ -100,6 +206,12 @@ const NegotiationCoach = () => {
         : "Hello! I'm your mock interviewer. I'll simulate a real negotiation conversation to help you practice. Let's begin - tell me a bit about the role you're discussing, and I'll play the hiring manager.";
 
     setChatMessages([{ role: 'assistant', content: welcomeMessage }]);
+    // The next message starts a fresh server-side session
+    if (sessionIdRef.current) {
+      axios.delete(`${BACKEND_URL}/api/chat/sessions/${sessionIdRef.current}`).catch(() => {});
+    }
+    sessionIdRef.current = null;
+    sentProfileRef.current = null;
   };
 
   // Scroll to bottom automatically when new message added